@@ -0,0 +1,153 @@
+"""
+Deterministic generator of synthetic hiring data for the benchmarks.
+
+Writes headerless CSVs shaped like the challenge files: departments, jobs and
+hired employees. The same seed and row count always produce byte-identical
+files, so results from different commits are measured on the same input.
+
+Usage:
+    python -m benchmarks.generate --rows 1m --out benchmarks/data
+"""
+import argparse
+import logging
+import os
+import numpy as np
+import pandas as pd
+
+SCALES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+DEFAULT_SEED = 2021
+DEPARTMENTS = 12
+JOBS = 183
+MISSING_RATE = 0.01
+WRITE_CHUNK_ROWS = 1_000_000
+
+FIRST_NAMES = (
+    'Ana', 'Diego', 'Lucia', 'Martin', 'Sofia', 'Tomas', 'Valentina', 'Mateo',
+    'Camila', 'Joaquin', 'Julieta', 'Santiago', 'Emma', 'Benjamin', 'Mia', 'Lucas',
+)
+LAST_NAMES = (
+    'Garcia', 'Rodriguez', 'Gonzalez', 'Fernandez', 'Lopez', 'Martinez', 'Perez',
+    'Gomez', 'Diaz', 'Sanchez', 'Romero', 'Sosa', 'Alvarez', 'Torres', 'Ruiz', 'Ramirez',
+)
+HIRE_RANGE = (np.datetime64('2020-01-01T00:00:00'), np.datetime64('2023-01-01T00:00:00'))
+
+
+def parse_rows(value):
+    """
+    Parse a row count given as an integer or as one of the named scales.
+
+    Args:
+        value: '10k', '1m', '10m' or a number of rows.
+
+    Returns:
+        int: The number of rows.
+    """
+    return SCALES[value] if value in SCALES else int(value)
+
+
+def dataset_paths(out_dir, rows):
+    """
+    Return the paths of the generated files for a row count.
+
+    Args:
+        out_dir: The directory the files are written to.
+        rows: The number of employee rows.
+
+    Returns:
+        dict: Path of the departments, jobs and employees CSVs, keyed by table name.
+    """
+    return {
+        'department': os.path.join(out_dir, 'departments.csv'),
+        'job': os.path.join(out_dir, 'jobs.csv'),
+        'employee': os.path.join(out_dir, f'hired_employees_{rows}.csv'),
+    }
+
+
+def employees_frame(start, stop, seed=DEFAULT_SEED):
+    """
+    Build the employee rows with ids in ``[start, stop)``.
+
+    Each block of rows is drawn from its own generator seeded with the seed
+    and the block's first id, so the rows of a block do not depend on the
+    blocks written before it. ``generate`` always splits a file into blocks
+    of ``WRITE_CHUNK_ROWS``, so the same seed and row count give the same file.
+
+    Args:
+        start: The first employee id, inclusive.
+        stop: The last employee id, exclusive.
+        seed: The generator seed.
+
+    Returns:
+        DataFrame: The rows, with about ``MISSING_RATE`` of each optional
+        column left blank as in the source data.
+    """
+    rng = np.random.default_rng([seed, start])
+    rows = stop - start
+    span = int((HIRE_RANGE[1] - HIRE_RANGE[0]) / np.timedelta64(1, 's'))
+    hired = HIRE_RANGE[0] + rng.integers(0, span, rows).astype('timedelta64[s]')
+    df = pd.DataFrame({
+        'id': np.arange(start, stop),
+        'name': pd.Series(np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), rows)])
+        + ' ' + np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), rows)],
+        'datetime': pd.Series(np.datetime_as_string(hired, unit='s')) + 'Z',
+        'department_id': pd.array(rng.integers(1, DEPARTMENTS + 1, rows), dtype='Int32'),
+        'job_id': pd.array(rng.integers(1, JOBS + 1, rows), dtype='Int32'),
+    })
+    for column in ('name', 'datetime', 'department_id', 'job_id'):
+        df.loc[rng.random(rows) < MISSING_RATE, column] = None
+    return df
+
+
+def generate(out_dir, rows, seed=DEFAULT_SEED, overwrite=False):
+    """
+    Write the departments, jobs and hired employees CSVs for a row count.
+
+    Employees are written in chunks of ``WRITE_CHUNK_ROWS`` so memory stays
+    bounded at 10M rows. Existing files are kept unless ``overwrite``.
+
+    Args:
+        out_dir: The directory to write the files to.
+        rows: The number of employee rows.
+        seed: The generator seed.
+        overwrite: Regenerate files that already exist.
+
+    Returns:
+        dict: The paths written, as returned by ``dataset_paths``.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = dataset_paths(out_dir, rows)
+    if overwrite or not os.path.exists(paths['department']):
+        pd.DataFrame({
+            'id': range(1, DEPARTMENTS + 1),
+            'department': [f'Department {i}' for i in range(1, DEPARTMENTS + 1)],
+        }).to_csv(paths['department'], index=False, header=False)
+    if overwrite or not os.path.exists(paths['job']):
+        pd.DataFrame({
+            'id': range(1, JOBS + 1),
+            'job': [f'Job {i}' for i in range(1, JOBS + 1)],
+        }).to_csv(paths['job'], index=False, header=False)
+    if overwrite or not os.path.exists(paths['employee']):
+        partial = paths['employee'] + '.partial'
+        with open(partial, 'w', newline='') as out:
+            for start in range(1, rows + 1, WRITE_CHUNK_ROWS):
+                stop = min(start + WRITE_CHUNK_ROWS, rows + 1)
+                employees_frame(start, stop, seed).to_csv(out, index=False, header=False)
+                logging.info(f"Generated employees {start} to {stop - 1}")
+        os.replace(partial, paths['employee'])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', default='10k', help="'10k', '1m', '10m' or a row count")
+    parser.add_argument('--out', default=os.path.join('benchmarks', 'data'))
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--overwrite', action='store_true')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    for table, path in generate(args.out, parse_rows(args.rows), args.seed, args.overwrite).items():
+        print(f"{table}: {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+Drive the API with mixed concurrent traffic and report latency per endpoint.
+
+Workers send a weighted mix of dashboard reads and CSV uploads, either to the
+ASGI app in this process or to a running server, for a fixed duration. The
+report gives p50/p95/p99 latency, error rate and throughput per endpoint, the
+connection pool stats at the end and, in process, how late the event loop ran
+a timer, which shows blocking calls on the loop.
+
+Usage:
+    python -m benchmarks.load_test --concurrency 32 --duration 30
+    python -m benchmarks.load_test --url http://localhost:8000 \
+        --mix employees_per_quarter=10 --mix upload_csv=1
+"""
+import argparse
+import asyncio
+from contextlib import asynccontextmanager
+import json
+import logging
+import math
+import os
+import random
+import time
+import httpx
+from benchmarks.generate import DEFAULT_SEED, generate
+
+UPLOAD_ROWS = 100_000
+LOOP_LAG_INTERVAL = 0.01
+REQUEST_TIMEOUT = 300
+
+# Request kinds: method, path and query parameters. Uploads use upsert so
+# the same file can be posted again and again.
+REQUESTS = {
+    'employees_per_quarter': ('GET', '/employees_per_quarter/', {'year': 2021}),
+    'departments_above_average': ('GET', '/departments_above_average/', {'year': 2021}),
+    'departments_above_median': (
+        'GET', '/departments_above_average/', {'year': 2021, 'comparison': 'median'}
+    ),
+    'upload_csv': (
+        'POST', '/upload_csv/', {'table': 'employee', 'mode': 'upsert', 'chunksize': 50_000}
+    ),
+    'pool_stats': ('GET', '/pool_stats/', {}),
+}
+DEFAULT_MIX = {'employees_per_quarter': 10, 'departments_above_average': 10, 'upload_csv': 1}
+
+
+def percentile(values, fraction):
+    """
+    Return the nearest-rank percentile of a list of numbers.
+
+    Args:
+        values: The numbers, in any order.
+        fraction: The percentile as a fraction, such as 0.95.
+
+    Returns:
+        float: The percentile, or None for an empty list.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(samples, elapsed):
+    """
+    Aggregate request samples per request kind.
+
+    Args:
+        samples: List of ``(kind, seconds, ok)`` tuples.
+        elapsed: Wall-clock seconds the load ran for.
+
+    Returns:
+        dict: Count, error rate, throughput and latency percentiles per kind.
+    """
+    by_kind = {}
+    for kind, seconds, ok in samples:
+        by_kind.setdefault(kind, []).append((seconds, ok))
+    summary = {}
+    for kind, results in sorted(by_kind.items()):
+        latencies = [seconds for seconds, _ in results]
+        errors = sum(1 for _, ok in results if not ok)
+        summary[kind] = {
+            "requests": len(results),
+            "errors": errors,
+            "error_rate": round(errors / len(results), 4),
+            "requests_per_second": round(len(results) / elapsed, 2),
+            "p50_seconds": round(percentile(latencies, 0.50), 5),
+            "p95_seconds": round(percentile(latencies, 0.95), 5),
+            "p99_seconds": round(percentile(latencies, 0.99), 5),
+            "max_seconds": round(max(latencies), 5),
+        }
+    return summary
+
+
+async def _measure_loop_lag(lags, stop):
+    """Record how late the event loop wakes a sleeping task, until ``stop`` is set."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        lags.append(time.perf_counter() - start - LOOP_LAG_INTERVAL)
+
+
+async def _worker(client, mix, upload_body, deadline, samples, rng):
+    """Send requests drawn from the mix until the deadline."""
+    kinds, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        method, path, params = REQUESTS[kind]
+        files = {'file': ('load_test.csv', upload_body, 'text/csv')} if method == 'POST' else None
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, params=params, files=files)
+            ok = response.status_code < 400
+            if not ok:
+                logging.warning(f"{kind} returned {response.status_code}: {response.text[:200]}")
+        except httpx.HTTPError as e:
+            ok = False
+            logging.warning(f"{kind} failed: {e!r}")
+        samples.append((kind, time.perf_counter() - start, ok))
+
+
+@asynccontextmanager
+async def _http_client(url):
+    """Yield a client for the server at ``url``, or for the ASGI app in this process."""
+    timeout = httpx.Timeout(REQUEST_TIMEOUT)
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+            yield client
+        return
+    from src.main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url='http://load-test', timeout=timeout
+        ) as client:
+            yield client
+
+
+async def _load_references(client, references):
+    """Upsert the departments and jobs the uploaded employees refer to."""
+    for table, body in references.items():
+        response = await client.post(
+            '/upload_csv/', params={'table': table, 'mode': 'upsert'},
+            files={'file': (f'{table}.csv', body, 'text/csv')},
+        )
+        response.raise_for_status()
+
+
+async def run(
+    mix, concurrency, duration, upload_body, url=None, seed=DEFAULT_SEED, references=None
+):
+    """
+    Run the load and collect the results.
+
+    Args:
+        mix: Mapping of request kind to its weight in the traffic.
+        concurrency: Number of concurrent workers, each with one request in flight.
+        duration: Seconds to send requests for.
+        upload_body: The CSV posted by upload requests.
+        url: Base URL of a running server; the app is run in process when omitted.
+        seed: Seed of the request mix, so runs send the same sequence.
+        references: Optional mapping of table name to CSV, upserted before
+            the load starts so uploaded employees have their departments and jobs.
+
+    Returns:
+        dict: The settings, the per-endpoint summary, the pool stats after the
+        load and, in process, the event loop lag.
+    """
+    samples, lags = [], []
+    stop = asyncio.Event()
+    async with _http_client(url) as client:
+        await _load_references(client, references or {})
+        lag_task = None if url else asyncio.create_task(_measure_loop_lag(lags, stop))
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(
+            _worker(client, mix, upload_body, deadline, samples, random.Random(seed + index))
+            for index in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        if lag_task:
+            await lag_task
+        pool_stats = (await client.get('/pool_stats/')).json()
+
+    results = {
+        "target": url or 'in-process',
+        "concurrency": concurrency,
+        "duration_seconds": round(elapsed, 2),
+        "mix": mix,
+        "total_requests": len(samples),
+        "endpoints": summarize(samples, elapsed),
+        "pool_stats": pool_stats,
+    }
+    if lags:
+        results["event_loop_lag"] = {
+            "p50_seconds": round(percentile(lags, 0.50), 5),
+            "p99_seconds": round(percentile(lags, 0.99), 5),
+            "max_seconds": round(max(lags), 5),
+        }
+    return results
+
+
+def _parse_mix(values):
+    """Parse ``kind=weight`` arguments into a mix, or return the default mix."""
+    if not values:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for value in values:
+        kind, _, weight = value.partition('=')
+        if kind not in REQUESTS:
+            raise SystemExit(f"Unknown request kind {kind!r}; choose from {', '.join(REQUESTS)}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def _print_report(results):
+    """Print the per-endpoint summary as a table."""
+    print(f"{results['total_requests']} requests in {results['duration_seconds']}s "
+          f"against {results['target']} with concurrency {results['concurrency']}")
+    print(f"{'endpoint':<28}{'requests':>9}{'errors':>8}{'req/s':>9}"
+          f"{'p50':>10}{'p95':>10}{'p99':>10}")
+    for kind, row in results["endpoints"].items():
+        print(f"{kind:<28}{row['requests']:>9}{row['errors']:>8}{row['requests_per_second']:>9}"
+              f"{row['p50_seconds']:>10.4f}{row['p95_seconds']:>10.4f}{row['p99_seconds']:>10.4f}")
+    if "event_loop_lag" in results:
+        lag = results["event_loop_lag"]
+        print(f"event loop lag: p50 {lag['p50_seconds']:.4f}s, p99 {lag['p99_seconds']:.4f}s, "
+              f"max {lag['max_seconds']:.4f}s")
+    stats = results["pool_stats"]
+    print(f"pool: {stats['checkouts']} checkouts, {stats['timeouts']} timeouts, "
+          f"wait avg {stats['wait_seconds_avg']}s max {stats['wait_seconds_max']}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', help='base URL of a running server; in process when omitted')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--mix', action='append', help='kind=weight; repeatable')
+    parser.add_argument('--upload-file', help='CSV posted by upload_csv requests')
+    parser.add_argument('--upload-rows', type=int, default=UPLOAD_ROWS,
+                        help='rows of the generated upload file when --upload-file is omitted')
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'))
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    mix = _parse_mix(args.mix)
+    paths = generate(args.data_dir, args.upload_rows)
+    with open(args.upload_file or paths['employee'], 'rb') as upload:
+        upload_body = upload.read()
+    references = {}
+    for table in ('department', 'job'):
+        with open(paths[table], 'rb') as reference:
+            references[table] = reference.read()
+
+    results = asyncio.run(run(
+        mix, args.concurrency, args.duration, upload_body, args.url, args.seed, references
+    ))
+    _print_report(results)
+    if args.output:
+        with open(args.output, 'w') as out:
+            json.dump(results, out, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+Benchmark the ingestion paths and report queries of PostgresClient.
+
+Every run creates a throwaway database on the server configured by the usual
+POSTGRES_* settings, loads the generated hiring data through each ingestion
+path, times the report queries and drops the database again. Each case runs
+in a fresh process, so its peak RSS is its own. Results are written as JSON,
+and ``--baseline`` compares them with the file of an earlier run.
+
+Usage:
+    python -m benchmarks.run --rows 10k --rows 1m --output results.json
+"""
+import argparse
+from datetime import datetime, timezone
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+import psycopg2
+from benchmarks.generate import DEFAULT_SEED, generate, parse_rows
+
+CHUNKSIZE = 100_000
+REPORT_REPEATS = 5
+REGRESSION_RATIO = 1.2
+
+# Ingestion cases: name, PostgresClient method, table and keyword arguments.
+INGESTION_CASES = (
+    ('upload', 'load_file', {}),
+    ('upload_chunked', 'load_file', {'chunksize': CHUNKSIZE}),
+    ('upload_upsert', 'load_file', {'chunksize': CHUNKSIZE, 'mode': 'upsert'}),
+    ('upload_validate', 'load_file', {'chunksize': CHUNKSIZE, 'validate': True}),
+    ('batch_insert', 'batch_insert_file', {'chunksize': CHUNKSIZE}),
+    ('batch_insert_upsert', 'batch_insert_file', {'chunksize': CHUNKSIZE, 'mode': 'upsert'}),
+    ('batch_insert_validate', 'batch_insert_file', {'chunksize': CHUNKSIZE, 'validate': True}),
+)
+REPORT_CASES = (
+    ('employees_per_quarter', '_employees_per_quarter', {'year': 2021}),
+    ('departments_above_average', '_departments_above_average', {'year': 2021}),
+    ('departments_above_median', '_departments_above_average',
+     {'year': 2021, 'comparison': 'median'}),
+    ('departments_top', '_departments_above_average',
+     {'year': 2021, 'comparison': 'top', 'top_n': 5}),
+)
+
+
+def _server_dsn(database):
+    """Return the psycopg2 connection string for a database on the configured server."""
+    return (
+        f"host={os.getenv('POSTGRES_HOST', 'db')} "
+        f"user={os.getenv('POSTGRES_USER', 'user')} "
+        f"password={os.getenv('POSTGRES_PASSWORD', 'admin')} "
+        f"dbname={database}"
+    )
+
+
+def _admin(statement):
+    """Run a statement outside a transaction on the server's maintenance database."""
+    connection = psycopg2.connect(_server_dsn(os.getenv('BENCHMARK_ADMIN_DB', 'postgres')))
+    connection.autocommit = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(statement)
+            return cursor.fetchone() if cursor.description else None
+    finally:
+        connection.close()
+
+
+def _peak_rss_mb():
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def _client():
+    """Import the client singleton and create the schema in the database in POSTGRES_DB."""
+    from src.services.postgres_client import client
+    client.init_db()
+    return client
+
+
+def _reset(client, paths):
+    """Empty every table, then load the departments and jobs referenced by employees."""
+    from sqlalchemy import text
+    from src.models import Base
+    from src.models.schema_version import SchemaVersion
+    tables = ', '.join(
+        table.name for table in Base.metadata.sorted_tables if table is not SchemaVersion.__table__
+    )
+    with client.engine.begin() as connection:
+        connection.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    client.sync_analytics()
+    client.load_file(paths['department'], 'department')
+    client.load_file(paths['job'], 'job')
+    client.report_cache.invalidate()
+
+
+def _run_ingestion(name, method, kwargs, paths, rows):
+    """Time one ingestion case on an empty database; runs in its own process."""
+    client = _client()
+    _reset(client, paths)
+    if kwargs.get('mode') == 'upsert':
+        client.load_file(paths['employee'], 'employee', chunksize=CHUNKSIZE)
+    baseline_rss = _peak_rss_mb()
+    start = time.perf_counter()
+    summary = getattr(client, method)(paths['employee'], 'employee', **kwargs)
+    seconds = time.perf_counter() - start
+    client.close()
+    return {
+        "case": name,
+        "method": method,
+        "options": kwargs,
+        "rows": rows,
+        "rows_inserted": summary["rows_inserted"],
+        "rejected": sum(summary.get("rejected", {}).values()),
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(rows / seconds, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "baseline_rss_mb": round(baseline_rss, 1),
+    }
+
+
+def _run_reports(paths, repeats):
+    """Load the employees once, then time each report query without the result cache."""
+    client = _client()
+    _reset(client, paths)
+    client.load_file(paths['employee'], 'employee', chunksize=CHUNKSIZE)
+    results = []
+    for name, method, kwargs in REPORT_CASES:
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            getattr(client, method)(**kwargs)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        results.append({
+            "case": name,
+            "method": method,
+            "options": kwargs,
+            "repeats": repeats,
+            "mean_seconds": round(statistics.fmean(timings), 5),
+            "p50_seconds": round(timings[len(timings) // 2], 5),
+            "max_seconds": round(timings[-1], 5),
+            "min_seconds": round(timings[0], 5),
+        })
+    client.close()
+    return results
+
+
+def _in_child(pool_context, func, *args):
+    """Run a case in a new interpreter, so imports, caches and RSS start from scratch."""
+    with pool_context.Pool(1, maxtasksperchild=1) as pool:
+        return pool.apply(func, args)
+
+
+def _git_commit():
+    """Return the commit being benchmarked, marked dirty when the tree has changes."""
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], text=True).strip()
+        dirty = subprocess.check_output(['git', 'status', '--porcelain', '-uno'], text=True)
+        return commit + ('-dirty' if dirty.strip() else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales, data_dir, seed=DEFAULT_SEED, cases=None, repeats=REPORT_REPEATS):
+    """
+    Run the benchmark suite against a throwaway database.
+
+    Args:
+        scales: Row counts of the employee files to benchmark.
+        data_dir: Where the generated files are kept between runs.
+        seed: The data generator seed.
+        cases: Optional names of the ingestion cases to run; all when omitted.
+        repeats: Times each report query is run.
+
+    Returns:
+        dict: The environment and the results of every case at every scale.
+    """
+    database = f"benchmark_{uuid.uuid4().hex[:12]}"
+    _admin(f'CREATE DATABASE "{database}"')
+    os.environ['POSTGRES_DB'] = database
+    pool_context = multiprocessing.get_context('spawn')
+    try:
+        server_version = _admin("SHOW server_version")[0]
+        results = {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "postgres": server_version,
+            "analytics_backend": os.getenv('ANALYTICS_BACKEND', 'postgres'),
+            "seed": seed,
+            "chunksize": CHUNKSIZE,
+            "scales": [],
+        }
+        for rows in scales:
+            paths = generate(data_dir, rows, seed)
+            logging.info(f"Benchmarking {rows} rows")
+            ingestion = [
+                _in_child(pool_context, _run_ingestion, name, method, kwargs, paths, rows)
+                for name, method, kwargs in INGESTION_CASES
+                if not cases or name in cases
+            ]
+            reports = _in_child(pool_context, _run_reports, paths, repeats)
+            results["scales"].append({"rows": rows, "ingestion": ingestion, "reports": reports})
+        return results
+    finally:
+        _admin(f'DROP DATABASE IF EXISTS "{database}"')
+
+
+def compare(results, baseline, ratio=REGRESSION_RATIO):
+    """
+    List the cases that got slower than in a baseline run.
+
+    Args:
+        results: The results of this run.
+        baseline: The results of an earlier run.
+        ratio: How many times slower a case must be to count as a regression.
+
+    Returns:
+        list: One line per case present in both runs, flagged when it regressed.
+    """
+    def timings(run_results):
+        return {
+            (scale["rows"], case["case"]): case.get("seconds", case.get("p50_seconds"))
+            for scale in run_results["scales"]
+            for case in scale["ingestion"] + scale["reports"]
+        }
+
+    before = timings(baseline)
+    lines = []
+    for key, seconds in timings(results).items():
+        if key not in before or not before[key]:
+            continue
+        change = seconds / before[key]
+        flag = 'REGRESSION' if change > ratio else ''
+        lines.append(f"{key[0]:>10} {key[1]:<28} {before[key]:>10.4f}s -> {seconds:>10.4f}s "
+                     f"x{change:.2f} {flag}".rstrip())
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', action='append', help="'10k', '1m', '10m' or a row count; repeatable")
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'))
+    parser.add_argument('--output', default=os.path.join('benchmarks', 'results', 'latest.json'))
+    parser.add_argument('--baseline', help='results file of an earlier run to compare with')
+    parser.add_argument('--case', action='append', help='ingestion case to run; repeatable')
+    parser.add_argument('--repeats', type=int, default=REPORT_REPEATS)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    scales = [parse_rows(value) for value in args.rows or ['10k']]
+    results = run(scales, args.data_dir, args.seed, args.case, args.repeats)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as out:
+        json.dump(results, out, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            lines = compare(results, json.load(baseline_file))
+        print('\n'.join(lines))
+        if any(line.endswith('REGRESSION') for line in lines):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,59 @@
+import asyncio
+from contextlib import asynccontextmanager
 import logging
+import os
 import uvicorn
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import text
 from src.routes.upload_csv import router as upload_csv_router
 from src.routes.batch_insert import router as batch_insert_router
 from src.routes.employees_per_quarter import router as employees_per_quarter_router
 from src.routes.departments_above_average import router as departments_above_average_router
+from src.routes.jobs import router as jobs_router
+from src.routes.export import router as export_router
+from src.routes.pool_stats import router as pool_stats_router
+from src.routes.metrics import router as metrics_router
+from src.services.admission import AdmissionMiddleware
+from src.services.metrics import MetricsMiddleware
 from src.services.postgres_client import client
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the database client in the serving process, check the schema, open
+    the pool's connections and load the analytics backend before serving
+    requests, and close the connections on shutdown.
+
+    With several workers, each one also polls the shared data version while
+    it serves, to drop the reports cached before another worker's ingestion.
+    """
+    await run_in_threadpool(client.start)
+    await run_in_threadpool(client.init_db)
+    await run_in_threadpool(client.warm_pool)
+    await run_in_threadpool(client.sync_analytics)
+    watcher = asyncio.create_task(client.watch_data_version()) if client.shared_data_version else None
+    yield
+    if watcher:
+        watcher.cancel()
+    await run_in_threadpool(client.close)
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(upload_csv_router)
 app.include_router(batch_insert_router)
 app.include_router(employees_per_quarter_router)
 app.include_router(departments_above_average_router)
+app.include_router(jobs_router)
+app.include_router(export_router)
+app.include_router(pool_stats_router)
+app.include_router(metrics_router)
 
 if __name__ == "__main__":
-    client.init_db()
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(
+        "src.main:app", host="0.0.0.0", port=8000, workers=int(os.getenv('WEB_CONCURRENCY', '1'))
+    )
\ No newline at end of file
@@ -0,0 +1,41 @@
+import datetime as dt
+from pydantic import BaseModel, ConfigDict
+from src.models.tables import TableName
+
+class DepartmentRow(BaseModel):
+    """
+    Represents a department sent in the JSON body of a batch insert.
+    """
+    model_config = ConfigDict(extra='forbid')
+    id: int
+    department: str
+
+
+class JobRow(BaseModel):
+    """
+    Represents a job sent in the JSON body of a batch insert.
+    """
+    model_config = ConfigDict(extra='forbid')
+    id: int
+    job: str
+
+
+class EmployeeRow(BaseModel):
+    """
+    Represents an employee sent in the JSON body of a batch insert.
+
+    Datetimes without a zone offset are taken as UTC, like in uploaded files.
+    """
+    model_config = ConfigDict(extra='forbid')
+    id: int
+    name: str | None = None
+    datetime: dt.datetime | None = None
+    department_id: int | None = None
+    job_id: int | None = None
+
+
+ROW_MODELS = {
+    TableName.JOB: JobRow,
+    TableName.EMPLOYEE: EmployeeRow,
+    TableName.DEPARTMENT: DepartmentRow,
+}
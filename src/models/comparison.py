@@ -0,0 +1,12 @@
+from enum import Enum
+
+class Comparison(str, Enum):
+    """
+    Enum representing how departments are selected by the departments report.
+
+    MEAN keeps departments that hired more than the mean per department,
+    MEDIAN those that hired more than the median, and TOP the top-N by hires.
+    """
+    MEAN = "mean"
+    MEDIAN = "median"
+    TOP = "top"
@@ -1,8 +1,8 @@
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
-from src.models import db
+from src.models import Base
 
-class Department(db.Model):
+class Department(Base):
     """
     Represents a department within the organization.
     """
@@ -1,12 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from src.models import db
+from src.models import Base
 
-class Employee(db.Model):
+class Employee(Base):
     """
     Represents an employee in the organization.
     """
     __tablename__ = "employees"
+    __table_args__ = (
+        Index('ix_employees_datetime_department_job', 'datetime', 'department_id', 'job_id'),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     datetime = Column(DateTime, nullable=True)
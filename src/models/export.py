@@ -0,0 +1,19 @@
+from enum import Enum
+
+class ExportDataset(str, Enum):
+    """
+    Enum representing the tables and reports that can be exported.
+    """
+    EMPLOYEES = "employees"
+    DEPARTMENTS = "departments"
+    JOBS = "jobs"
+    EMPLOYEES_PER_QUARTER = "employees_per_quarter"
+    DEPARTMENTS_ABOVE_AVERAGE = "departments_above_average"
+
+
+class ExportFormat(str, Enum):
+    """
+    Enum representing the columnar formats exports are written in.
+    """
+    ARROW = "arrow"
+    PARQUET = "parquet"
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, SmallInteger
+from src.models import Base
+
+class HiresByDeptJobQuarter(Base):
+    """
+    Represents the number of employees hired for a department and job in one quarter.
+
+    Maintained incrementally by every ingestion path, in the same transaction
+    as the employee rows, so reports read it instead of scanning employees.
+    """
+    __tablename__ = "hires_by_dept_job_quarter"
+    year = Column(Integer, primary_key=True)
+    department_id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, primary_key=True)
+    quarter = Column(SmallInteger, primary_key=True)
+    hired = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,11 @@
+from enum import Enum
+
+class InsertMode(str, Enum):
+    """
+    Enum representing how ingested rows are written to their table.
+
+    APPEND inserts every row and fails on a primary-key collision.
+    UPSERT stages the rows and merges them, updating rows whose id already exists.
+    """
+    APPEND = "append"
+    UPSERT = "upsert"
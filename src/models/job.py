@@ -1,8 +1,8 @@
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
-from src.models import db
+from src.models import Base
 
-class Job(db.Model):
+class Job(Base):
     """
     Represents a job in the organization.
     """
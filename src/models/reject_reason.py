@@ -0,0 +1,14 @@
+from enum import Enum
+
+class RejectReason(str, Enum):
+    """
+    Enum representing why the validation stage quarantined an ingested row.
+
+    Each rejected row gets the first reason that applies, in the order below.
+    """
+    MISSING_VALUE = "missing_value"
+    INVALID_INTEGER = "invalid_integer"
+    INVALID_DATETIME = "invalid_datetime"
+    DUPLICATE_ID = "duplicate_id"
+    UNKNOWN_DEPARTMENT = "unknown_department"
+    UNKNOWN_JOB = "unknown_job"
@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from src.models import Base
+
+class RejectedRow(Base):
+    """
+    Represents an ingested row quarantined by the validation stage.
+
+    Rows are written in the same transaction as the valid rows of their
+    upload and keep the raw values, so they can be fixed and re-uploaded.
+    """
+    __tablename__ = "rejected_rows"
+    __table_args__ = (
+        Index('ix_rejected_rows_upload_id', 'upload_id'),
+    )
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    upload_id = Column(String, nullable=False)
+    table_name = Column(String, nullable=False)
+    row_number = Column(Integer, nullable=False)
+    reason = Column(String, nullable=False)
+    record = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
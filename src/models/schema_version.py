@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, String, func
+from src.models import Base
+
+class SchemaVersion(Base):
+    """
+    Represents a version of the schema applied to the database.
+
+    The fingerprint hashes the DDL of every model, so a process starting
+    against a database that already has its fingerprint skips the schema
+    checks.
+    """
+    __tablename__ = "schema_versions"
+    fingerprint = Column(String, primary_key=True)
+    applied_at = Column(DateTime, nullable=False, server_default=func.now())
@@ -7,3 +7,15 @@ class TableName(str, Enum):
     JOB = "job"
     EMPLOYEE = "employee"
     DEPARTMENT = "department"
+
+    @property
+    def columns(self) -> list:
+        """Column names, in file order, of the headerless CSVs loaded into this table."""
+        return list(TABLE_COLUMNS[self])
+
+
+TABLE_COLUMNS = {
+    TableName.JOB: ('id', 'job'),
+    TableName.EMPLOYEE: ('id', 'name', 'datetime', 'department_id', 'job_id'),
+    TableName.DEPARTMENT: ('id', 'department'),
+}
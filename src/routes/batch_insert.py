@@ -1,7 +1,17 @@
-from io import StringIO
+from collections import Counter
 import pandas as pd
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from src.services.admission import admission
+from src.services.file_formats import iter_frames
+from src.services.job_manager import jobs
+from src.services.json_rows import complete_rows, decode_rows, validate_rows
+from src.services.metrics import timed_iter
 from src.services.postgres_client import client
+from src.models.insert_mode import InsertMode
 from src.models.tables import TableName
 
 
@@ -9,32 +19,185 @@ router = APIRouter()
 
 
 @router.post("/batch_insert/")
-async def batch_insert(table: TableName, file: UploadFile = File(...)):
+async def batch_insert(
+    request: Request,
+    table: TableName,
+    file: UploadFile | None = File(None),
+    chunksize: int | None = Query(None, gt=0),
+    background: bool = False,
+    mode: InsertMode = InsertMode.APPEND,
+    validate: bool = False,
+):
     """
     Endpoint for batch inserting data into the specified table.
 
+    The file may be a headerless CSV, Parquet or Arrow IPC file; the format is
+    detected from its content. It is parsed directly from the spooled upload,
+    off the event loop. When ``chunksize`` is
+    given, the file is read in chunks of that many rows and each chunk is
+    inserted and committed as its own batch.
+
+    Without a file, the request body is read as a JSON array of rows, or as
+    one JSON row per line with ``Content-Type: application/x-ndjson``.
+
     Args:
+        request (Request): The incoming request, whose body holds the rows
+            when no file is uploaded.
         table (TableName): The name of the table to insert data into.
-        file (UploadFile): The CSV file containing data to be inserted.
+        file (UploadFile, optional): The CSV, Parquet or Arrow IPC file containing data
+            to be inserted.
+        chunksize (int, optional): Number of rows to parse and insert per batch.
+        background (bool): Spool the file to disk and insert it in a background job.
+        mode (InsertMode): Append the rows, or upsert them by id through a staging table.
+        validate (bool): Insert the valid rows and quarantine the invalid ones with a
+            reason code instead of rejecting the whole batch.
 
     Returns:
-        dict: A response indicating the result of the batch insert operation.
+        dict: A response indicating the result of the batch insert operation,
+        or a 202 response with the job status when ``background`` is set.
 
     Raises:
-        HTTPException: If an error occurs during the batch insert process.
+        HTTPException: 503 if no database connection is free for ingestion, or
+        400 if any other error occurs during the batch insert process.
     """
+    if file is None:
+        return await insert_json_rows(request, table, chunksize, background, mode, validate)
+
     try:
-        contents = await file.read()
-        column_names = get_column_names(table)
+        get_column_names(table)
+
+        if background:
+            job = await jobs.submit(
+                file,
+                table.value,
+                lambda path, progress: client.batch_insert_file(
+                    path, table.value, chunksize, progress, mode.value, validate
+                ),
+            )
+            return JSONResponse(status_code=202, content=job.to_dict())
+
+        frames = timed_iter(
+            await run_in_threadpool(iter_frames, file.file, table.value, chunksize, validate),
+            'batch_insert', table.value, 'parse'
+        )
+
+        if not chunksize:
+            df = await run_in_threadpool(lambda: pd.concat(list(frames), ignore_index=True))
 
-        df = pd.read_csv(StringIO(contents.decode("utf-8")), header=None, names=column_names)
-        rows = df.to_dict(orient='records')
+            response = await client.handle_batch_insert(
+                rows=df, table=table.value, mode=mode.value, validate=validate
+            )
+            return response
 
-        response = await client.handle_batch_insert(rows=rows, table=table.value)
+        chunk_rows = []
+        rejected = Counter()
+        upload_id = None
+        first_row = 1
+        while (df := await run_in_threadpool(next, frames, None)) is not None:
+            response = await client.handle_batch_insert(
+                rows=df, table=table.value, mode=mode.value,
+                validate=validate, upload_id=upload_id, first_row=first_row
+            )
+            chunk_rows.append(response["rows_inserted"])
+            rejected.update(response.get("rejected", {}))
+            upload_id = response.get("upload_id")
+            first_row += len(df)
+
+        response = {"status": "success", "rows_inserted": sum(chunk_rows), "chunks": chunk_rows}
+        if validate:
+            response.update(upload_id=upload_id, rejected=dict(rejected))
         return response
+    except PoolTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers=admission.retry_headers()) from e
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+async def insert_json_rows(
+    request: Request,
+    table: TableName,
+    chunksize: int | None,
+    background: bool,
+    mode: InsertMode,
+    validate: bool,
+):
+    """
+    Insert the rows of a JSON array or NDJSON request body.
+
+    Rows are decoded with orjson. Unless ``validate`` is set, they are
+    checked against the table's pydantic model, and appends are written with
+    one multi-row INSERT per batch, skipping DataFrames entirely. Upserts,
+    and batches whose invalid rows are quarantined, take the same path as
+    file rows.
+
+    Args:
+        request (Request): The incoming request.
+        table (TableName): The name of the table to insert data into.
+        chunksize (int, optional): Number of rows to insert and commit per batch.
+        background (bool): Not supported for JSON bodies.
+        mode (InsertMode): Append the rows, or upsert them by id.
+        validate (bool): Quarantine invalid rows instead of rejecting the request.
+
+    Returns:
+        dict: A response indicating the result of the batch insert operation.
+
+    Raises:
+        HTTPException: 400 if the body is not JSON rows or the insert fails,
+        422 if a row does not match the table's model, 503 if no database
+        connection is free for ingestion.
+    """
+    if background:
+        raise HTTPException(status_code=400, detail="Background inserts require a file upload")
+    try:
+        rows = decode_rows(await request.body(), request.headers.get("content-type", ""))
+        if validate:
+            rows = complete_rows(rows, table)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON rows: {e}") from e
+    if not validate:
+        try:
+            rows = validate_rows(rows, table)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=422, detail=e.errors(include_url=False, include_context=False)
+            ) from e
+
+    if not rows:
+        return {"status": "success", "rows_inserted": 0}
+
+    size = chunksize or len(rows)
+    batches = [rows[start:start + size] for start in range(0, len(rows), size)]
+    responses = []
+    upload_id = None
+    first_row = 1
+    try:
+        for batch in batches:
+            if mode == InsertMode.APPEND and not validate:
+                response = await client.handle_row_insert(batch, table.value)
+            else:
+                response = await client.handle_batch_insert(
+                    rows=batch, table=table.value, mode=mode.value, validate=validate,
+                    upload_id=upload_id, first_row=first_row
+                )
+                upload_id = response.get("upload_id")
+            responses.append(response)
+            first_row += len(batch)
+    except PoolTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers=admission.retry_headers()) from e
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
+    if not chunksize:
+        return responses[0]
+    chunk_rows = [batch_response["rows_inserted"] for batch_response in responses]
+    response = {"status": "success", "rows_inserted": sum(chunk_rows), "chunks": chunk_rows}
+    if validate:
+        rejected = Counter()
+        for batch_response in responses:
+            rejected.update(batch_response.get("rejected", {}))
+        response.update(upload_id=upload_id, rejected=dict(rejected))
+    return response
+
+
 def get_column_names(table: TableName) -> list:
     """
     Get the column names for the specified table.
@@ -48,11 +211,6 @@ def get_column_names(table: TableName) -> list:
     Raises:
         HTTPException: If the table name is invalid.
     """
-    if table == TableName.EMPLOYEE:
-        return ['id', 'name', 'datetime', 'department_id', 'job_id']
-    elif table == TableName.JOB:
-        return ['id', 'job']
-    elif table == TableName.DEPARTMENT:
-        return ['id', 'department']
-    else:
+    if not isinstance(table, TableName):
         raise HTTPException(status_code=400, detail="Invalid table name")
+    return table.columns
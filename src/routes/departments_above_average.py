@@ -1,20 +1,50 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from src.models.comparison import Comparison
 from src.services.postgres_client import client
+from src.services.report_cache import etag_matches
+from src.services.report_responses import ndjson_response, wants_ndjson
 
 router = APIRouter()
 
 @router.get("/departments_above_average/")
-async def departments_above_average():
+async def departments_above_average(
+    request: Request,
+    year: int = Query(2021, ge=1900, le=2100),
+    comparison: Comparison = Comparison.MEAN,
+    top_n: int = Query(5, ge=1),
+):
     """
     Get a list of departments whose performance
     is above the average.
 
+    Args:
+        request (Request): The incoming request, checked for If-None-Match and
+            for ``Accept: application/x-ndjson`` to stream one JSON row per line.
+        year (int): The hire year to report on. Defaults to 2021.
+        comparison (Comparison): Keep departments above the mean or the median
+            number of hires, or the top ``top_n`` departments. Defaults to mean.
+        top_n (int): Number of departments returned by the top comparison.
+
     Returns:
-        list: A list of departments above average performance.
+        list: A list of departments above average performance, with an ETag,
+        or an empty 304 response if the client's copy is still current.
     """
+    params = {"year": year, "comparison": comparison.value, "top_n": top_n}
+    ndjson = wants_ndjson(request)
+    etag = client.report_etag(
+        "departments_above_average", **params, format="ndjson" if ndjson else "json"
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    if ndjson:
+        rows = client.iter_report("departments_above_average", **params)
+        return ndjson_response(rows, headers={"ETag": etag})
+
     try:
-        response = await client.get_departments_above_average()
+        response = await client.get_departments_above_average(**params)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
-    return response
+    return ORJSONResponse(content=response, headers={"ETag": etag})
@@ -1,19 +1,39 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from src.services.postgres_client import client
+from src.services.report_cache import etag_matches
+from src.services.report_responses import ndjson_response, wants_ndjson
 
 router = APIRouter()
 
 @router.get("/employees_per_quarter/")
-async def employees_per_quarter():
+async def employees_per_quarter(request: Request, year: int = Query(2021, ge=1900, le=2100)):
     """
     Retrieve the number of employees per quarter from the database.
-    
+
+    Args:
+        request (Request): The incoming request, checked for If-None-Match and
+            for ``Accept: application/x-ndjson`` to stream one JSON row per line.
+        year (int): The hire year to report on. Defaults to 2021.
+
     Returns:
-        JSON response containing the number of employees per quarter.
+        JSON response containing the number of employees per quarter, with an
+        ETag, or an empty 304 response if the client's copy is still current.
     """
+    ndjson = wants_ndjson(request)
+    etag = client.report_etag(
+        "employees_per_quarter", year=year, format="ndjson" if ndjson else "json"
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    if ndjson:
+        rows = client.iter_report("employees_per_quarter", year=year)
+        return ndjson_response(rows, headers={"ETag": etag})
+
     try:
-        response = await client.get_employees_per_quarter()
+        response = await client.get_employees_per_quarter(year=year)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
-    return response
+    return ORJSONResponse(content=response, headers={"ETag": etag})
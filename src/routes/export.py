@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from src.models.comparison import Comparison
+from src.models.export import ExportDataset, ExportFormat
+from src.services.arrow_export import FILE_EXTENSIONS, MEDIA_TYPES, iter_export
+from src.services.postgres_client import client
+
+router = APIRouter()
+
+@router.get("/export/{dataset}")
+async def export(
+    dataset: ExportDataset,
+    export_format: ExportFormat = Query(ExportFormat.ARROW, alias="format"),
+    year: int = Query(2021, ge=1900, le=2100),
+    comparison: Comparison = Comparison.MEAN,
+    top_n: int = Query(5, ge=1),
+):
+    """
+    Stream a table or report in a columnar format.
+
+    Rows are read from a server-side cursor in batches and each batch is
+    encoded and sent before the next is fetched.
+
+    Args:
+        dataset (ExportDataset): The table or report to export.
+        export_format (ExportFormat): 'arrow' for an Arrow IPC stream or 'parquet'.
+        year (int): The hire year of the reports. Defaults to 2021.
+        comparison (Comparison): The comparison used by departments_above_average.
+        top_n (int): Number of departments returned by the top comparison.
+
+    Returns:
+        StreamingResponse: The encoded dataset.
+
+    Raises:
+        HTTPException: If the export cannot be started.
+    """
+    report_params = {
+        ExportDataset.EMPLOYEES_PER_QUARTER: {"year": year},
+        ExportDataset.DEPARTMENTS_ABOVE_AVERAGE: {
+            "year": year, "comparison": comparison.value, "top_n": top_n
+        },
+    }
+    try:
+        columns, batches = client.export_batches(
+            dataset.value, **report_params.get(dataset, {})
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    filename = f"{dataset.value}.{FILE_EXTENSIONS[export_format.value]}"
+    return StreamingResponse(
+        iter_export(dataset.value, export_format.value, columns, batches),
+        media_type=MEDIA_TYPES[export_format.value],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
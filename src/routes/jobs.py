@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException
+from src.services.job_manager import jobs
+
+router = APIRouter()
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status of a background ingestion job.
+
+    Args:
+        job_id (str): The ID returned when the upload was queued.
+
+    Returns:
+        dict: The job state, rows processed, throughput and error, if any.
+
+    Raises:
+        HTTPException: If no job with the given ID is known.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
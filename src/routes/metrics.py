@@ -0,0 +1,24 @@
+import os
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client import multiprocess
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def metrics():
+    """
+    Expose the request, ingestion and report metrics in the Prometheus text format.
+
+    With ``PROMETHEUS_MULTIPROC_DIR`` set, every worker process records its
+    metrics to files in that directory and the values of all workers are
+    aggregated, whichever worker serves the scrape.
+
+    Returns:
+        Response: The current value of every metric.
+    """
+    registry = REGISTRY
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
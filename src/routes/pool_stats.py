@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from src.services.postgres_client import client
+
+router = APIRouter()
+
+@router.get("/pool_stats/")
+async def pool_stats():
+    """
+    Get the usage of the database connection pool.
+
+    Returns:
+        dict: Connections checked out, idle and in overflow, plus the checkout
+        count, timeouts and average and maximum checkout wait since startup.
+    """
+    return client.pool_stats()
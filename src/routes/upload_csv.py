@@ -1,27 +1,66 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from src.services.admission import admission
+from src.services.job_manager import DEFAULT_JOB_CHUNKSIZE, jobs
 from src.services.postgres_client import client
+from src.models.insert_mode import InsertMode
 from src.models.tables import TableName
 
 router = APIRouter()
 
 
 @router.post("/upload_csv/")
-async def upload_csv(table: TableName, file: UploadFile = File(...)):
+async def upload_csv(
+    table: TableName,
+    file: UploadFile = File(...),
+    chunksize: int | None = Query(None, gt=0),
+    background: bool = False,
+    mode: InsertMode = InsertMode.APPEND,
+    validate: bool = False,
+):
     """
     Endpoint to upload a CSV file to a specified table in the database.
 
+    Parquet and Arrow IPC files are accepted as well; the format is detected
+    from the file content and their typed columns are loaded without string
+    parsing.
+
     Args:
         table (TableName): The name of the table where the CSV data will be uploaded.
-        file (UploadFile): The CSV file to be uploaded.
+        file (UploadFile): The CSV, Parquet or Arrow IPC file to be uploaded.
+        chunksize (int, optional): Stream the file in chunks of this many rows
+            instead of parsing it in one go.
+        background (bool): Spool the file to disk and load it in a background job.
+        mode (InsertMode): Append the rows, or upsert them by id through a staging table.
+        validate (bool): Load the valid rows and quarantine the invalid ones with a
+            reason code instead of rejecting the whole file.
 
     Returns:
-        Response from the database client indicating the success or failure of the upload.
+        Response from the database client indicating the success or failure of the upload,
+        or a 202 response with the job status when ``background`` is set.
 
     Raises:
-        HTTPException: If there is an error processing the file upload.
+        HTTPException: 503 if no database connection is free for ingestion, or
+        400 if there is any other error processing the file upload.
     """
     try:
-        response = await client.handle_upload(file, table.value)
+        if background:
+            job_chunksize = chunksize or DEFAULT_JOB_CHUNKSIZE
+            job = await jobs.submit(
+                file,
+                table.value,
+                lambda path, progress: client.load_file(
+                    path, table.value, job_chunksize, progress, mode.value, validate
+                ),
+            )
+            return JSONResponse(status_code=202, content=job.to_dict())
+
+        response = await client.handle_upload(
+            file, table.value, chunksize=chunksize, mode=mode.value, validate=validate
+        )
         return response
+    except PoolTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers=admission.retry_headers()) from e
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
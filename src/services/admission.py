@@ -0,0 +1,209 @@
+from collections import Counter, defaultdict, deque
+import asyncio
+import json
+import logging
+import os
+import time
+from urllib.parse import parse_qs
+from src.services.job_manager import jobs
+from src.services.metrics import (
+    INGEST_ADMISSION_REJECTIONS,
+    INGEST_ADMISSION_WAIT_SECONDS,
+    TABLE_LABELS,
+)
+
+INGESTION_PATHS = {"/upload_csv/", "/batch_insert/"}
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when an ingestion request cannot be admitted.
+
+    Carries the HTTP status to answer with and the reason recorded in the
+    rejection metric.
+    """
+
+    def __init__(self, status, reason, detail):
+        super().__init__(detail)
+        self.status = status
+        self.reason = reason
+        self.detail = detail
+
+
+class PayloadTooLarge(Exception):
+    """Raised while receiving a request body larger than the admitted size."""
+
+
+class AdmissionController:
+    """
+    Limits the ingestion requests running at once for each table.
+
+    Up to ``INGEST_MAX_CONCURRENT_PER_TABLE`` requests per table run, and up
+    to ``INGEST_MAX_QUEUED_PER_TABLE`` more wait in arrival order for one of
+    them to finish. A request finding the queue full is rejected at once, and
+    one still waiting after ``INGEST_QUEUE_TIMEOUT`` seconds gives up, so a
+    burst of uploads is turned away instead of piling onto the connection
+    pool and memory. The limits apply to each worker process.
+    """
+
+    def __init__(self):
+        """Initialize the limits from the environment, with no request admitted."""
+        self.max_concurrent = int(os.getenv('INGEST_MAX_CONCURRENT_PER_TABLE', '2'))
+        self.max_queued = int(os.getenv('INGEST_MAX_QUEUED_PER_TABLE', '8'))
+        self.queue_timeout = float(os.getenv('INGEST_QUEUE_TIMEOUT', '30'))
+        self.max_body_bytes = int(os.getenv('INGEST_MAX_BODY_BYTES', str(1024 ** 3)))
+        self.retry_after = int(os.getenv('INGEST_RETRY_AFTER', '5'))
+        self.active = Counter()
+        self.waiters = defaultdict(deque)
+
+    async def acquire(self, table):
+        """
+        Wait for a slot to run an ingestion into a table.
+
+        Args:
+            table: The name of the table being loaded.
+
+        Raises:
+            AdmissionRejected: With status 429 if the table's queue is full,
+                or 503 if no slot freed up within the queue timeout.
+        """
+        if self.active[table] < self.max_concurrent and not self.waiters[table]:
+            self.active[table] += 1
+            return
+        if len(self.waiters[table]) >= self.max_queued:
+            raise AdmissionRejected(
+                429, 'queue_full', f"Too many concurrent ingestions into {table}"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters[table].append(waiter)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._forget(table, waiter)
+            raise AdmissionRejected(
+                503, 'queue_timeout',
+                f"No ingestion slot for {table} within {self.queue_timeout:g} seconds"
+            ) from None
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release(table)
+            else:
+                self._forget(table, waiter)
+            raise
+        finally:
+            INGEST_ADMISSION_WAIT_SECONDS.labels(table).observe(time.perf_counter() - start)
+
+    def release(self, table):
+        """Hand the slot of a finished ingestion to the next waiting request, or free it."""
+        queue = self.waiters[table]
+        while queue:
+            waiter = queue.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active[table] -= 1
+
+    def retry_headers(self):
+        """Return the headers telling a rejected client when to retry."""
+        return {"Retry-After": str(self.retry_after)}
+
+    def _forget(self, table, waiter):
+        """Remove a waiter that gave up from its table's queue."""
+        try:
+            self.waiters[table].remove(waiter)
+        except ValueError:
+            pass
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying admission control to the ingestion endpoints.
+
+    Requests are checked before their body is read: a declared body above
+    ``INGEST_MAX_BODY_BYTES`` gets a ``413``, a background upload while the
+    job queue is full a ``429``, and a request that cannot get a slot of its
+    table a ``429`` or ``503``. Bodies sent without a Content-Length are cut
+    off with a ``413`` once they exceed the limit. Rejections carry a
+    ``Retry-After`` header, except for oversized bodies.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in INGESTION_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        table = query.get("table", [""])[0]
+        if table not in TABLE_LABELS:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > admission.max_body_bytes:
+            await self._reject(send, table, AdmissionRejected(
+                413, 'too_large', f"Request body exceeds {admission.max_body_bytes} bytes"
+            ))
+            return
+        if query.get("background", ["false"])[0].lower() in ('1', 'true', 'yes') and jobs.is_full():
+            await self._reject(send, table, AdmissionRejected(
+                429, 'job_queue_full', "Too many background ingestion jobs queued"
+            ))
+            return
+
+        try:
+            await admission.acquire(table)
+        except AdmissionRejected as e:
+            await self._reject(send, table, e)
+            return
+
+        received = 0
+        too_large = False
+
+        async def limited_receive():
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > admission.max_body_bytes:
+                    too_large = True
+                    raise PayloadTooLarge()
+            return message
+
+        async def guarded_send(message):
+            if not too_large:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except PayloadTooLarge:
+            pass
+        finally:
+            admission.release(table)
+        if too_large:
+            await self._reject(send, table, AdmissionRejected(
+                413, 'too_large', f"Request body exceeds {admission.max_body_bytes} bytes"
+            ))
+
+    async def _reject(self, send, table, rejection):
+        """Send the response of a rejected request and record the rejection."""
+        INGEST_ADMISSION_REJECTIONS.labels(table, rejection.reason).inc()
+        logging.warning(f"Rejected ingestion into {table}: {rejection.detail}")
+        headers = [(b"content-type", b"application/json")]
+        if rejection.status != 413:
+            headers.append((b"retry-after", str(admission.retry_after).encode()))
+        body = json.dumps({"detail": rejection.detail}).encode()
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": rejection.status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+admission = AdmissionController()
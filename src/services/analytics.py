@@ -0,0 +1,129 @@
+class MirrorWriter:
+    """
+    Receives the rows an ingestion writes, to apply them to an analytics mirror.
+
+    The base writer is used by backends that read the PostgreSQL tables
+    directly and ignores everything. Ingestion calls ``write`` after each
+    chunk reaches PostgreSQL, ``commit`` after the PostgreSQL commit and
+    ``rollback`` when the ingestion fails.
+    """
+
+    def write(self, table, df, mode='append'):
+        """
+        Stage rows written to a table in the ingestion transaction.
+
+        Args:
+            table: The name of the table the rows were written to.
+            df: The rows as loaded, with the table's columns.
+            mode: 'append' or 'upsert', as used for the PostgreSQL write.
+        """
+
+    def commit(self):
+        """Apply the staged rows, once PostgreSQL has committed them."""
+
+    def rollback(self):
+        """Discard the staged rows."""
+
+
+class AnalyticsBackend:
+    """
+    Base class of the engines running the hiring reports.
+
+    Backends answer ``employees_per_quarter`` and ``departments_above_average``
+    with the same rows as the PostgreSQL queries. Backends keeping their own
+    copy of the data are loaded by ``sync`` and kept current by the writers
+    returned from ``begin``.
+    """
+
+    name = None
+
+    def sync(self, export_table):
+        """
+        Load the backend's copy of the tables from PostgreSQL.
+
+        Args:
+            export_table: Callable ``(table_name, columns, file)`` writing the
+                given columns of a table to a binary file as headerless CSV.
+        """
+
+    def begin(self):
+        """Return the writer recording the rows of one ingestion transaction."""
+        return MirrorWriter()
+
+    def employees_per_quarter(self, year):
+        """
+        Count the employees hired per quarter of a year for each department and job.
+
+        Args:
+            year: The hire year to report on.
+
+        Returns:
+            list: One dictionary per department and job, with the hires of
+            each quarter in ``Q1`` to ``Q4``.
+        """
+        raise NotImplementedError
+
+    def departments_above_average(self, year, comparison='mean', top_n=5):
+        """
+        List the departments that hired more than the average department in a year.
+
+        Args:
+            year: The hire year to report on.
+            comparison: 'mean', 'median' or 'top'.
+            top_n: Number of departments kept by the 'top' comparison.
+
+        Returns:
+            list: One dictionary per department with its ``id``,
+            ``department`` and ``hired`` count, most hires first.
+        """
+        raise NotImplementedError
+
+
+class PostgresAnalytics(AnalyticsBackend):
+    """
+    Runs the reports as SQL queries on the PostgreSQL tables.
+    """
+
+    name = 'postgres'
+
+    def __init__(self, client):
+        """
+        Initialize the backend.
+
+        Args:
+            client: The PostgresClient whose report queries are run.
+        """
+        self.client = client
+
+    def employees_per_quarter(self, year):
+        """Run the hires-per-quarter query against the hires summary table."""
+        return self.client._fetch_report(*self.client._employees_per_quarter_query(year))
+
+    def departments_above_average(self, year, comparison='mean', top_n=5):
+        """Run the departments-above-average query against the employees table."""
+        return self.client._fetch_report(
+            *self.client._departments_above_average_query(year, comparison, top_n)
+        )
+
+
+def create_analytics_backend(name, client):
+    """
+    Create the analytics backend selected by name.
+
+    Args:
+        name: 'postgres', 'duckdb' or 'numpy'.
+        client: The PostgresClient the backend serves.
+
+    Raises:
+        ValueError: If the name is not a known backend.
+    """
+    if name == 'postgres':
+        return PostgresAnalytics(client)
+    if name == 'duckdb':
+        from src.services.duckdb_analytics import DuckDBAnalytics
+        return DuckDBAnalytics()
+    if name == 'numpy':
+        from src.services.numpy_analytics import NumpyHiringCube
+        return NumpyHiringCube()
+    raise ValueError(f"Unknown analytics backend: {name}")
+
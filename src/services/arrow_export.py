@@ -0,0 +1,96 @@
+import io
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EXPORT_SCHEMAS = {
+    'employees': pa.schema([
+        ('id', pa.int32()),
+        ('name', pa.string()),
+        ('datetime', pa.timestamp('us')),
+        ('department_id', pa.int32()),
+        ('job_id', pa.int32()),
+    ]),
+    'departments': pa.schema([('id', pa.int32()), ('department', pa.string())]),
+    'jobs': pa.schema([('id', pa.int32()), ('job', pa.string())]),
+    'employees_per_quarter': pa.schema([
+        ('department', pa.string()),
+        ('job', pa.string()),
+        ('Q1', pa.int64()),
+        ('Q2', pa.int64()),
+        ('Q3', pa.int64()),
+        ('Q4', pa.int64()),
+    ]),
+    'departments_above_average': pa.schema([
+        ('id', pa.int32()),
+        ('department', pa.string()),
+        ('hired', pa.int64()),
+    ]),
+}
+
+MEDIA_TYPES = {
+    'arrow': "application/vnd.apache.arrow.stream",
+    'parquet': "application/vnd.apache.parquet",
+}
+
+FILE_EXTENSIONS = {
+    'arrow': "arrows",
+    'parquet': "parquet",
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only stream collecting the bytes written by an Arrow writer until drained.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_export(dataset, export_format, columns, batches):
+    """
+    Encode batches of row tuples as an Arrow IPC stream or a Parquet file.
+
+    Each batch becomes one Arrow record batch (one row group for Parquet) and
+    its bytes are yielded as soon as it is written, so only a single batch
+    is ever held as Python objects.
+
+    Args:
+        dataset: The exported table or report name, selecting the column types.
+        export_format: 'arrow' or 'parquet'.
+        columns: Names of the columns in each row tuple.
+        batches: Iterable of lists of row tuples.
+    """
+    schema = pa.schema([EXPORT_SCHEMAS[dataset].field(column) for column in columns])
+    sink = _ChunkSink()
+    if export_format == 'parquet':
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    for rows in batches:
+        arrays = [
+            pa.array(values, type=field.type)
+            for values, field in zip(zip(*rows), schema)
+        ]
+        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        data = sink.drain()
+        if data:
+            yield data
+
+    writer.close()
+    yield sink.drain()
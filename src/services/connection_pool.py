@@ -0,0 +1,61 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long callers wait to check out a connection.
+
+    The wait covers queueing for a free connection, opening a new one when
+    the pool may overflow, and the pre-ping, which is everything a request
+    spends before it can run its first statement.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        """Check out a connection, timing the wait."""
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self):
+        """
+        Return a JSON-serializable snapshot of the pool usage.
+
+        Returns:
+            dict: Pool size, connections checked out, idle and in overflow,
+            and the checkout count, timeouts and wait times since startup.
+        """
+        with self._stats_lock:
+            checkouts = self.checkouts
+            return {
+                "pool_size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(0, self.overflow()),
+                "max_overflow": self._max_overflow,
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_avg": round(self.wait_seconds_total / checkouts, 6)
+                if checkouts else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
@@ -0,0 +1,281 @@
+import logging
+import os
+import tempfile
+import threading
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from src.models.department import Department
+from src.models.employee import Employee
+from src.models.job import Job
+from src.services.analytics import AnalyticsBackend, MirrorWriter
+
+MIRROR_TABLES = {
+    'department': (Department.__tablename__, {'id': 'INTEGER', 'department': 'VARCHAR'}),
+    'job': (Job.__tablename__, {'id': 'INTEGER', 'job': 'VARCHAR'}),
+    'employee': (Employee.__tablename__, {
+        'id': 'INTEGER',
+        'name': 'VARCHAR',
+        'datetime': 'TIMESTAMP',
+        'department_id': 'INTEGER',
+        'job_id': 'INTEGER',
+    }),
+}
+
+EMPLOYEES_PER_QUARTER_QUERY = f"""
+    SELECT
+        d.department AS department,
+        j.job AS job,
+        COUNT(*) FILTER (WHERE QUARTER(e.datetime) = 1) AS Q1,
+        COUNT(*) FILTER (WHERE QUARTER(e.datetime) = 2) AS Q2,
+        COUNT(*) FILTER (WHERE QUARTER(e.datetime) = 3) AS Q3,
+        COUNT(*) FILTER (WHERE QUARTER(e.datetime) = 4) AS Q4
+    FROM
+        {Employee.__tablename__} e
+    JOIN
+        {Department.__tablename__} d ON e.department_id = d.id
+    JOIN
+        {Job.__tablename__} j ON e.job_id = j.id
+    WHERE
+        e.datetime >= $start AND e.datetime < $end
+    GROUP BY
+        d.department, j.job
+    ORDER BY
+        d.department, j.job
+"""
+
+DEPARTMENTS_ABOVE_AVERAGE_QUERY = f"""
+    WITH hires AS (
+        SELECT
+            department_id, COUNT(id) AS hired
+        FROM
+            {Employee.__tablename__}
+        WHERE
+            datetime >= $start AND datetime < $end
+        GROUP BY
+            department_id
+    ),
+    ranked AS (
+        SELECT
+            department_id,
+            hired,
+            AVG(hired) OVER () AS mean_hired,
+            (SELECT QUANTILE_CONT(hired, 0.5) FROM hires) AS median_hired,
+            RANK() OVER (
+                PARTITION BY department_id IS NULL ORDER BY hired DESC
+            ) AS hired_rank
+        FROM
+            hires
+    )
+    SELECT
+        d.id, d.department, r.hired
+    FROM
+        ranked r
+    JOIN
+        {Department.__tablename__} d ON r.department_id = d.id
+    WHERE
+        {{condition}}
+    ORDER BY
+        r.hired DESC
+"""
+
+COMPARISON_CONDITIONS = {
+    'mean': "r.hired > r.mean_hired",
+    'median': "r.hired > r.median_hired",
+    'top': "r.hired_rank <= $top_n",
+}
+
+
+def _year_range(year):
+    """Return the half-open timestamp range covering a calendar year as query parameters."""
+    return {"start": pd.Timestamp(year, 1, 1), "end": pd.Timestamp(year + 1, 1, 1)}
+
+
+class DuckDBMirrorWriter(MirrorWriter):
+    """
+    Stages the rows of one ingestion in DuckDB until PostgreSQL commits them.
+
+    Chunks are appended to temporary tables on the writer's own connection,
+    so staging never blocks other ingestions or report queries and memory is
+    managed by DuckDB rather than held as DataFrames. The commit merges the
+    staged rows into the mirror in a single DuckDB transaction.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.connection = backend.connection.cursor()
+        self.staged = {}
+
+    def write(self, table, df, mode='append'):
+        """Append a chunk to the staging table of its mirror table."""
+        table_name, columns = MIRROR_TABLES[table]
+        staging_table = f"staging_{table_name}"
+        frame = pa.Table.from_pandas(_mirror_frame(df, table), preserve_index=False)
+        offset = self.staged.get(table, (None, 0))[1]
+        frame = frame.append_column(
+            'staging_row', pa.array(np.arange(offset, offset + frame.num_rows, dtype='int64'))
+        )
+        if table not in self.staged:
+            definitions = ", ".join(f"{name} {kind}" for name, kind in columns.items())
+            self.connection.execute(
+                f"CREATE OR REPLACE TEMPORARY TABLE {staging_table} "
+                f"({definitions}, staging_row BIGINT)"
+            )
+        self.connection.register('incoming', frame)
+        try:
+            self.connection.execute(f"INSERT INTO {staging_table} SELECT * FROM incoming")
+        finally:
+            self.connection.unregister('incoming')
+        self.staged[table] = (mode, offset + frame.num_rows)
+
+    def commit(self):
+        """Merge the staged rows into the mirror tables."""
+        try:
+            with self.backend.write_lock:
+                self.connection.execute("BEGIN TRANSACTION")
+                try:
+                    for table, (mode, _) in self.staged.items():
+                        self._merge(table, mode)
+                    self.connection.execute("COMMIT")
+                except duckdb.Error:
+                    self.connection.execute("ROLLBACK")
+                    raise
+        except duckdb.Error as e:
+            logging.error(f"Analytics mirror update failed, it will be reloaded: {e}")
+            self.backend.stale = True
+        finally:
+            self.connection.close()
+
+    def rollback(self):
+        """Drop the staged rows with the writer's connection."""
+        self.connection.close()
+
+    def _merge(self, table, mode):
+        """Insert the staged rows of a table, replacing existing ids when upserting."""
+        table_name, columns = MIRROR_TABLES[table]
+        staging_table = f"staging_{table_name}"
+        column_list = ", ".join(columns)
+        if mode == 'upsert':
+            self.connection.execute(
+                f"DELETE FROM {table_name} WHERE id IN (SELECT id FROM {staging_table})"
+            )
+            self.connection.execute(f"""
+                INSERT INTO {table_name}
+                SELECT {column_list} FROM {staging_table}
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY id ORDER BY staging_row DESC) = 1
+            """)
+        else:
+            self.connection.execute(
+                f"INSERT INTO {table_name} SELECT {column_list} FROM {staging_table}"
+            )
+
+
+class DuckDBAnalytics(AnalyticsBackend):
+    """
+    Runs the reports on an embedded DuckDB holding a columnar mirror of the tables.
+
+    The mirror of ``employees``, ``departments`` and ``jobs`` is loaded from
+    PostgreSQL by ``sync`` and updated with the rows of each ingestion after
+    it commits, so reports are vectorized scans that take no PostgreSQL
+    connection and do not compete with bulk loads. If applying an ingestion
+    fails, the mirror is reloaded before the next report.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, database=':memory:', threads=None):
+        """
+        Initialize an empty mirror.
+
+        Args:
+            database: DuckDB database file, or ':memory:' to keep the mirror in memory.
+            threads: Optional number of DuckDB worker threads; DuckDB uses every core if omitted.
+        """
+        config = {'threads': threads} if threads else {}
+        self.connection = duckdb.connect(database, config=config)
+        self.write_lock = threading.Lock()
+        self.stale = False
+        self._export_table = None
+        for table_name, columns in MIRROR_TABLES.values():
+            definitions = ", ".join(f"{name} {kind}" for name, kind in columns.items())
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({definitions})")
+
+    def sync(self, export_table):
+        """
+        Replace the mirror with the current PostgreSQL tables.
+
+        Each table is exported as CSV to a temporary file and bulk read by
+        DuckDB, then the three tables are swapped in one transaction.
+        """
+        self._export_table = export_table
+        with tempfile.TemporaryDirectory() as directory, self.write_lock:
+            paths = {}
+            for table_name, columns in MIRROR_TABLES.values():
+                paths[table_name] = os.path.join(directory, f"{table_name}.csv")
+                with open(paths[table_name], 'wb') as out:
+                    export_table(table_name, list(columns), out)
+
+            connection = self.connection.cursor()
+            try:
+                connection.execute("BEGIN TRANSACTION")
+                for table_name, columns in MIRROR_TABLES.values():
+                    connection.execute(
+                        f"CREATE OR REPLACE TABLE {table_name} AS "
+                        f"SELECT * FROM read_csv($path, header = false, auto_detect = false, "
+                        f"columns = $columns)",
+                        {"path": paths[table_name], "columns": columns},
+                    )
+                connection.execute("COMMIT")
+            finally:
+                connection.close()
+        self.stale = False
+        logging.info("Analytics mirror loaded from PostgreSQL")
+
+    def begin(self):
+        """Return a writer staging the rows of one ingestion."""
+        return DuckDBMirrorWriter(self)
+
+    def employees_per_quarter(self, year):
+        """Count the hires per quarter with one vectorized scan of the employees mirror."""
+        return self._fetch(EMPLOYEES_PER_QUARTER_QUERY, _year_range(year))
+
+    def departments_above_average(self, year, comparison='mean', top_n=5):
+        """Run the departments-above-average query on the employees mirror."""
+        if comparison not in COMPARISON_CONDITIONS:
+            raise ValueError("Invalid comparison")
+        params = _year_range(year)
+        if comparison == 'top':
+            params["top_n"] = top_n
+        query = DEPARTMENTS_ABOVE_AVERAGE_QUERY.format(
+            condition=COMPARISON_CONDITIONS[comparison]
+        )
+        return self._fetch(query, params)
+
+    def _fetch(self, query, params):
+        """Run a report query on a connection of its own and return its rows as dictionaries."""
+        if self.stale and self._export_table:
+            self.sync(self._export_table)
+        connection = self.connection.cursor()
+        try:
+            result = connection.execute(query, params)
+            columns = [column[0] for column in result.description]
+            return [dict(zip(columns, row)) for row in result.fetchall()]
+        finally:
+            connection.close()
+
+
+def _mirror_frame(df, table):
+    """Select a table's columns from a loaded chunk, with datetimes as naive UTC timestamps."""
+    _, columns = MIRROR_TABLES[table]
+    frame = pd.DataFrame({column: df[column] for column in columns})
+    for column, kind in columns.items():
+        if kind == 'INTEGER':
+            frame[column] = frame[column].astype('Int32')
+        elif kind == 'TIMESTAMP':
+            frame[column] = pd.to_datetime(
+                frame[column], utc=True, errors='coerce'
+            ).dt.tz_localize(None)
+        else:
+            frame[column] = frame[column].astype('string')
+    return frame
@@ -0,0 +1,193 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from src.models.tables import TableName
+
+PARQUET_MAGIC = b"PAR1"
+ARROW_FILE_MAGIC = b"ARROW1"
+ARROW_STREAM_CONTINUATION = b"\xff\xff\xff\xff"
+DEFAULT_BATCH_ROWS = 65_536
+
+CSV_BLOCK_BYTES = 1024 * 1024
+UTC_TIMESTAMP = pa.timestamp('us', tz='UTC')
+
+CSV_SCHEMAS = {
+    TableName.JOB: pa.schema([('id', pa.int32()), ('job', pa.string())]),
+    TableName.EMPLOYEE: pa.schema([
+        ('id', pa.int32()),
+        ('name', pa.string()),
+        ('datetime', UTC_TIMESTAMP),
+        ('department_id', pa.int32()),
+        ('job_id', pa.int32()),
+    ]),
+    TableName.DEPARTMENT: pa.schema([('id', pa.int32()), ('department', pa.string())]),
+}
+
+PANDAS_TYPES = {
+    pa.int8(): pd.Int8Dtype(),
+    pa.int16(): pd.Int16Dtype(),
+    pa.int32(): pd.Int32Dtype(),
+    pa.int64(): pd.Int64Dtype(),
+    pa.string(): pd.StringDtype('pyarrow'),
+}
+
+
+def detect_format(source):
+    """
+    Detect the format of an uploaded file from its first bytes.
+
+    Args:
+        source: A seekable binary file-like object, left at its start.
+
+    Returns:
+        str: 'parquet', 'arrow' (IPC file), 'arrow_stream' (IPC stream) or 'csv'.
+    """
+    head = source.read(len(ARROW_FILE_MAGIC))
+    source.seek(0)
+    if head.startswith(PARQUET_MAGIC):
+        return 'parquet'
+    if head.startswith(ARROW_FILE_MAGIC):
+        return 'arrow'
+    if head.startswith(ARROW_STREAM_CONTINUATION):
+        return 'arrow_stream'
+    return 'csv'
+
+
+def iter_frames(source, table, chunksize=None, raw=False):
+    """
+    Read an uploaded CSV, Parquet or Arrow IPC file as DataFrames for a table.
+
+    Headerless CSVs are parsed with the Arrow CSV reader against the table's
+    declared schema in ``CSV_SCHEMAS``, so no column type is inferred: ids
+    become nullable integer columns, text stays in Arrow-backed string
+    columns instead of Python objects, empty fields are NULL, and datetimes
+    are parsed as ISO 8601 UTC timestamps. Columnar files
+    are matched to the table's columns by name, or by position when their
+    names differ, and keep their own types.
+
+    Args:
+        source: A seekable binary file-like object.
+        table: The name of the table the file is loaded into.
+        chunksize: Optional number of rows per DataFrame. Columnar files are
+            always read batch by batch; CSVs are read whole when omitted.
+        raw: Read every CSV column as text, so the validation stage sees the
+            original values instead of a parse error.
+
+    Returns:
+        Iterable of DataFrames.
+    """
+    table = TableName(table)
+    columns = table.columns
+    file_format = detect_format(source)
+    if file_format == 'csv':
+        schema = CSV_SCHEMAS[table]
+        if raw:
+            schema = pa.schema([(name, pa.string()) for name in schema.names])
+        return (
+            _batch_to_frame(_cast_timestamps(batch, schema), columns)
+            for batch in _iter_csv_tables(source, schema, chunksize)
+        )
+    return (
+        _batch_to_frame(batch, columns)
+        for batch in _iter_record_batches(source, file_format, chunksize)
+    )
+
+
+def parse_datetimes(values):
+    """
+    Parse a column of ISO 8601 datetimes as UTC timestamps.
+
+    Arrow's parser handles a whole column at once when every value carries a
+    zone offset, as the source system writes them. Otherwise the column is
+    parsed by pandas, where values without an offset are taken as UTC and
+    values that are not ISO 8601 become NaT.
+
+    Args:
+        values: A Series of strings, or of timestamps which are returned as is.
+
+    Returns:
+        Series: The parsed timestamps.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    try:
+        parsed = pc.cast(pa.array(values, type=pa.string(), from_pandas=True), UTC_TIMESTAMP)
+        return pd.Series(parsed.to_pandas(), index=values.index, name=values.name)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pd.to_datetime(values, utc=True, errors='coerce', format='ISO8601')
+
+
+def _iter_csv_tables(source, schema, chunksize):
+    """Yield a headerless CSV as Arrow tables of ``chunksize`` rows, or one table."""
+    read_options = pa_csv.ReadOptions(column_names=schema.names, block_size=CSV_BLOCK_BYTES)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={
+            field.name: pa.string() if pa.types.is_timestamp(field.type) else field.type
+            for field in schema
+        },
+        strings_can_be_null=True,
+    )
+    if not chunksize:
+        yield pa_csv.read_csv(source, read_options=read_options, convert_options=convert_options)
+        return
+    reader = pa_csv.open_csv(source, read_options=read_options, convert_options=convert_options)
+    yield from _rebatch(reader, chunksize)
+
+
+def _cast_timestamps(table, schema):
+    """Cast the text datetime columns of a CSV table to their declared timestamp type."""
+    for index, field in enumerate(schema):
+        if not pa.types.is_timestamp(field.type):
+            continue
+        try:
+            column = pc.cast(table.column(field.name), field.type)
+        except pa.ArrowInvalid:
+            column = pa.array(
+                parse_datetimes(table.column(field.name).to_pandas()), type=field.type
+            )
+        table = table.set_column(index, field, column)
+    return table
+
+
+def _rebatch(batches, rows):
+    """Regroup record batches into tables of ``rows`` rows; the last one may be shorter."""
+    pending, pending_rows = [], 0
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= rows:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, rows)
+            rest = table.slice(rows)
+            pending, pending_rows = rest.to_batches(), rest.num_rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
+
+
+def _iter_record_batches(source, file_format, chunksize):
+    """Yield the record batches of a Parquet or Arrow IPC file."""
+    if file_format == 'parquet':
+        yield from pq.ParquetFile(source).iter_batches(batch_size=chunksize or DEFAULT_BATCH_ROWS)
+        return
+    if file_format == 'arrow':
+        reader = pa.ipc.open_file(source)
+        batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+    else:
+        batches = pa.ipc.open_stream(source)
+    yield from _rebatch(batches, chunksize) if chunksize else batches
+
+
+def _batch_to_frame(batch, columns):
+    """Map a record batch or table onto the table columns and convert it to a DataFrame."""
+    names = batch.schema.names
+    if set(columns) <= set(names):
+        batch = batch.select(columns)
+    elif len(names) == len(columns):
+        batch = batch.rename_columns(columns)
+    else:
+        raise ValueError(f"Expected columns {columns}, got {names}")
+    return batch.to_pandas(
+        types_mapper=PANDAS_TYPES.get, self_destruct=True, split_blocks=True
+    )
@@ -0,0 +1,219 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from fastapi.concurrency import run_in_threadpool
+
+SPOOL_CHUNK_BYTES = 1024 * 1024
+DEFAULT_JOB_CHUNKSIZE = 100_000
+JOB_RECORD_FIELDS = (
+    'id', 'table', 'filename', 'path', 'rows_processed', 'error', 'result',
+    'created_at', 'started_at', 'finished_at',
+)
+
+
+class JobState(str, Enum):
+    """
+    Enum representing the lifecycle states of a background ingestion job.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class IngestionJob:
+    """
+    Tracks the progress of one spooled upload being loaded in the background.
+    """
+
+    def __init__(self, table, filename, path):
+        self.id = uuid.uuid4().hex
+        self.table = table
+        self.filename = filename
+        self.path = path
+        self.state = JobState.QUEUED
+        self.rows_processed = 0
+        self.error = None
+        self.result = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def add_rows(self, rows):
+        """Record that another chunk of ``rows`` rows has been processed."""
+        self.rows_processed += rows
+
+    def to_record(self):
+        """Return the raw fields of the job, as saved to its status file."""
+        record = {field: getattr(self, field) for field in JOB_RECORD_FIELDS}
+        record['state'] = self.state.value
+        return record
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a job from the fields saved to its status file."""
+        job = cls.__new__(cls)
+        for field in JOB_RECORD_FIELDS:
+            setattr(job, field, record[field])
+        job.state = JobState(record['state'])
+        return job
+
+    def to_dict(self):
+        """Return a JSON-serializable status snapshot of the job."""
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "job_id": self.id,
+            "table": self.table,
+            "filename": self.filename,
+            "state": self.state.value,
+            "rows_processed": self.rows_processed,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows_processed / elapsed, 1) if elapsed else 0.0,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class JobManager:
+    """
+    JobManager spools uploads to local disk and loads them on a bounded worker pool.
+
+    The status of each job is also saved as JSON next to the spooled files
+    whenever it changes, so with several workers any of them can report on a
+    job queued by another.
+    """
+
+    def __init__(self):
+        """Initialize the spool directory, worker pool and job registry."""
+        self.spool_dir = os.getenv(
+            'INGEST_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'ingest_spool')
+        )
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('INGEST_JOB_WORKERS', '2')),
+            thread_name_prefix='ingest-job'
+        )
+        self.history_size = int(os.getenv('INGEST_JOB_HISTORY', '1000'))
+        self.max_pending = int(os.getenv('INGEST_JOB_QUEUE', '16'))
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def submit(self, file, table, func):
+        """
+        Spool an uploaded file to disk and queue it for background loading.
+
+        Args:
+            file: The uploaded file.
+            table: The name of the table the file is loaded into.
+            func: Blocking callable ``func(path, progress)`` that loads the file
+                and returns a JSON-serializable result.
+
+        Returns:
+            IngestionJob: The queued job.
+        """
+        path = await run_in_threadpool(self._spool, file.file)
+        job = IngestionJob(table, file.filename, path)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._evict_finished()
+        self._save(job)
+        self.executor.submit(self._run, job, func)
+        logging.info(f"Queued ingestion job {job.id} for {table} from {path}")
+        return job
+
+    def get(self, job_id):
+        """
+        Return the job with the given ID, or None if it is unknown.
+
+        Jobs run by this process are returned from memory, and jobs of other
+        workers are read from their status file.
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is not None:
+            return job
+        try:
+            with open(self._status_path(job_id)) as f:
+                return IngestionJob.from_record(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def is_full(self):
+        """Return whether this process already has the most unfinished jobs it accepts."""
+        with self._lock:
+            pending = sum(
+                job.state in (JobState.QUEUED, JobState.RUNNING) for job in self.jobs.values()
+            )
+        return pending >= self.max_pending
+
+    def _status_path(self, job_id):
+        """Return the path of a job's status file, or of a name that cannot exist for a bad ID."""
+        if not job_id.isalnum():
+            return os.path.join(self.spool_dir, '.missing')
+        return os.path.join(self.spool_dir, f"{job_id}.json")
+
+    def _save(self, job):
+        """Write a job's status file, replacing it atomically."""
+        path = self._status_path(job.id)
+        try:
+            with open(f"{path}.tmp", 'w') as f:
+                json.dump(job.to_record(), f, default=str)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logging.error(f"Could not save the status of ingestion job {job.id}: {e}")
+
+    def _progress(self, job, rows):
+        """Record a processed chunk of a job and save its status."""
+        job.add_rows(rows)
+        self._save(job)
+
+    def _spool(self, source):
+        """Copy an upload stream to a new file in the spool directory."""
+        with tempfile.NamedTemporaryFile(
+            dir=self.spool_dir, suffix='.upload', delete=False
+        ) as target:
+            shutil.copyfileobj(source, target, SPOOL_CHUNK_BYTES)
+        return target.name
+
+    def _run(self, job, func):
+        """Run a queued job on a worker thread and record its outcome."""
+        job.state = JobState.RUNNING
+        job.started_at = time.time()
+        self._save(job)
+        try:
+            job.result = func(job.path, lambda rows: self._progress(job, rows))
+            job.state = JobState.SUCCEEDED
+            logging.info(f"Ingestion job {job.id} finished: {job.rows_processed} rows")
+        except Exception as e:
+            job.error = str(e)
+            job.state = JobState.FAILED
+            logging.error(f"Ingestion job {job.id} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            os.remove(job.path)
+            self._save(job)
+
+    def _evict_finished(self):
+        """Forget the oldest finished jobs once the history limit is exceeded."""
+        finished = [
+            job_id for job_id, job in self.jobs.items()
+            if job.state in (JobState.SUCCEEDED, JobState.FAILED)
+        ]
+        for job_id in finished[:max(0, len(self.jobs) - self.history_size)]:
+            del self.jobs[job_id]
+            try:
+                os.remove(self._status_path(job_id))
+            except OSError:
+                pass
+
+
+jobs = JobManager()
@@ -0,0 +1,75 @@
+import datetime as dt
+import orjson
+from pydantic import TypeAdapter
+from src.models.batch_rows import ROW_MODELS
+from src.services.report_responses import NDJSON_MEDIA_TYPE
+
+ROW_ADAPTERS = {table: TypeAdapter(list[model]) for table, model in ROW_MODELS.items()}
+
+
+def decode_rows(body, content_type):
+    """
+    Decode the rows of a JSON array or NDJSON request body with orjson.
+
+    Args:
+        body: The raw request body.
+        content_type: The request's Content-Type header; NDJSON is read as
+            one JSON object per line, anything else as a JSON array.
+
+    Returns:
+        list: The decoded rows.
+
+    Raises:
+        ValueError: If the body is not valid JSON or not a list of rows.
+    """
+    if NDJSON_MEDIA_TYPE in content_type:
+        rows = [orjson.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        rows = orjson.loads(body)
+        if not isinstance(rows, list):
+            raise ValueError("Expected a JSON array of rows")
+    return rows
+
+
+def complete_rows(rows, table):
+    """
+    Give decoded rows every column of a table, for the validation stage of ingestion.
+
+    Missing values become None and unknown keys are dropped, so the
+    validation stage quarantines incomplete rows instead of failing.
+
+    Args:
+        rows: The decoded rows.
+        table: The TableName the rows are inserted into.
+
+    Raises:
+        ValueError: If a row is not a JSON object.
+    """
+    if not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Every row must be a JSON object")
+    return [{column: row.get(column) for column in table.columns} for row in rows]
+
+
+def validate_rows(rows, table):
+    """
+    Validate decoded rows against the pydantic model of a table.
+
+    Args:
+        rows: The decoded rows.
+        table: The TableName the rows are inserted into.
+
+    Returns:
+        list: One dictionary per row with every column of the table, and
+        datetimes converted to naive UTC as stored by the employees table.
+
+    Raises:
+        pydantic.ValidationError: If any row does not match the model.
+    """
+    adapter = ROW_ADAPTERS[table]
+    validated = adapter.dump_python(adapter.validate_python(rows))
+    if 'datetime' in table.columns:
+        for row in validated:
+            hired_at = row['datetime']
+            if hired_at is not None and hired_at.tzinfo is not None:
+                row['datetime'] = hired_at.astimezone(dt.timezone.utc).replace(tzinfo=None)
+    return validated
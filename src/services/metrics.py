@@ -0,0 +1,160 @@
+from contextlib import contextmanager
+import time
+from urllib.parse import parse_qs
+from prometheus_client import Counter, Histogram
+from src.models.tables import TableName
+
+TABLE_LABELS = {table.value for table in TableName}
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+SIZE_BUCKETS = tuple(2 ** power for power in range(10, 32, 2))
+THROUGHPUT_BUCKETS = tuple(10 ** power for power in range(1, 8))
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds',
+    'Time to serve a request, until the last byte of the response is sent.',
+    ['method', 'endpoint', 'table', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUEST_BYTES = Histogram(
+    'http_request_size_bytes',
+    'Declared Content-Length of request bodies.',
+    ['endpoint', 'table'],
+    buckets=SIZE_BUCKETS,
+)
+INGEST_STAGE_SECONDS = Histogram(
+    'ingest_stage_duration_seconds',
+    'Time spent in each stage of an ingestion: read, parse, frame, validate, write or commit.',
+    ['operation', 'table', 'stage'],
+    buckets=LATENCY_BUCKETS,
+)
+INGEST_ROWS = Counter(
+    'ingest_rows_total',
+    'Rows written by ingestion.',
+    ['operation', 'table'],
+)
+INGEST_REJECTED_ROWS = Counter(
+    'ingest_rejected_rows_total',
+    'Rows quarantined by the validation stage.',
+    ['table', 'reason'],
+)
+INGEST_ROWS_PER_SECOND = Histogram(
+    'ingest_rows_per_second',
+    'Rows written per second by each committed ingestion.',
+    ['operation', 'table'],
+    buckets=THROUGHPUT_BUCKETS,
+)
+INGEST_ADMISSION_WAIT_SECONDS = Histogram(
+    'ingest_admission_wait_seconds',
+    'Time ingestion requests waited in the admission queue of their table.',
+    ['table'],
+    buckets=LATENCY_BUCKETS,
+)
+INGEST_ADMISSION_REJECTIONS = Counter(
+    'ingest_admission_rejections_total',
+    'Ingestion requests turned away by admission control.',
+    ['table', 'reason'],
+)
+REPORT_QUERY_SECONDS = Histogram(
+    'report_query_duration_seconds',
+    'Time to run a report query on a cache miss.',
+    ['report'],
+    buckets=LATENCY_BUCKETS,
+)
+REPORT_CACHE_REQUESTS = Counter(
+    'report_cache_requests_total',
+    'Report lookups in the result cache.',
+    ['report', 'result'],
+)
+
+_DONE = object()
+
+
+@contextmanager
+def stage_timer(operation, table, stage):
+    """
+    Time a block as one stage of an ingestion.
+
+    Args:
+        operation: 'upload' or 'batch_insert'.
+        table: The name of the table being loaded.
+        stage: The stage name, such as 'parse' or 'commit'.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        INGEST_STAGE_SECONDS.labels(operation, table, stage).observe(time.perf_counter() - start)
+
+
+def timed_iter(iterable, operation, table, stage):
+    """
+    Yield the items of an iterable, timing each step as an ingestion stage.
+
+    Used for lazy readers, where parsing happens while the next chunk is fetched.
+    """
+    iterator = iter(iterable)
+    while True:
+        with stage_timer(operation, table, stage):
+            item = next(iterator, _DONE)
+        if item is _DONE:
+            return
+        yield item
+
+
+def record_ingestion(operation, table, rows, elapsed, rejected=None):
+    """
+    Record the rows written by a committed ingestion and its throughput.
+
+    Args:
+        operation: 'upload' or 'batch_insert'.
+        table: The name of the table loaded.
+        rows: The number of rows written.
+        elapsed: Seconds from the start of parsing to the commit.
+        rejected: Optional mapping of reject reason to quarantined row count.
+    """
+    INGEST_ROWS.labels(operation, table).inc(rows)
+    if elapsed > 0:
+        INGEST_ROWS_PER_SECOND.labels(operation, table).observe(rows / elapsed)
+    for reason, count in (rejected or {}).items():
+        INGEST_REJECTED_ROWS.labels(table, reason).inc(count)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency and body size of every HTTP request.
+
+    Requests are labelled with the name of the endpoint function that served
+    them and, for ingestion endpoints, the ``table`` query parameter, so the
+    label sets stay bounded whatever paths clients send.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            endpoint = getattr(scope.get("endpoint"), "__name__", "unmatched")
+            table = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("table", [""])[0]
+            table = table if table in TABLE_LABELS else ""
+            HTTP_REQUEST_SECONDS.labels(scope["method"], endpoint, table, status).observe(
+                time.perf_counter() - start
+            )
+            content_length = dict(scope["headers"]).get(b"content-length")
+            if content_length and content_length.isdigit():
+                HTTP_REQUEST_BYTES.labels(endpoint, table).observe(int(content_length))
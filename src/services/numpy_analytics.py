@@ -0,0 +1,381 @@
+import logging
+import os
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from src.models.department import Department
+from src.models.employee import Employee
+from src.models.job import Job
+from src.services.analytics import AnalyticsBackend, MirrorWriter
+
+NULL_ID = np.iinfo(np.int32).min
+EMPLOYEE_COLUMNS = ('id', 'datetime', 'department_id', 'job_id')
+INITIAL_CAPACITY = 1024
+COMPARISONS = ('mean', 'median', 'top')
+
+
+def _nullable_ids(values):
+    """Convert a column of nullable ids to int32, with ``NULL_ID`` for missing values."""
+    ids = pd.array(values, dtype='Int64').to_numpy(dtype='int64', na_value=NULL_ID)
+    return ids.astype('int32')
+
+
+def _hire_days(values):
+    """Convert a column of hire datetimes to int32 days since 1970, ``NULL_ID`` when missing."""
+    hired = pd.to_datetime(pd.Series(values), utc=True, errors='coerce')
+    days = hired.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+    return np.where(hired.isna().to_numpy(), NULL_ID, days.astype('int64')).astype('int32')
+
+
+def employee_arrays(df):
+    """
+    Convert employee rows to the compact arrays held by the cube.
+
+    Args:
+        df: Employee rows with ``id``, ``datetime``, ``department_id`` and ``job_id``.
+
+    Returns:
+        dict: int32 arrays of ids, hire days since 1970, department and job ids.
+    """
+    return {
+        'id': _nullable_ids(df['id']),
+        'day': _hire_days(df['datetime']),
+        'department_id': _nullable_ids(df['department_id']),
+        'job_id': _nullable_ids(df['job_id']),
+    }
+
+
+def _last_occurrences(ids):
+    """Return the positions of the last occurrence of each id, in id order."""
+    _, reversed_positions = np.unique(ids[::-1], return_index=True)
+    return len(ids) - 1 - reversed_positions
+
+
+class _Codes:
+    """Dense codes for the distinct department or job ids found among employees."""
+
+    def __init__(self):
+        self.values = np.empty(0, dtype='int32')
+        self._index = {}
+
+    def encode(self, values):
+        """Return the code of every value, assigning codes to new values."""
+        distinct, inverse = np.unique(values, return_inverse=True)
+        new = [int(value) for value in distinct if int(value) not in self._index]
+        for value in new:
+            self._index[value] = len(self._index)
+        if new:
+            self.values = np.concatenate([self.values, np.array(new, dtype='int32')])
+        codes = np.array([self._index[int(value)] for value in distinct], dtype='int64')
+        return codes[inverse]
+
+
+class _Names:
+    """Names of departments or jobs in arrays sorted by id."""
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype='int32')
+        self.names = np.empty(0, dtype=object)
+
+    def update(self, ids, names):
+        """Add names, replacing the names of existing ids; the last occurrence of an id wins."""
+        ids = np.concatenate([self.ids, ids])
+        names = np.concatenate([self.names, names])
+        keep = _last_occurrences(ids)
+        self.ids, self.names = ids[keep], names[keep]
+
+    def positions(self, ids):
+        """
+        Return the position of each id in ``names``, or -1 for unknown ids.
+
+        ``update`` replaces both arrays, so the positions only hold for the
+        ``names`` array read under the same lock.
+        """
+        positions = np.searchsorted(self.ids, ids)
+        found = positions < len(self.ids)
+        found[found] = self.ids[positions[found]] == ids[found]
+        return np.where(found, positions, -1)
+
+
+class NumpyHiringCube(AnalyticsBackend):
+    """
+    Answers the reports from hire counts held in NumPy arrays in process.
+
+    Employees are kept as four int32 arrays (id, hire day, department and
+    job ids), 16 bytes per employee, and their hires are counted in one
+    cube per year of shape (quarter, department, job). Ingestion commits
+    add their rows to the counts, and upserts first subtract the rows they
+    replace, so a report is a reduction over a cube of a few thousand cells
+    whatever the number of employees. Department and job names are looked
+    up in arrays sorted by id, with the join semantics of the SQL reports.
+    """
+
+    name = 'numpy'
+
+    def __init__(self):
+        """Initialize an empty cube."""
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Drop every employee, name and count."""
+        self.size = 0
+        self.arrays = {
+            column: np.empty(INITIAL_CAPACITY, dtype='int32')
+            for column in ('id', 'day', 'department_id', 'job_id')
+        }
+        self.department_codes = _Codes()
+        self.job_codes = _Codes()
+        self.departments = _Names()
+        self.jobs = _Names()
+        self.cubes = {}
+
+    def sync(self, export_table):
+        """
+        Replace the cube with the current PostgreSQL tables.
+
+        Each table is exported as CSV to a temporary file and read back in
+        Arrow blocks, so only the compact arrays are kept.
+        """
+        with tempfile.TemporaryDirectory() as directory, self.lock:
+            self._reset()
+            for table, model, name_column in (
+                ('department', Department, 'department'), ('job', Job, 'job')
+            ):
+                path = os.path.join(directory, f"{model.__tablename__}.csv")
+                with open(path, 'wb') as out:
+                    export_table(model.__tablename__, ['id', name_column], out)
+                if not os.path.getsize(path):
+                    continue
+                names = pa_csv.read_csv(path, read_options=pa_csv.ReadOptions(
+                    column_names=['id', name_column]
+                ), convert_options=pa_csv.ConvertOptions(
+                    column_types={'id': pa.int32(), name_column: pa.string()}
+                ))
+                self._apply_names(table, names.to_pandas())
+
+            path = os.path.join(directory, f"{Employee.__tablename__}.csv")
+            with open(path, 'wb') as out:
+                export_table(Employee.__tablename__, list(EMPLOYEE_COLUMNS), out)
+            if os.path.getsize(path):
+                reader = pa_csv.open_csv(
+                    path,
+                    read_options=pa_csv.ReadOptions(column_names=list(EMPLOYEE_COLUMNS)),
+                    convert_options=pa_csv.ConvertOptions(column_types={
+                        'id': pa.int32(),
+                        'datetime': pa.timestamp('us'),
+                        'department_id': pa.int32(),
+                        'job_id': pa.int32(),
+                    }),
+                )
+                for batch in reader:
+                    self._apply_employees(employee_arrays(batch.to_pandas()), 'append')
+        logging.info(f"Hiring cube loaded with {self.size} employees")
+
+    def begin(self):
+        """Return a writer staging the rows of one ingestion as compact arrays."""
+        return NumpyCubeWriter(self)
+
+    def apply(self, staged):
+        """
+        Apply the staged rows of a committed ingestion.
+
+        Args:
+            staged: List of ``(table, rows, mode)`` tuples, in write order.
+        """
+        with self.lock:
+            for table, rows, mode in staged:
+                if table == 'employee':
+                    self._apply_employees(rows, mode)
+                else:
+                    self._apply_names(table, rows)
+
+    def memory_bytes(self):
+        """Return the bytes held by the employee arrays and the cubes."""
+        return sum(array.nbytes for array in self.arrays.values()) + sum(
+            cube.nbytes for cube in self.cubes.values()
+        )
+
+    def _apply_names(self, table, df):
+        """Add or replace department or job names."""
+        names = self.departments if table == 'department' else self.jobs
+        name_column = 'department' if table == 'department' else 'job'
+        names.update(
+            _nullable_ids(df['id']),
+            df[name_column].astype(object).where(df[name_column].notna(), None).to_numpy()
+        )
+
+    def _apply_employees(self, rows, mode):
+        """Store employee rows and add them to the counts, replacing stored ids on upserts."""
+        if mode == 'upsert':
+            keep = _last_occurrences(rows['id'])
+            rows = {column: values[keep] for column, values in rows.items()}
+        if mode == 'upsert' and self.size:
+            stored_ids = self.arrays['id'][:self.size]
+            replaced = np.nonzero(np.isin(stored_ids, rows['id']))[0]
+            if len(replaced):
+                source = np.searchsorted(rows['id'], stored_ids[replaced])
+                self._count({c: v[:self.size][replaced] for c, v in self.arrays.items()}, -1)
+                for column, values in rows.items():
+                    self.arrays[column][replaced] = values[source]
+                self._count({c: v[source] for c, v in rows.items()}, 1)
+                new = np.ones(len(rows['id']), dtype=bool)
+                new[source] = False
+                rows = {column: values[new] for column, values in rows.items()}
+        self._append(rows)
+        self._count(rows, 1)
+
+    def _append(self, rows):
+        """Append rows to the employee arrays, doubling their capacity when full."""
+        count = len(rows['id'])
+        needed = self.size + count
+        capacity = len(self.arrays['id'])
+        if needed > capacity:
+            capacity = max(needed, capacity * 2)
+            for column, values in self.arrays.items():
+                grown = np.empty(capacity, dtype='int32')
+                grown[:self.size] = values[:self.size]
+                self.arrays[column] = grown
+        for column, values in rows.items():
+            self.arrays[column][self.size:needed] = values
+        self.size = needed
+
+    def _count(self, rows, sign):
+        """Add (``sign=1``) or remove (``sign=-1``) employee rows from the yearly cubes."""
+        hired = rows['day'] != NULL_ID
+        if not hired.any():
+            return
+        days = rows['day'][hired].astype('datetime64[D]')
+        months = days.astype('datetime64[M]').astype('int64')
+        years = months // 12 + 1970
+        quarters = months % 12 // 3
+        departments = self.department_codes.encode(rows['department_id'][hired])
+        jobs = self.job_codes.encode(rows['job_id'][hired])
+        shape = (4, len(self.department_codes.values), len(self.job_codes.values))
+        for year in np.unique(years):
+            in_year = years == year
+            cells = np.ravel_multi_index(
+                (quarters[in_year], departments[in_year], jobs[in_year]), shape
+            )
+            counts = np.bincount(cells, minlength=np.prod(shape)).reshape(shape)
+            self.cubes[int(year)] = self._grown_cube(int(year), shape) + sign * counts
+
+    def _grown_cube(self, year, shape):
+        """Return the cube of a year padded with zeros to a shape with new codes."""
+        cube = self.cubes.get(year)
+        if cube is None:
+            return np.zeros(shape, dtype='int64')
+        if cube.shape == shape:
+            return cube
+        grown = np.zeros(shape, dtype='int64')
+        grown[:, :cube.shape[1], :cube.shape[2]] = cube
+        return grown
+
+    def employees_per_quarter(self, year):
+        """Sum the year's cube per department and job name with one ``bincount`` per quarter."""
+        with self.lock:
+            cube = self.cubes.get(year)
+            if cube is None:
+                return []
+            department_names = self.departments.positions(
+                self.department_codes.values[:cube.shape[1]]
+            )
+            job_names = self.jobs.positions(self.job_codes.values[:cube.shape[2]])
+            department_name_values = self.departments.names
+            job_name_values = self.jobs.names
+
+        known_departments = department_names >= 0
+        known_jobs = job_names >= 0
+        cube = cube[:, known_departments][:, :, known_jobs]
+        department_index, departments = pd.factorize(
+            department_name_values[department_names[known_departments]],
+            sort=True, use_na_sentinel=False,
+        )
+        job_index, jobs = pd.factorize(
+            job_name_values[job_names[known_jobs]], sort=True, use_na_sentinel=False
+        )
+        groups = (department_index[:, None] * len(jobs) + job_index[None, :]).ravel()
+        counts = np.stack([
+            np.bincount(
+                groups, weights=cube[quarter].ravel(), minlength=len(departments) * len(jobs)
+            )
+            for quarter in range(4)
+        ], axis=1).astype('int64')
+
+        groups = np.nonzero(counts.sum(axis=1))[0]
+        columns = (
+            np.asarray(departments, dtype=object)[groups // len(jobs)].tolist(),
+            np.asarray(jobs, dtype=object)[groups % len(jobs)].tolist(),
+            *counts[groups].T.tolist(),
+        )
+        keys = ('department', 'job', 'Q1', 'Q2', 'Q3', 'Q4')
+        return [dict(zip(keys, row)) for row in zip(*columns)]
+
+    def departments_above_average(self, year, comparison='mean', top_n=5):
+        """Compare the year's hires per department, summed from its cube."""
+        if comparison not in COMPARISONS:
+            raise ValueError("Invalid comparison")
+        with self.lock:
+            cube = self.cubes.get(year)
+            if cube is None:
+                return []
+            department_ids = self.department_codes.values[:cube.shape[1]]
+            name_positions = self.departments.positions(department_ids)
+            names = self.departments.names
+            hired = cube.sum(axis=(0, 2))
+
+        present = hired > 0
+        department_ids, name_positions, hired = (
+            department_ids[present], name_positions[present], hired[present]
+        )
+        if comparison == 'mean':
+            selected = hired > hired.mean()
+        elif comparison == 'median':
+            selected = hired > np.median(hired)
+        else:
+            ranked = np.sort(hired[department_ids != NULL_ID])[::-1]
+            ranks = np.searchsorted(-ranked, -hired, side='left') + 1
+            selected = ranks <= top_n
+        selected &= name_positions >= 0
+
+        order = np.lexsort((department_ids[selected], -hired[selected]))
+        return [
+            {"id": int(department_id), "department": names[position],
+             "hired": int(count)}
+            for department_id, position, count in zip(
+                department_ids[selected][order],
+                name_positions[selected][order],
+                hired[selected][order],
+            )
+        ]
+
+
+
+class NumpyCubeWriter(MirrorWriter):
+    """
+    Stages the rows of one ingestion as compact arrays until PostgreSQL commits them.
+    """
+
+    def __init__(self, cube):
+        self.cube = cube
+        self.staged = []
+
+    def write(self, table, df, mode='append'):
+        """Convert a chunk to the cube's arrays and keep it for the commit."""
+        if table == 'employee':
+            rows = employee_arrays(df)
+        else:
+            rows = df[['id', table]].copy()
+        self.staged.append((table, rows, mode))
+
+    def commit(self):
+        """Add the staged rows to the cube."""
+        self.cube.apply(self.staged)
+        self.staged = []
+
+    def rollback(self):
+        """Discard the staged rows."""
+        self.staged = []
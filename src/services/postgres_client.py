@@ -1,16 +1,101 @@
-from io import StringIO
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import functools
+from io import BytesIO, StringIO
 import logging
+import hashlib
 import os
-from fastapi.responses import JSONResponse
+import threading
+import time
+import uuid
 import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import scoped_session, sessionmaker
-from src.models import db
+from sqlalchemy.schema import CreateIndex, CreateTable
+from src.models import Base
 from src.models.department import Department
 from src.models.employee import Employee
+from src.models.hires_by_dept_job_quarter import HiresByDeptJobQuarter
 from src.models.job import Job
+from src.models.rejected_row import RejectedRow
+from src.models.schema_version import SchemaVersion
+from src.models.tables import TableName
+from src.services.analytics import create_analytics_backend
+from src.services.connection_pool import TimedQueuePool
+from src.services.file_formats import iter_frames, parse_datetimes
+from src.services.metrics import (
+    REPORT_CACHE_REQUESTS,
+    REPORT_QUERY_SECONDS,
+    record_ingestion,
+    stage_timer,
+    timed_iter,
+)
+from src.services.report_cache import ReportCache
+from src.services.validation import rejected_records, validate_frame
+
+REPORT_STREAM_BATCH_ROWS = 1000
+SCHEMA_LOCK_ID = 73_012_020
+HIRES_SUMMARY_LOCK_ID = 73_012_021
+EMPLOYEE_PARTITION_LOCK_ID = 73_012_022
+EMPLOYEE_PARTITION_YEARS = (1900, 2100)
+EMPLOYEE_ID_LOCK_ID = 73_012_023
+EMPLOYEE_ID_BUCKET_BITS = 16
+EMPLOYEE_ID_MAX_BUCKETS = 256
+DATA_VERSION_SEQUENCE = 'data_version'
+DATA_VERSION_DDL = f"CREATE SEQUENCE IF NOT EXISTS {DATA_VERSION_SEQUENCE}"
+EXPORT_BATCH_ROWS = 65_536
+TABLE_EXPORTS = {
+    'employees': Employee,
+    'departments': Department,
+    'jobs': Job,
+}
+LAZY_ATTRIBUTES = ('engine', 'session_factory', 'Session', 'analytics')
+TABLE_MODELS = {
+    'employee': Employee,
+    'department': Department,
+    'job': Job,
+}
+TABLE_NAMES = {
+    'employee': Employee.__tablename__,
+    'department': Department.__tablename__,
+    'job': Job.__tablename__,
+}
+
+
+def _year_range(year):
+    """Return the half-open timestamp range covering a calendar year as query parameters."""
+    return {"start": datetime(year, 1, 1), "end": datetime(year + 1, 1, 1)}
+
+
+class _CsvFrameReader:
+    """
+    Read-only file-like view of a DataFrame rendered as headerless CSV.
+
+    Rows are rendered one slice at a time as COPY pulls data, so the full
+    CSV text of a large DataFrame never exists in memory at once.
+    """
+
+    def __init__(self, df, rows_per_slice=50_000):
+        self._df = df
+        self._rows_per_slice = rows_per_slice
+        self._position = 0
+        self._current = StringIO()
+
+    def read(self, size=-1):
+        """Return up to ``size`` characters of CSV, or '' once exhausted."""
+        data = self._current.read(size)
+        while not data and self._position < len(self._df):
+            frame = self._df.iloc[self._position:self._position + self._rows_per_slice]
+            self._position += self._rows_per_slice
+            self._current = StringIO(frame.to_csv(index=False, header=False))
+            data = self._current.read(size)
+        return data
+
 
 class PostgresClient:
     """
@@ -25,190 +110,1155 @@ class PostgresClient:
             f"{os.getenv('POSTGRES_HOST', 'db')}/"
             f"{os.getenv('POSTGRES_DB', 'globant_challenge')}"
         )
-        logging.info(f"Connecting to database at {self.database_url}")
-        self.engine = create_engine(self.database_url)
-        self.session_factory = sessionmaker(bind=self.engine)
-        self.Session = scoped_session(self.session_factory)
-        self.init_db()
+        self.workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+        self.max_connections = int(os.getenv('POSTGRES_MAX_CONNECTIONS', '90'))
+        self.pool_size, self.max_overflow = self._worker_pool_limits(
+            int(os.getenv('POSTGRES_POOL_SIZE', '10')),
+            int(os.getenv('POSTGRES_MAX_OVERFLOW', '10')),
+        )
+        self.pool_timeout = float(os.getenv('POSTGRES_POOL_TIMEOUT', '30'))
+        self.pool_recycle = int(os.getenv('POSTGRES_POOL_RECYCLE', '1800'))
+        self.read_reserved_connections = int(os.getenv(
+            'POSTGRES_READ_RESERVED_CONNECTIONS', str(max(1, self.pool_size // 4))
+        ))
+        self.ingest_connections = threading.BoundedSemaphore(self._ingest_connection_limit())
+        self.pool_pre_ping = os.getenv('POSTGRES_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+        self.partition_employees = os.getenv(
+            'POSTGRES_PARTITION_EMPLOYEES', 'false'
+        ).lower() in ('1', 'true', 'yes')
+        self.employees_partitioned = False
+        self.ingest_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('POSTGRES_INGEST_WORKERS', '2')),
+            thread_name_prefix='db-ingest'
+        )
+        self.query_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('POSTGRES_QUERY_WORKERS', '4')),
+            thread_name_prefix='db-query'
+        )
+        self.report_cache = ReportCache(int(os.getenv('REPORT_CACHE_SIZE', '128')))
+        self.analytics_backend = os.getenv('ANALYTICS_BACKEND', 'postgres')
+        self.shared_data_version = self.workers > 1
+        if self.shared_data_version and self.analytics_backend != 'postgres':
+            logging.warning(
+                f"ANALYTICS_BACKEND={self.analytics_backend} keeps a copy of the data in each "
+                f"process and is not supported with {self.workers} workers, using postgres"
+            )
+            self.analytics_backend = 'postgres'
+        self.data_version_poll_seconds = float(os.getenv('DATA_VERSION_POLL_SECONDS', '0.5'))
+        self._start_lock = threading.Lock()
+
+    def _worker_pool_limits(self, pool_size, max_overflow):
+        """
+        Cap the pool of this worker to its share of the connection budget.
+
+        Every worker process has its own pool, so ``POSTGRES_MAX_CONNECTIONS``
+        is divided by ``WEB_CONCURRENCY`` and the pool size, then the
+        overflow, are reduced to fit the share.
+
+        Args:
+            pool_size: The configured pool size.
+            max_overflow: The configured overflow.
+
+        Returns:
+            tuple: The pool size and overflow to use.
+
+        Raises:
+            ValueError: If the budget leaves a worker without a connection.
+        """
+        share = self.max_connections // self.workers
+        if share < 1:
+            raise ValueError(
+                f"POSTGRES_MAX_CONNECTIONS={self.max_connections} is less than one "
+                f"connection for each of the {self.workers} workers"
+            )
+        if pool_size + max_overflow <= share:
+            return pool_size, max_overflow
+        capped_size = min(pool_size, share)
+        capped_overflow = share - capped_size
+        logging.warning(
+            f"Connection pool capped to {capped_size} + {capped_overflow} overflow, "
+            f"the share of each of {self.workers} workers in {self.max_connections} connections"
+        )
+        return capped_size, capped_overflow
+
+    def _ingest_connection_limit(self):
+        """
+        Return how many pooled connections ingestions may hold at once.
+
+        ``POSTGRES_READ_RESERVED_CONNECTIONS`` of the pool and overflow are
+        kept for the report, export and job status reads, so a burst of
+        uploads cannot take every connection. Ingestion always keeps one.
+        """
+        return max(1, self.pool_size + self.max_overflow - self.read_reserved_connections)
+
+    def _acquire_ingest_connection(self):
+        """
+        Wait for one of the connections ingestions may use.
+
+        Release it with ``ingest_connections.release()`` once the ingestion
+        session is closed.
+
+        Raises:
+            PoolTimeoutError: If no ingestion connection frees up within the pool timeout.
+        """
+        if not self.ingest_connections.acquire(timeout=self.pool_timeout):
+            raise PoolTimeoutError(
+                f"No connection available for ingestion within {self.pool_timeout:g} "
+                f"seconds, {self.read_reserved_connections} are reserved for reads"
+            )
+
+    def __getattr__(self, name):
+        """Start the client on first access to one of the attributes ``start`` creates."""
+        if name in LAZY_ATTRIBUTES:
+            self.start()
+            if name in self.__dict__:
+                return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def start(self):
+        """
+        Create the engine, the session factory and the analytics backend.
+
+        Nothing is created when the client is constructed, so importing the
+        application opens no connection and loads no analytics engine. The
+        application lifespan starts the client in each worker process, after
+        any fork by the server, and any other caller starts it on first use.
+        """
+        with self._start_lock:
+            if 'engine' in self.__dict__:
+                return
+            logging.info(f"Connecting to database at {self.database_url}")
+            engine = create_engine(
+                self.database_url,
+                poolclass=TimedQueuePool,
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+                pool_recycle=self.pool_recycle,
+                pool_pre_ping=self.pool_pre_ping,
+            )
+            self.session_factory = sessionmaker(bind=engine)
+            self.Session = scoped_session(self.session_factory)
+            self.analytics = create_analytics_backend(self.analytics_backend, self)
+            self.engine = engine
 
     def init_db(self):
-        """Initialize the database by creating all defined tables."""
-        db.metadata.create_all(self.engine)
+        """
+        Bring the database schema up to date, once per version of the models.
+
+        The DDL of every model is hashed into a fingerprint recorded in
+        ``schema_versions``. A process finding the current fingerprint there
+        skips the table, index and summary checks; otherwise it creates what
+        is missing and records the fingerprint, all in one transaction under
+        an advisory lock, so concurrently starting workers wait for the first
+        one instead of racing it.
+
+        With ``POSTGRES_PARTITION_EMPLOYEES`` set, a new employees table is
+        created partitioned by hire year instead. Whether the existing table
+        is partitioned is read from the catalog on every start, whatever the
+        setting, since ingestion writes the two layouts differently.
+        """
+        fingerprint = self._schema_fingerprint()
+        with self.engine.begin() as connection:
+            connection.execute(
+                text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": SCHEMA_LOCK_ID}
+            )
+            if self._schema_is_current(connection, fingerprint):
+                self._check_employees_partitioned(connection)
+                logging.info("Database schema is up to date")
+                return
+            if self.partition_employees:
+                Base.metadata.create_all(connection, tables=[
+                    table for table in Base.metadata.sorted_tables
+                    if table is not Employee.__table__
+                ])
+                self._create_partitioned_employees(connection)
+            else:
+                Base.metadata.create_all(connection)
+                self._check_employees_partitioned(connection)
+            connection.execute(text(DATA_VERSION_DDL))
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
+            summary_is_empty = not connection.execute(text(
+                f"SELECT EXISTS (SELECT 1 FROM {HiresByDeptJobQuarter.__tablename__})"
+            )).scalar()
+            if summary_is_empty:
+                self.rebuild_hires_summary(connection)
+            connection.execute(text(
+                f"INSERT INTO {SchemaVersion.__tablename__} (fingerprint) VALUES (:fingerprint) "
+                f"ON CONFLICT DO NOTHING"
+            ), {"fingerprint": fingerprint})
         logging.info("Database initialized")
 
-    async def handle_upload(self, file, table):
+    def _schema_fingerprint(self):
+        """Hash the DDL of the tables, indexes and sequences and the partitioning setting."""
+        dialect = postgresql.dialect()
+        statements = [f"partition_employees={self.partition_employees}", DATA_VERSION_DDL]
+        for table in Base.metadata.sorted_tables:
+            statements.append(str(CreateTable(table).compile(dialect=dialect)))
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                statements.append(str(CreateIndex(index).compile(dialect=dialect)))
+        return hashlib.sha256("\n".join(statements).encode()).hexdigest()
+
+    def _schema_is_current(self, connection, fingerprint):
+        """Return whether the schema version with the given fingerprint was applied."""
+        table_name = SchemaVersion.__tablename__
+        if not connection.execute(
+            text("SELECT to_regclass(:table_name) IS NOT NULL"), {"table_name": table_name}
+        ).scalar():
+            return False
+        return connection.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {table_name} WHERE fingerprint = :fingerprint)"
+        ), {"fingerprint": fingerprint}).scalar()
+
+    def _create_partitioned_employees(self, connection):
+        """
+        Create the employees table range-partitioned on ``datetime``, if it does not exist.
+
+        Each hire year gets its own partition, created by ingestion when it
+        first loads that year, and a default partition holds the employees
+        without a hire date or hired outside ``EMPLOYEE_PARTITION_YEARS``.
+        PostgreSQL cannot enforce a primary key on a partitioned table that
+        leaves out the partition key, so ``id`` is indexed but not unique; an
+        existing unpartitioned table is kept as is.
+
+        Args:
+            connection: The connection initializing the schema.
+        """
+        table_name = Employee.__tablename__
+        connection.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                id INTEGER NOT NULL,
+                name VARCHAR,
+                datetime TIMESTAMP WITHOUT TIME ZONE,
+                department_id INTEGER REFERENCES {Department.__tablename__} (id),
+                job_id INTEGER REFERENCES {Job.__tablename__} (id)
+            ) PARTITION BY RANGE (datetime)
+        """))
+        self._check_employees_partitioned(connection)
+        if not self.employees_partitioned:
+            logging.warning(f"{table_name} already exists unpartitioned, keeping it")
+            return
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {table_name}_default PARTITION OF {table_name} DEFAULT"
+        ))
+        logging.info(
+            f"{table_name} partitioned by year: {sorted(self._attached_partition_years(connection))}"
+        )
+
+    def _check_employees_partitioned(self, connection):
+        """Record whether the employees table is partitioned, as found in the catalog."""
+        self.employees_partitioned = connection.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = CAST(:table_name AS regclass))"
+        ), {"table_name": Employee.__tablename__}).scalar()
+
+    def _attached_partition_years(self, connection):
+        """Return the hire years that have a partition attached to the employees table."""
+        names = connection.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:table_name AS regclass)
+        """), {"table_name": Employee.__tablename__}).scalars().all()
+        prefix = f"{Employee.__tablename__}_y"
+        return {int(name[len(prefix):]) for name in names if name.startswith(prefix)}
+
+    def _ensure_employee_partitions(self, hire_dates, session, commit=False):
+        """
+        Attach a partition for every hire year of a chunk that has none yet.
+
+        The attached years are read from the catalog for each chunk, so a
+        year detached by another worker gets a new partition. Missing
+        partitions are created as plain tables and attached on the
+        ingestion's connection, under an advisory lock stopping two
+        ingestions from creating the same year. Attaching locks the parent
+        table in SHARE UPDATE EXCLUSIVE mode rather than ACCESS EXCLUSIVE, so
+        loads and reports of other years keep running.
+
+        Ingestions call this with ``commit`` before writing anything, for the
+        rows they already hold, so the partitions are committed in a short
+        transaction of their own and the lock is released before the load.
+        A year first met in a later chunk is attached in the ingestion
+        transaction and stays locked until it commits.
+
+        Args:
+            hire_dates: The hire datetimes of the rows about to be written.
+            session: The database session of the ingestion.
+            commit: Commit the session once the partitions are attached.
+        """
+        first, last = EMPLOYEE_PARTITION_YEARS
+        years = pd.to_datetime(hire_dates, errors='coerce').dt.year.dropna().astype(int)
+        missing = {year for year in years.unique() if first <= year <= last}
+        if not missing:
+            return
+        missing -= self._attached_partition_years(session)
+        if not missing:
+            return
+        self._attach_employee_partitions(missing, session)
+        if commit:
+            session.commit()
+
+    def _attach_employee_partitions(self, years, connection):
+        """
+        Create and attach the employees partitions of hire years that still have none.
+
+        Args:
+            years: The hire years to create partitions for.
+            connection: The connection or session whose transaction attaches them.
+        """
+        table_name = Employee.__tablename__
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(:lock_id)"),
+            {"lock_id": EMPLOYEE_PARTITION_LOCK_ID}
+        )
+        for year in sorted(set(years) - self._attached_partition_years(connection)):
+            partition = f"{table_name}_y{year}"
+            connection.execute(text(
+                f"CREATE TABLE {partition} (LIKE {table_name} INCLUDING DEFAULTS)"
+            ))
+            connection.execute(text(f"""
+                ALTER TABLE {table_name} ATTACH PARTITION {partition}
+                    FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')
+            """))
+            logging.info(f"Created partition {partition}")
+
+    def _claim_employee_ids(self, ids, session):
+        """
+        Reject appended employee ids that repeat or are already in the partitioned table.
+
+        PostgreSQL cannot enforce a unique ``id`` on the partitioned
+        employees table, so appends check their ids themselves, failing like
+        the primary key of the unpartitioned table would. The ranges of
+        ``2 ** EMPLOYEE_ID_BUCKET_BITS`` ids being appended are locked until
+        commit first, so two concurrent appends of the same new id cannot
+        both pass the check, while appends of other ranges run in parallel.
+        An append spanning more than ``EMPLOYEE_ID_MAX_BUCKETS`` ranges locks
+        all of them at once.
+
+        Args:
+            ids: The ids of the employees about to be appended.
+            session: The database session loading them.
+
+        Raises:
+            ValueError: If an id repeats in the rows or is already loaded.
+        """
+        ids = pd.Series(ids, dtype='Int64').dropna().to_numpy(dtype='int64')
+        if not len(ids):
+            return
+        buckets = np.unique(ids >> EMPLOYEE_ID_BUCKET_BITS)
+        all_ranges = len(buckets) > EMPLOYEE_ID_MAX_BUCKETS
+        session.execute(text(
+            f"SELECT pg_advisory_xact_lock{'' if all_ranges else '_shared'}(:lock_id)"
+        ), {"lock_id": EMPLOYEE_ID_LOCK_ID})
+        if not all_ranges:
+            session.execute(text(
+                "SELECT pg_advisory_xact_lock(:lock_id, bucket) "
+                "FROM unnest(CAST(:buckets AS integer[])) AS bucket ORDER BY bucket"
+            ), {"lock_id": EMPLOYEE_ID_LOCK_ID, "buckets": buckets.tolist()})
+
+        distinct, counts = np.unique(ids, return_counts=True)
+        if (counts > 1).any():
+            raise ValueError(
+                f"Duplicate employee ids in the rows: {distinct[counts > 1][:10].tolist()}"
+            )
+        loaded = self._loaded_ids('employee', session, distinct)
+        if loaded:
+            raise ValueError(f"Employee ids already loaded: {sorted(loaded)[:10]}")
+
+    def detach_employee_year(self, year):
+        """
+        Detach the partition of a hire year from the employees table.
+
+        The year's employees stay in a standalone table, renamed to
+        ``employees_y<year>_detached``, or ``employees_y<year>_detached_<n>``
+        if an earlier detach of the year already took that name, and drop out
+        of every report. Only the catalog changes, so it takes no longer for
+        a large year than a small one.
+
+        Args:
+            year: The hire year to detach.
+
+        Returns:
+            str: The name of the detached table.
+
+        Raises:
+            ValueError: If the employees table has no partition for the year.
+        """
+        partition = f"{Employee.__tablename__}_y{year}"
+        with self.engine.begin() as connection:
+            connection.execute(
+                text("SELECT pg_advisory_xact_lock(:lock_id)"),
+                {"lock_id": EMPLOYEE_PARTITION_LOCK_ID}
+            )
+            if year not in self._attached_partition_years(connection):
+                raise ValueError(f"No employees partition for {year}")
+            detached = f"{partition}_detached"
+            copies = 1
+            while connection.execute(
+                text("SELECT to_regclass(:name) IS NOT NULL"), {"name": detached}
+            ).scalar():
+                copies += 1
+                detached = f"{partition}_detached_{copies}"
+            connection.execute(text(
+                f"ALTER TABLE {Employee.__tablename__} DETACH PARTITION {partition}"
+            ))
+            connection.execute(text(f"ALTER TABLE {partition} RENAME TO {detached}"))
+            connection.execute(text(
+                f"DELETE FROM {HiresByDeptJobQuarter.__tablename__} WHERE year = :year"
+            ), {"year": year})
+        self._data_changed(mirror_applied=False)
+        logging.info(f"Detached partition {partition} as {detached}")
+        return detached
+
+    def warm_pool(self):
+        """
+        Open the pool's ``pool_size`` connections up front.
+
+        The connections are checked out together, so each one is a separate
+        connection, then returned to the pool to serve the first requests
+        without connect latency.
+        """
+        connections = []
+        try:
+            for _ in range(self.pool_size):
+                connections.append(self.engine.connect())
+        finally:
+            for connection in connections:
+                connection.close()
+        logging.info(f"Connection pool warmed with {len(connections)} connections")
+
+    def close(self):
+        """
+        Close every pooled connection.
+
+        The engine opens new connections on demand afterwards, so the client
+        stays usable if the application is started again in the same process.
+        """
+        if 'engine' not in self.__dict__:
+            return
+        self.Session.remove()
+        self.engine.dispose()
+        logging.info("Database connections closed")
+
+    def pool_stats(self):
+        """Return the connection pool usage reported by the stats endpoint."""
+        return self.engine.pool.stats()
+
+    def sync_analytics(self):
+        """
+        Load the analytics backend's copy of the tables, if it keeps one.
+
+        With several workers the backend is always ``postgres``, and only the
+        shared data version is read.
+        """
+        if self.shared_data_version:
+            self.refresh_data_version()
+        else:
+            self.analytics.sync(self._export_table_csv)
+
+    def refresh_data_version(self):
+        """
+        Adopt the data version last published by any worker.
+
+        When another worker has committed since this one last looked, its
+        cached reports are dropped.
+        """
+        with self.engine.connect() as connection:
+            version, token = connection.execute(text(f"""
+                SELECT
+                    CASE WHEN is_called THEN last_value ELSE 0 END,
+                    CAST(CAST(:sequence AS regclass) AS oid)
+                FROM {DATA_VERSION_SEQUENCE}
+            """), {"sequence": DATA_VERSION_SEQUENCE}).one()
+        self.report_cache.set_version(version, token=str(token))
+
+    async def watch_data_version(self):
+        """
+        Poll the shared data version every ``DATA_VERSION_POLL_SECONDS``.
+
+        Run by the application lifespan when several workers serve the API,
+        so reports cached by one worker are dropped within one interval of an
+        ingestion committed by another.
+        """
+        while True:
+            await asyncio.sleep(self.data_version_poll_seconds)
+            try:
+                await self._run_blocking(self.query_executor, self.refresh_data_version)
+            except Exception as e:
+                logging.error(f"Data version refresh failed: {e}")
+
+    def _data_changed(self, session=None, mirror_applied=True):
+        """
+        Invalidate the cached reports after a commit changed the data.
+
+        With several workers, the change is published by advancing the data
+        version sequence, which the other workers poll. Their reports are
+        then served by the ``postgres`` backend, which has no copy to update.
+
+        Args:
+            session: The session of the ingestion that committed the change,
+                reused so the ingestion never holds a second connection. A
+                connection of the pool is used if omitted.
+            mirror_applied: Whether the analytics mirror already holds the
+                change; if not, the mirror is reloaded.
+        """
+        if not self.shared_data_version:
+            self.report_cache.invalidate()
+            if not mirror_applied:
+                self.sync_analytics()
+            return
+        next_version = text(f"SELECT nextval('{DATA_VERSION_SEQUENCE}')")
+        try:
+            if session is not None:
+                version = session.execute(next_version).scalar()
+                session.commit()
+            else:
+                with self.engine.connect() as connection:
+                    version = connection.execute(next_version).scalar()
+                    connection.commit()
+        except SQLAlchemyError as e:
+            logging.error(f"Could not publish the data version, other workers may serve "
+                          f"stale reports until the next ingestion: {e}")
+            self.report_cache.invalidate()
+            return
+        self.report_cache.set_version(version)
+
+    def _export_table_csv(self, table_name, columns, out):
+        """
+        Write columns of a table to a binary file as headerless CSV with COPY ... TO STDOUT.
+
+        Args:
+            table_name: The name of the table to export.
+            columns: The names of the columns to export.
+            out: A binary file-like object to write to.
+        """
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.copy_expert(
+                f"COPY (SELECT {', '.join(columns)} FROM {table_name}) TO STDOUT WITH (FORMAT csv)",
+                out
+            )
+            cursor.close()
+        finally:
+            connection.close()
+
+    def rebuild_hires_summary(self, connection):
+        """
+        Recompute the hires summary table from the full employees table.
+
+        Ingestion keeps the summary up to date on its own; this is only needed
+        to backfill it for rows loaded before it existed.
+
+        Args:
+            connection: The connection or session to run the rebuild in.
+        """
+        connection.execute(text(f"TRUNCATE {HiresByDeptJobQuarter.__tablename__}"))
+        connection.execute(text(f"""
+            INSERT INTO {HiresByDeptJobQuarter.__tablename__}
+                (year, department_id, job_id, quarter, hired)
+            SELECT
+                EXTRACT(YEAR FROM datetime)::int,
+                department_id,
+                job_id,
+                EXTRACT(QUARTER FROM datetime)::int,
+                COUNT(*)
+            FROM
+                {Employee.__tablename__}
+            WHERE
+                datetime IS NOT NULL
+                AND department_id IS NOT NULL
+                AND job_id IS NOT NULL
+            GROUP BY
+                1, 2, 3, 4
+        """))
+        logging.info("Hires summary rebuilt")
+
+    def report_etag(self, name, **params):
+        """
+        Return the ETag of a report for the data currently loaded.
+
+        Args:
+            name: The report name.
+            **params: The report parameters.
+        """
+        return self.report_cache.etag(name, params)
+
+    async def _cached_report(self, name, params, compute):
+        """
+        Return a report from the result cache, running its query on a miss.
+
+        Args:
+            name: The report name.
+            params: Dictionary of report parameters, passed to ``compute`` as keywords.
+            compute: Blocking callable running the report query.
+        """
+        cached = self.report_cache.lookup(name, params)
+        if cached is not None:
+            REPORT_CACHE_REQUESTS.labels(name, 'hit').inc()
+            return cached
+        REPORT_CACHE_REQUESTS.labels(name, 'miss').inc()
+
+        def timed_compute():
+            with REPORT_QUERY_SECONDS.labels(name).time():
+                return compute(**params)
+
+        return await self._run_blocking(
+            self.query_executor,
+            self.report_cache.get_or_compute,
+            name,
+            params,
+            timed_compute
+        )
+
+    async def _run_blocking(self, executor, func, *args):
+        """
+        Run a blocking database or pandas call on one of the client executors.
+
+        Ingestion and report queries use separate executors, so long uploads
+        cannot take every thread and reports keep being served meanwhile.
+        Sessions come from a scoped_session, so each executor thread works
+        with its own session.
+
+        Args:
+            executor: The executor to run the call on.
+            func: The blocking callable.
+            *args: Positional arguments passed to ``func``.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args))
+
+    async def handle_upload(self, file, table, chunksize=None, mode='append', validate=False):
         """
         Handle the upload and insertion of CSV data into the specified table.
 
+        When ``chunksize`` is given the upload is parsed straight from the
+        spooled file in DataFrames of at most ``chunksize`` rows and each one
+        is flushed to the database before the next is read, so memory stays
+        bounded by the chunk size rather than the file size. All chunks still
+        share one transaction.
+
+        Parsing and loading run on the ingestion executor so the event loop
+        stays free for other requests.
+
         Args:
             file: The uploaded file containing CSV data.
             table: The name of the table to insert data into.
+            chunksize: Optional number of rows to parse and load per chunk.
+            mode: 'append' to insert the rows, or 'upsert' to merge them by id.
+            validate: Quarantine invalid rows instead of failing the whole upload.
         """
-        session = self.Session()
-        try:
-            contents = await file.read()
-            if table == 'employee':
-                column_names = ['id', 'name', 'datetime', 'department_id', 'job_id']
-            elif table == 'job':
-                column_names = ['id', 'job']
-            elif table == 'department':
-                column_names = ['id', 'department']
-            else:
-                raise ValueError("Invalid table name")
+        TableName(table)
+        if chunksize:
+            source = file.file
+        else:
+            with stage_timer('upload', table, 'read'):
+                source = BytesIO(await file.read())
 
-            df = pd.read_csv(StringIO(contents.decode("utf-8")), header=None, names=column_names)
-            logging.info(
-                f"DataFrame loaded with shape {df.shape} and columns {df.columns.tolist()}"
-                )
+        summary = await self._run_blocking(
+            self.ingest_executor, self._load_file, source, table, chunksize, None, mode, validate
+        )
 
-            if table == 'department':
-                self._insert_departments(df, session)
-            elif table == 'job':
-                self._insert_jobs(df, session)
-            elif table == 'employee':
-                self._insert_employees(df, session)
+        if chunksize or validate:
+            return {"filename": file.filename, **summary}
+        return {"filename": file.filename}
 
-            session.commit()
+    def load_file(self, path, table, chunksize=None, progress=None, mode='append', validate=False):
+        """
+        Load a CSV, Parquet or Arrow IPC file from local disk into the given table in one transaction.
+
+        This is the blocking counterpart of ``handle_upload`` used by
+        background ingestion jobs, which run on their own worker threads.
+
+        Args:
+            path: Path of the spooled file.
+            table: The name of the table to insert data into.
+            chunksize: Optional number of rows to parse and load per chunk.
+            progress: Optional callable receiving the row count of each loaded chunk.
+            mode: 'append' to insert the rows, or 'upsert' to merge them by id.
+            validate: Quarantine invalid rows instead of failing the whole upload.
+
+        Returns:
+            dict: The rows inserted in total and per chunk.
+        """
+        with open(path, 'rb') as source:
+            return self._load_file(source, table, chunksize, progress, mode, validate)
+
+    def batch_insert_file(
+        self, path, table, chunksize=None, progress=None, mode='append', validate=False
+    ):
+        """
+        Batch insert a CSV, Parquet or Arrow IPC file from local disk, committing one batch per chunk.
+
+        Args:
+            path: Path of the spooled file.
+            table: The name of the table to insert data into.
+            chunksize: Optional number of rows per batch; the whole file is one batch if omitted.
+            progress: Optional callable receiving the row count of each committed batch.
+            mode: 'append' to insert the rows, or 'upsert' to merge them by id.
+            validate: Quarantine invalid rows instead of failing their batch.
+
+        Returns:
+            dict: The rows inserted in total and per batch.
+        """
+        chunk_rows = []
+        rejected = Counter()
+        upload_id = uuid.uuid4().hex
+        first_row = 1
+        with open(path, 'rb') as source:
+            frames = timed_iter(
+                iter_frames(source, table, chunksize, raw=validate), 'batch_insert', table, 'parse'
+            )
+            for df in frames:
+                response = self._batch_insert(df, table, mode, validate, upload_id, first_row)
+                chunk_rows.append(response["rows_inserted"])
+                rejected.update(response.get("rejected", {}))
+                first_row += len(df)
+                if progress:
+                    progress(len(df))
+        response = {"status": "success", "rows_inserted": sum(chunk_rows), "chunks": chunk_rows}
+        if validate:
+            response.update(upload_id=upload_id, rejected=dict(rejected))
+        return response
+
+    def _load_file(
+        self, source, table, chunksize=None, progress=None, mode='append', validate=False
+    ):
+        """
+        Read an uploaded file and load it into the given table in one transaction.
+
+        The format (headerless CSV, Parquet or Arrow IPC) is detected from
+        the content. With ``validate``, each chunk first goes through the
+        validation stage: its valid rows are loaded and the rest are written
+        to the quarantine table under one upload ID.
+
+        Args:
+            source: A seekable binary file-like object with the file data.
+            table: The name of the table to insert data into.
+            chunksize: Optional number of rows to parse and load per chunk.
+            progress: Optional callable receiving the row count of each processed chunk.
+            mode: 'append' to insert the rows, or 'upsert' to merge them by id.
+            validate: Quarantine invalid rows instead of failing the whole upload.
+
+        Returns:
+            dict: The rows inserted in total and per chunk, plus the upload ID
+            and the rejected rows per reason when validating.
+        """
+        self._acquire_ingest_connection()
+        session = self.Session()
+        mirror = self.analytics.begin()
+        start = time.perf_counter()
+        try:
+            chunk_rows = []
+            rejected = Counter()
+            upload_id = uuid.uuid4().hex
+            reference_ids = self._reference_ids(table, session) if validate else None
+            first_row = 1
+            frames = timed_iter(
+                iter_frames(source, table, chunksize, raw=validate), 'upload', table, 'parse'
+            )
+            for df in frames:
+                logging.info(
+                    f"DataFrame loaded with shape {df.shape} and columns {df.columns.tolist()}"
+                    )
+                chunk_length = len(df)
+                if first_row == 1 and table == 'employee' and self.employees_partitioned:
+                    self._ensure_employee_partitions(df['datetime'], session, commit=True)
+                if validate:
+                    with stage_timer('upload', table, 'validate'):
+                        df = self._validate_frame(
+                            df, table, session, mode, upload_id, reference_ids, first_row, rejected
+                        )
+                with stage_timer('upload', table, 'write'):
+                    self._insert_frame(df, table, session, mode)
+                    mirror.write(table, df, mode)
+                chunk_rows.append(len(df))
+                first_row += chunk_length
+                if progress:
+                    progress(chunk_length)
+
+            with stage_timer('upload', table, 'commit'):
+                session.commit()
+                mirror.commit()
+            self._data_changed(session)
+            record_ingestion(
+                'upload', table, sum(chunk_rows), time.perf_counter() - start, rejected
+            )
             logging.info("Data committed to the database")
 
         except (SQLAlchemyError, Exception) as e:
             session.rollback()
+            mirror.rollback()
             logging.error(f"Error during data insertion: {e}")
             raise e
 
         finally:
             session.close()
-        return {"filename": file.filename}
+            self.ingest_connections.release()
 
-    async def handle_batch_insert(self, rows, table):
+        summary = {"rows_inserted": sum(chunk_rows), "chunks": chunk_rows}
+        if validate:
+            summary.update(upload_id=upload_id, rejected=dict(rejected))
+        return summary
+
+    async def handle_batch_insert(
+        self, rows, table, mode='append', validate=False, upload_id=None, first_row=1
+    ):
         """
         Handle batch insertion of data into the specified table.
 
         Args:
-            rows: List of dictionaries representing rows to insert.
+            rows: List of dictionaries representing rows to insert, or a
+                DataFrame of parsed file rows, used without conversion.
             table: The name of the table to insert data into.
+            mode: 'append' to insert the rows, or 'upsert' to merge them by id.
+            validate: Quarantine invalid rows instead of failing the batch.
+            upload_id: Optional upload ID to quarantine rows under, so the
+                batches of one file share it. A new one is used if omitted.
+            first_row: The 1-based position of the batch's first row in its file.
         """
+        return await self._run_blocking(
+            self.ingest_executor, self._batch_insert, rows, table, mode,
+            validate, upload_id, first_row
+        )
+
+    def _batch_insert(
+        self, rows, table, mode='append', validate=False, upload_id=None, first_row=1
+    ):
+        """Insert a batch of rows into the given table in one transaction."""
+        self._acquire_ingest_connection()
         session = self.Session()
+        mirror = self.analytics.begin()
+        start = time.perf_counter()
+        rejected = Counter()
+        upload_id = upload_id or uuid.uuid4().hex
         try:
-            df = pd.DataFrame(rows)
+            with stage_timer('batch_insert', table, 'frame'):
+                df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
             logging.info(
                 f"Batch DataFrame loaded with shape {df.shape} and columns {df.columns.tolist()}"
                 )
+            if table == 'employee' and self.employees_partitioned:
+                self._ensure_employee_partitions(df['datetime'], session, commit=True)
+            if validate:
+                with stage_timer('batch_insert', table, 'validate'):
+                    df = self._validate_frame(
+                        df, table, session, mode, upload_id,
+                        self._reference_ids(table, session), first_row, rejected
+                    )
 
-            if table == 'department':
-                data_to_insert = df.to_dict(orient='records')
-                session.bulk_insert_mappings(Department, data_to_insert)
-            elif table == 'job':
-                data_to_insert = df.to_dict(orient='records')
-                session.bulk_insert_mappings(Job, data_to_insert)
-            elif table == 'employee':
-                df = self._prepare_employee_dataframe(df)
-                data_to_insert = df.to_dict(orient='records')
-                session.bulk_insert_mappings(Employee, data_to_insert)
+            with stage_timer('batch_insert', table, 'write'):
+                if mode == 'upsert':
+                    self._insert_frame(df, table, session, mode)
+                elif table == 'department':
+                    data_to_insert = df.to_dict(orient='records')
+                    session.bulk_insert_mappings(Department, data_to_insert)
+                elif table == 'job':
+                    data_to_insert = df.to_dict(orient='records')
+                    session.bulk_insert_mappings(Job, data_to_insert)
+                elif table == 'employee':
+                    df = self._prepare_employee_dataframe(df)
+                    self._lock_hires_summary(session, exclusive=False)
+                    if self.employees_partitioned:
+                        self._ensure_employee_partitions(df['datetime'], session)
+                        self._claim_employee_ids(df['id'], session)
+                    data_to_insert = df.to_dict(orient='records')
+                    session.bulk_insert_mappings(Employee, data_to_insert)
+                    self._record_hires(df, session)
+                mirror.write(table, df, mode)
 
-            session.commit()
+            with stage_timer('batch_insert', table, 'commit'):
+                session.commit()
+                mirror.commit()
+            self._data_changed(session)
+            record_ingestion(
+                'batch_insert', table, len(df), time.perf_counter() - start, rejected
+            )
             logging.info("Batch data committed to the database")
 
         except (SQLAlchemyError, Exception) as e:
             session.rollback()
+            mirror.rollback()
             logging.error(f"Error during batch insertion: {e}")
             raise e
 
         finally:
             session.close()
-        return {"status": "success", "rows_inserted": len(rows)}
+            self.ingest_connections.release()
 
-    async def get_employees_per_quarter(self):
+        response = {"status": "success", "rows_inserted": len(df)}
+        if validate:
+            response.update(upload_id=upload_id, rejected=dict(rejected))
+        return response
+
+    async def handle_row_insert(self, rows, table):
         """
-        Get the number of employees hired per quarter for each department and job.
+        Append validated rows of a JSON batch to the specified table.
+
+        Args:
+            rows: Dictionaries with every column of the table, as returned by
+                ``validate_rows``.
+            table: The name of the table to insert data into.
         """
+        return await self._run_blocking(self.ingest_executor, self._insert_rows, rows, table)
+
+    def _insert_rows(self, rows, table):
+        """
+        Insert the rows of a JSON batch with one multi-row INSERT, in one transaction.
+
+        The rows go to the database as they are, with no DataFrame built
+        unless an analytics mirror needs them.
+        """
+        self._acquire_ingest_connection()
         session = self.Session()
+        mirror = self.analytics.begin()
+        start = time.perf_counter()
         try:
-            query = text("""
-                SELECT 
-                    d.department AS department, 
-                    j.job AS job,
-                    SUM(CASE WHEN EXTRACT(QUARTER FROM e.datetime) = 1 THEN 1 ELSE 0 END) AS Q1,
-                    SUM(CASE WHEN EXTRACT(QUARTER FROM e.datetime) = 2 THEN 1 ELSE 0 END) AS Q2,
-                    SUM(CASE WHEN EXTRACT(QUARTER FROM e.datetime) = 3 THEN 1 ELSE 0 END) AS Q3,
-                    SUM(CASE WHEN EXTRACT(QUARTER FROM e.datetime) = 4 THEN 1 ELSE 0 END) AS Q4
-                FROM 
-                    employees e
-                JOIN 
-                    departments d ON e.department_id = d.id
-                JOIN 
-                    jobs j ON e.job_id = j.id
-                WHERE 
-                    EXTRACT(YEAR FROM e.datetime) = 2021
-                GROUP BY 
-                    d.department, j.job
-                ORDER BY 
-                    d.department, j.job
-            """)
-
-            result = session.execute(query).fetchall()
-            df = pd.DataFrame(result, columns=['department', 'job', 'Q1', 'Q2', 'Q3', 'Q4'])
-            data = df.to_dict(orient='records')
-
-            return JSONResponse(content={"data": data})
+            with stage_timer('batch_insert', table, 'write'):
+                if table == 'employee':
+                    if self.employees_partitioned:
+                        self._ensure_employee_partitions(
+                            pd.Series([row['datetime'] for row in rows], dtype=object),
+                            session, commit=True
+                        )
+                    self._lock_hires_summary(session, exclusive=False)
+                    if self.employees_partitioned:
+                        self._claim_employee_ids([row['id'] for row in rows], session)
+                session.execute(insert(TABLE_MODELS[table].__table__), rows)
+                if table == 'employee':
+                    self._record_row_hires(rows, session)
+                if self.analytics.name != 'postgres':
+                    mirror.write(table, pd.DataFrame(rows), 'append')
 
-        except SQLAlchemyError as e:
+            with stage_timer('batch_insert', table, 'commit'):
+                session.commit()
+                mirror.commit()
+            self._data_changed(session)
+            record_ingestion('batch_insert', table, len(rows), time.perf_counter() - start)
+
+        except (SQLAlchemyError, Exception) as e:
             session.rollback()
-            logging.error(f"SQLAlchemyError: {e}")
+            mirror.rollback()
+            logging.error(f"Error during batch insertion: {e}")
             raise e
 
         finally:
             session.close()
+            self.ingest_connections.release()
+
+        return {"status": "success", "rows_inserted": len(rows)}
 
-    async def get_departments_above_average(self):
+    async def get_employees_per_quarter(self, year=2021):
         """
-        Get departments that hired more employees than the average number of hires in 2021.
+        Get the number of employees hired per quarter for each department and job.
+
+        Args:
+            year: The hire year to report on.
         """
-        session = self.Session()
-        try:
-            subquery = text("""
-                SELECT 
-                    department_id, COUNT(id) AS hired_count
-                FROM 
+        data = await self._cached_report(
+            'employees_per_quarter', {"year": year}, self._employees_per_quarter
+        )
+        return {"data": data}
+
+    def _employees_per_quarter(self, year):
+        """Run the hires-per-quarter report on the analytics backend."""
+        return self.analytics.employees_per_quarter(year)
+
+    def _employees_per_quarter_query(self, year):
+        """Build the hires-per-quarter report query, its parameters and its column names."""
+        query = text("""
+            SELECT
+                d.department AS department,
+                j.job AS job,
+                SUM(CASE WHEN h.quarter = 1 THEN h.hired ELSE 0 END) AS Q1,
+                SUM(CASE WHEN h.quarter = 2 THEN h.hired ELSE 0 END) AS Q2,
+                SUM(CASE WHEN h.quarter = 3 THEN h.hired ELSE 0 END) AS Q3,
+                SUM(CASE WHEN h.quarter = 4 THEN h.hired ELSE 0 END) AS Q4
+            FROM
+                hires_by_dept_job_quarter h
+            JOIN
+                departments d ON h.department_id = d.id
+            JOIN
+                jobs j ON h.job_id = j.id
+            WHERE
+                h.year = :year
+            GROUP BY
+                d.department, j.job
+            ORDER BY
+                d.department, j.job
+        """)
+        return query, {"year": year}, ['department', 'job', 'Q1', 'Q2', 'Q3', 'Q4']
+
+    async def get_departments_above_average(self, year=2021, comparison='mean', top_n=5):
+        """
+        Get departments that hired more employees than the average number of hires in a year.
+
+        Args:
+            year: The hire year to report on.
+            comparison: 'mean' or 'median' to keep departments above that
+                average, or 'top' to keep the ``top_n`` departments by hires.
+            top_n: Number of departments kept by the 'top' comparison.
+        """
+        data = await self._cached_report(
+            'departments_above_average',
+            {"year": year, "comparison": comparison, "top_n": top_n},
+            self._departments_above_average
+        )
+        return {"data": data}
+
+    def _departments_above_average(self, year, comparison='mean', top_n=5):
+        """Run the departments-above-average report on the analytics backend."""
+        data = self.analytics.departments_above_average(year, comparison, top_n)
+        logging.info(f"Departments above average: {data}")
+        return data
+
+    def _departments_above_average_query(self, year, comparison='mean', top_n=5):
+        """
+        Build the departments-above-average report query, its parameters and its column names.
+
+        Hires are counted per department once in a CTE, and the mean, median
+        and rank are computed over those counts, so employees is aggregated a
+        single time whatever the comparison. As before, employees without a
+        department count towards the averages but are never listed.
+        """
+        conditions = {
+            'mean': "r.hired > r.mean_hired",
+            'median': "r.hired > r.median_hired",
+            'top': "r.hired_rank <= :top_n",
+        }
+        if comparison not in conditions:
+            raise ValueError("Invalid comparison")
+
+        query = text(f"""
+            WITH hires AS (
+                SELECT
+                    department_id, COUNT(id) AS hired
+                FROM
                     employees
-                WHERE 
-                    EXTRACT(YEAR FROM datetime) = 2021
-                GROUP BY 
+                WHERE
+                    datetime >= :start AND datetime < :end
+                GROUP BY
                     department_id
-            """)
-
-            avg_hired_query = text(f"""
-                SELECT 
-                    AVG(hired_count) 
-                FROM 
-                    ({subquery}) AS sub
-            """)
-
-            avg_hired = session.execute(avg_hired_query).scalar()
-
-            query = text("""
-                SELECT 
-                    d.id, d.department, COUNT(e.id) AS hired
-                FROM 
-                    employees e
-                JOIN 
-                    departments d ON e.department_id = d.id
-                WHERE 
-                    EXTRACT(YEAR FROM e.datetime) = 2021
-                GROUP BY 
-                    d.id, d.department
-                HAVING 
-                    COUNT(e.id) > :avg_hired
-                ORDER BY 
-                    COUNT(e.id) DESC
-            """)
-
-            result = session.execute(query, {"avg_hired": avg_hired}).fetchall()
-            df = pd.DataFrame(result, columns=['id', 'department', 'hired'])
-            logging.info(f"Departments above average: {df.to_dict(orient='records')}")
-
-            data = df.to_dict(orient='records')
-            return JSONResponse(content={"data": data})
+            ),
+            ranked AS (
+                SELECT
+                    department_id,
+                    hired,
+                    AVG(hired) OVER () AS mean_hired,
+                    (SELECT PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY hired) FROM hires)
+                        AS median_hired,
+                    RANK() OVER (
+                        PARTITION BY department_id IS NULL ORDER BY hired DESC
+                    ) AS hired_rank
+                FROM
+                    hires
+            )
+            SELECT
+                d.id, d.department, r.hired
+            FROM
+                ranked r
+            JOIN
+                departments d ON r.department_id = d.id
+            WHERE
+                {conditions[comparison]}
+            ORDER BY
+                r.hired DESC
+        """)
+        params = {**_year_range(year), "top_n": top_n}
+        return query, params, ['id', 'department', 'hired']
+
+    def iter_report(self, name, **params):
+        """
+        Yield the rows of a report one at a time.
+
+        A cached result is replayed as is. Otherwise the query runs on a
+        server-side cursor and rows are yielded as they arrive, so the full
+        result is never held in memory. The generator owns its own session,
+        so it may be advanced from any thread. Reports served by another
+        analytics backend are computed there and cached as usual.
+
+        Args:
+            name: 'employees_per_quarter' or 'departments_above_average'.
+            **params: The report parameters.
+        """
+        cached = self.report_cache.lookup(name, params)
+        if cached is not None:
+            yield from cached
+            return
+
+        if self.analytics.name != 'postgres':
+            reports = {
+                'employees_per_quarter': self._employees_per_quarter,
+                'departments_above_average': self._departments_above_average,
+            }
+            yield from self.report_cache.get_or_compute(
+                name, params, functools.partial(reports[name], **params)
+            )
+            return
+
+        query, query_params, columns = self._dataset_query(name, **params)
+        for batch in self._stream_batches(query, query_params, REPORT_STREAM_BATCH_ROWS):
+            for row in batch:
+                yield dict(zip(columns, row))
+
+    def export_batches(self, dataset, batch_rows=EXPORT_BATCH_ROWS, **params):
+        """
+        Stream a table or report as batches of row tuples from a server-side cursor.
+
+        Args:
+            dataset: 'employees', 'departments', 'jobs', 'employees_per_quarter'
+                or 'departments_above_average'.
+            batch_rows: Maximum number of rows per batch.
+            **params: The report parameters, if any.
+
+        Returns:
+            tuple: The column names and a generator of lists of row tuples.
+        """
+        query, query_params, columns = self._dataset_query(dataset, **params)
+        return columns, self._stream_batches(query, query_params, batch_rows)
+
+    def _dataset_query(self, dataset, **params):
+        """Build the query, parameters and column names of a table or report."""
+        if dataset in TABLE_EXPORTS:
+            model = TABLE_EXPORTS[dataset]
+            columns = model.__table__.columns.keys()
+            query = text(f"SELECT {', '.join(columns)} FROM {model.__tablename__} ORDER BY id")
+            return query, {}, columns
+
+        builders = {
+            'employees_per_quarter': self._employees_per_quarter_query,
+            'departments_above_average': self._departments_above_average_query,
+        }
+        return builders[dataset](**params)
+
+    def _stream_batches(self, query, params, batch_rows):
+        """
+        Run a query on a server-side cursor and yield its rows in lists of ``batch_rows``.
+
+        The generator uses its own session rather than the thread-scoped one,
+        since a streaming response may advance it from different threads.
+        """
+        session = self.session_factory()
+        try:
+            result = session.execute(query, params, execution_options={"yield_per": batch_rows})
+            yield from result.partitions()
+        finally:
+            session.close()
+
+    def _fetch_report(self, query, params, columns):
+        """
+        Run a report query and return its rows as dictionaries.
+
+        Args:
+            query: The report query.
+            params: The query parameters.
+            columns: The names given to the selected columns.
+        """
+        session = self.Session()
+        try:
+            result = session.execute(query, params).fetchall()
+            return [dict(zip(columns, row)) for row in result]
 
         except SQLAlchemyError as e:
             session.rollback()
@@ -218,42 +1268,355 @@ class PostgresClient:
         finally:
             session.close()
 
-    def _insert_departments(self, df, session):
-        """Helper method to insert departments data."""
-        for _, row in df.iterrows():
-            session.add(Department(id=row['id'], department=row['department']))
+    def _validate_frame(
+        self, df, table, session, mode, upload_id, reference_ids, first_row, rejected
+    ):
+        """
+        Run the validation stage on a chunk and quarantine its rejected rows.
 
-    def _insert_jobs(self, df, session):
-        """Helper method to insert jobs data."""
-        for _, row in df.iterrows():
-            session.add(Job(id=row['id'], job=row['job']))
+        Args:
+            df: The parsed chunk.
+            table: The name of the table the chunk is loaded into.
+            session: The database session loading the chunk.
+            mode: 'append' or 'upsert'; ids may repeat when upserting.
+            upload_id: The ID the rejected rows are quarantined under.
+            reference_ids: Foreign-key id sets from ``_reference_ids``.
+            first_row: The 1-based position of the chunk's first row in its file.
+            rejected: Counter of rejected rows per reason, updated in place.
+
+        Returns:
+            DataFrame: The valid rows of the chunk.
+        """
+        loaded_ids = None
+        if mode != 'upsert':
+            loaded_ids = functools.partial(self._loaded_ids, table, session)
+        valid, invalid = validate_frame(df, table, reference_ids, loaded_ids, first_row)
+        if len(invalid):
+            session.execute(
+                insert(RejectedRow.__table__), rejected_records(invalid, table, upload_id)
+            )
+            rejected.update(invalid['reason'].value_counts().to_dict())
+            logging.info(f"Quarantined {len(invalid)} {table} rows of upload {upload_id}")
+        return valid
+
+    def _reference_ids(self, table, session):
+        """Load the department and job ids that employee rows may reference."""
+        if table != 'employee':
+            return {}
+        return {
+            'department_id': session.execute(
+                text(f"SELECT id FROM {Department.__tablename__}")
+            ).scalars().all(),
+            'job_id': session.execute(
+                text(f"SELECT id FROM {Job.__tablename__}")
+            ).scalars().all(),
+        }
+
+    def _loaded_ids(self, table, session, ids):
+        """Return which of the given ids are already stored in the table."""
+        table_name = TABLE_NAMES[table]
+        return session.execute(
+            text(f"SELECT id FROM {table_name} WHERE id = ANY(:ids)"),
+            {"ids": ids.tolist()}
+        ).scalars().all()
 
-    def _insert_employees(self, df, session):
-        """Helper method to insert employees data."""
+    def _insert_frame(self, df, table, session, mode='append'):
+        """Helper method to bulk load a parsed DataFrame into the given table."""
+        if table == 'department':
+            self._insert_departments(df, session, mode)
+        elif table == 'job':
+            self._insert_jobs(df, session, mode)
+        elif table == 'employee':
+            self._insert_employees(df, session, mode)
+
+    def _insert_departments(self, df, session, mode='append'):
+        """Helper method to bulk load departments data."""
+        self._write_dataframe(df[['id', 'department']], Department.__tablename__, session, mode)
+
+    def _insert_jobs(self, df, session, mode='append'):
+        """Helper method to bulk load jobs data."""
+        self._write_dataframe(df[['id', 'job']], Job.__tablename__, session, mode)
+
+    def _insert_employees(self, df, session, mode='append'):
+        """Helper method to bulk load employees data."""
         try:
-            df['datetime'] = pd.to_datetime(df['datetime'], utc=True, errors='coerce')
+            df['datetime'] = parse_datetimes(df['datetime'])
+            if isinstance(df['datetime'].dtype, pd.DatetimeTZDtype):
+                df['datetime'] = df['datetime'].dt.tz_convert('UTC').dt.tz_localize(None)
         except Exception as e:
             logging.error(f"Initial date parsing failed: {e}")
 
-        df = df.replace({pd.NaT: None, np.NaN: None})
-        for _, row in df.iterrows():
-            session.add(Employee(
-                id=row['id'],
-                name=row['name'],
-                datetime=row['datetime'],
-                department_id=row['department_id'],
-                job_id=row['job_id']
-            ))
+        for column in ('id', 'department_id', 'job_id'):
+            df[column] = df[column].astype('Int64')
+
+        self._lock_hires_summary(session, exclusive=mode == 'upsert')
+        if self.employees_partitioned:
+            self._ensure_employee_partitions(df['datetime'], session)
+            if mode != 'upsert':
+                self._claim_employee_ids(df['id'], session)
+        self._write_dataframe(
+            df[['id', 'name', 'datetime', 'department_id', 'job_id']],
+            Employee.__tablename__,
+            session,
+            mode
+        )
+        if mode != 'upsert':
+            self._record_hires(df, session)
+
+    def _lock_hires_summary(self, session, exclusive):
+        """
+        Take the transaction-level lock guarding the hires summary table.
+
+        An upsert counts the employees it changes from the committed rows, so
+        it cannot see the rows of a concurrent upload of the same ids and
+        would count them twice. Upserts take the lock exclusively and appends
+        share it, so appends still run in parallel with each other. The lock
+        is released when the transaction ends.
+
+        Args:
+            session: The database session writing employees.
+            exclusive: True for upserts, False for appends.
+        """
+        lock = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+        session.execute(text(f"SELECT {lock}(:lock_id)"), {"lock_id": HIRES_SUMMARY_LOCK_ID})
+
+    def _record_hires(self, df, session):
+        """
+        Add newly inserted employees to the hires summary table.
+
+        The rows are aggregated per year, department, job and quarter in
+        pandas, so only one small upsert per group reaches the database.
+        Employees without a hire date, department or job are not counted,
+        matching the joins of the report.
+
+        Args:
+            df: DataFrame of the employees just inserted.
+            session: The database session the employees were inserted in.
+        """
+        hires = pd.DataFrame({
+            'hired_at': pd.to_datetime(df['datetime'], utc=True, errors='coerce'),
+            'department_id': df['department_id'],
+            'job_id': df['job_id'],
+        }).dropna()
+        if hires.empty:
+            return
+
+        counts = hires.groupby([
+            hires['hired_at'].dt.year.rename('year'),
+            hires['department_id'].astype('int64'),
+            hires['job_id'].astype('int64'),
+            hires['hired_at'].dt.quarter.rename('quarter'),
+        ]).size().rename('hired').reset_index()
+
+        self._add_hires(counts.astype('int64').to_dict(orient='records'), session)
+
+    def _record_row_hires(self, rows, session):
+        """
+        Add the employees of a validated JSON batch to the hires summary table.
+
+        Same as ``_record_hires`` for rows already holding naive UTC
+        datetimes, counted in Python since JSON batches are small.
+
+        Args:
+            rows: The employee rows just inserted.
+            session: The database session the employees were inserted in.
+        """
+        counts = Counter(
+            (row['datetime'].year, row['department_id'], row['job_id'],
+             (row['datetime'].month + 2) // 3)
+            for row in rows
+            if row['datetime'] is not None
+            and row['department_id'] is not None and row['job_id'] is not None
+        )
+        if counts:
+            self._add_hires([
+                {"year": year, "department_id": department_id, "job_id": job_id,
+                 "quarter": quarter, "hired": hired}
+                for (year, department_id, job_id, quarter), hired in sorted(counts.items())
+            ], session)
+
+    def _add_hires(self, counts, session):
+        """
+        Add hire counts to the hires summary table.
+
+        Args:
+            counts: Dictionaries of ``year``, ``department_id``, ``job_id``,
+                ``quarter`` and the number of employees ``hired``, sorted by
+                those keys so concurrent ingestions lock the summary rows in
+                the same order and cannot deadlock.
+            session: The database session the employees were inserted in.
+        """
+        session.execute(text(f"""
+            INSERT INTO {HiresByDeptJobQuarter.__tablename__}
+                (year, department_id, job_id, quarter, hired)
+            VALUES
+                (:year, :department_id, :job_id, :quarter, :hired)
+            ON CONFLICT (year, department_id, job_id, quarter) DO UPDATE SET
+                hired = {HiresByDeptJobQuarter.__tablename__}.hired + EXCLUDED.hired
+        """), counts)
+
+    def _record_staged_hires(self, staging_table, session, sign):
+        """
+        Add or remove the current employees whose ids are staged from the hires summary.
+
+        Called with ``sign=-1`` before a merge and ``sign=1`` after it, so rows
+        that an upsert changes move between summary groups and unchanged rows
+        net out.
+
+        Args:
+            staging_table: The staging table holding the upserted ids.
+            session: The database session running the upsert.
+            sign: 1 to add the staged employees, -1 to remove them.
+        """
+        summary_table = HiresByDeptJobQuarter.__tablename__
+        session.execute(text(f"""
+            INSERT INTO {summary_table} (year, department_id, job_id, quarter, hired)
+            SELECT
+                EXTRACT(YEAR FROM e.datetime)::int,
+                e.department_id,
+                e.job_id,
+                EXTRACT(QUARTER FROM e.datetime)::int,
+                :sign * COUNT(*)
+            FROM
+                {Employee.__tablename__} e
+            WHERE
+                e.id IN (SELECT id FROM {staging_table})
+                AND e.datetime IS NOT NULL
+                AND e.department_id IS NOT NULL
+                AND e.job_id IS NOT NULL
+            GROUP BY
+                1, 2, 3, 4
+            ON CONFLICT (year, department_id, job_id, quarter) DO UPDATE SET
+                hired = {summary_table}.hired + EXCLUDED.hired
+        """), {"sign": sign})
+        if sign > 0:
+            session.execute(text(f"DELETE FROM {summary_table} WHERE hired = 0"))
+
+    def _write_dataframe(self, df, table_name, session, mode='append'):
+        """Helper method to append or upsert a prepared DataFrame into a table."""
+        if mode == 'upsert':
+            self._upsert_dataframe(df, table_name, session)
+        else:
+            self._copy_dataframe(df, table_name, session)
+
+    def _copy_dataframe(self, df, table_name, session):
+        """
+        Stream a DataFrame into a table with COPY ... FROM STDIN.
+
+        The COPY runs on the session's own connection, so it joins the
+        session transaction and is committed or rolled back with it.
+        Missing values are written as empty unquoted fields, which the
+        CSV format of COPY loads as NULL.
+
+        Args:
+            df: DataFrame whose columns match the target table columns.
+            table_name: The name of the table to load into.
+            session: The database session to run the COPY in.
+        """
+        columns = ", ".join(df.columns)
+        copy_sql = f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv)"
+        cursor = session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(copy_sql, _CsvFrameReader(df))
+        finally:
+            cursor.close()
+        logging.info(f"Copied {len(df)} rows into {table_name}")
+
+    def _upsert_dataframe(self, df, table_name, session):
+        """
+        Merge a DataFrame into a table through a temporary staging table.
+
+        The rows are bulk loaded with COPY into a session-private staging
+        table and merged with one ``INSERT ... ON CONFLICT (id) DO UPDATE``.
+        Rows whose values did not change are left untouched, and when an id
+        appears more than once the last occurrence wins. Employee merges also
+        move the affected rows between groups of the hires summary table.
+
+        Args:
+            df: DataFrame whose columns match the target table columns.
+            table_name: The name of the table to merge into.
+            session: The database session to run the merge in.
+        """
+        staging_table = f"{table_name}_staging"
+        columns = list(df.columns)
+        column_list = ", ".join(columns)
+        updated = [column for column in columns if column != 'id']
+
+        session.execute(text(f"""
+            CREATE TEMPORARY TABLE IF NOT EXISTS {staging_table}
+                (LIKE {table_name} INCLUDING DEFAULTS, staging_row BIGSERIAL)
+                ON COMMIT DROP
+        """))
+        session.execute(text(f"TRUNCATE {staging_table}"))
+        self._copy_dataframe(df, staging_table, session)
+
+        maintains_hires = table_name == Employee.__tablename__
+        if maintains_hires:
+            self._record_staged_hires(staging_table, session, -1)
+
+        if maintains_hires and self.employees_partitioned:
+            self._replace_staged_rows(staging_table, table_name, columns, session)
+            self._record_staged_hires(staging_table, session, 1)
+            return
+
+        result = session.execute(text(f"""
+            INSERT INTO {table_name} ({column_list})
+            SELECT DISTINCT ON (id) {column_list}
+            FROM {staging_table}
+            ORDER BY id, staging_row DESC
+            ON CONFLICT (id) DO UPDATE SET
+                {", ".join(f"{column} = EXCLUDED.{column}" for column in updated)}
+            WHERE
+                ({", ".join(f"{table_name}.{column}" for column in updated)})
+                IS DISTINCT FROM
+                ({", ".join(f"EXCLUDED.{column}" for column in updated)})
+        """))
+        logging.info(f"Upserted {result.rowcount} changed rows into {table_name}")
+
+        if maintains_hires:
+            self._record_staged_hires(staging_table, session, 1)
+
+    def _replace_staged_rows(self, staging_table, table_name, columns, session):
+        """
+        Merge staged rows into a partitioned table by deleting and reinserting their ids.
+
+        A partitioned employees table has no unique index on ``id`` for
+        ``ON CONFLICT``, and a changed hire date may move a row to another
+        partition, so the stored rows are deleted and the last staged
+        occurrence of each id is inserted.
+        """
+        column_list = ", ".join(columns)
+        deleted = session.execute(text(f"""
+            DELETE FROM {table_name} t USING (SELECT DISTINCT id FROM {staging_table}) s
+            WHERE t.id = s.id
+        """))
+        inserted = session.execute(text(f"""
+            INSERT INTO {table_name} ({column_list})
+            SELECT DISTINCT ON (id) {column_list}
+            FROM {staging_table}
+            ORDER BY id, staging_row DESC
+        """))
+        logging.info(
+            f"Replaced {deleted.rowcount} and inserted "
+            f"{inserted.rowcount - deleted.rowcount} rows in {table_name}"
+        )
 
     def _prepare_employee_dataframe(self, df):
-        """Helper method to prepare the employee DataFrame."""
+        """
+        Helper method to prepare the employee DataFrame for ``bulk_insert_mappings``.
+
+        Ids are cast to nullable integers, which ``to_dict`` already turns
+        into None when missing, so only the datetime column needs its NaT
+        values replaced instead of copying the whole frame to objects.
+        """
         try:
-            df['datetime'] = pd.to_datetime(df['datetime'], utc=True, errors='coerce')
+            df['datetime'] = parse_datetimes(df['datetime'])
         except Exception as e:
             logging.error(f"Initial date parsing failed: {e}")
 
-        df = df.replace({pd.NaT: None, np.NaN: None})
+        for column in ('id', 'department_id', 'job_id'):
+            df[column] = df[column].astype('Int64')
+        df['datetime'] = df['datetime'].astype(object).where(df['datetime'].notna(), None)
         return df
 
 client = PostgresClient()
-client.init_db()
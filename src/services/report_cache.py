@@ -0,0 +1,111 @@
+from collections import OrderedDict
+import threading
+import uuid
+
+
+class ReportCache:
+    """
+    ReportCache keeps recent report results in memory until the data changes.
+
+    Entries are keyed by report name and parameters and evicted in LRU order
+    once ``max_entries`` is reached. Every ingestion commit bumps the data
+    version, which empties the cache and changes the ETag of every report.
+    """
+
+    def __init__(self, max_entries=128):
+        """Initialize an empty cache holding at most ``max_entries`` results."""
+        self.max_entries = max_entries
+        self.version = 0
+        self._instance = uuid.uuid4().hex[:12]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, name, params):
+        """Return the cached result of a report, or None on a miss."""
+        with self._lock:
+            key = (name, tuple(sorted(params.items())))
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def get_or_compute(self, name, params, compute):
+        """
+        Return the cached result of a report, computing and storing it on a miss.
+
+        A result computed while an ingestion committed is returned but not
+        stored, since it may predate the new data.
+
+        Args:
+            name: The report name.
+            params: Dictionary of report parameters.
+            compute: Callable producing the result when it is not cached.
+        """
+        with self._lock:
+            version = self.version
+            key = (name, tuple(sorted(params.items())))
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        result = compute()
+
+        with self._lock:
+            if self.version == version and self.max_entries > 0:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self):
+        """Bump the data version and drop every cached result."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def set_version(self, version, token=None):
+        """
+        Adopt a data version shared with other processes, dropping every cached
+        result if it changed.
+
+        Args:
+            version: The data version read from the database.
+            token: Optional token identifying the version counter, replacing
+                the per-process token in ETags so every process hands out
+                the same tags for the same data.
+        """
+        with self._lock:
+            if token is not None:
+                self._instance = token
+            if version != self.version:
+                self.version = version
+                self._entries.clear()
+
+    def etag(self, name, params):
+        """
+        Return the ETag of a report for the current data version.
+
+        The tag includes a per-process token so tags handed out before a
+        restart never match data loaded after it.
+
+        Args:
+            name: The report name.
+            params: Dictionary of report parameters.
+        """
+        encoded = "-".join(f"{key}={value}" for key, value in sorted(params.items()))
+        return f'"{name}-{encoded}-{self._instance}-{self.version}"'
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Check whether an If-None-Match header value matches an ETag.
+
+    Args:
+        if_none_match: The raw header value, or None when absent.
+        etag: The current ETag of the resource.
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
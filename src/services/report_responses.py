@@ -0,0 +1,24 @@
+import orjson
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request):
+    """Return True if the request's Accept header asks for newline-delimited JSON."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(rows, headers=None):
+    """
+    Stream rows as newline-delimited JSON, encoding each one with orjson as it is produced.
+
+    Args:
+        rows: Iterable of JSON-serializable rows, typically from ``client.iter_report``.
+        headers: Optional extra response headers.
+    """
+    return StreamingResponse(
+        (orjson.dumps(row) + b"\n" for row in rows),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers,
+    )
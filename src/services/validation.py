@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import DateTime, Integer
+from src.models.department import Department
+from src.models.employee import Employee
+from src.models.job import Job
+from src.models.reject_reason import RejectReason
+from src.models.tables import TableName
+from src.services.file_formats import parse_datetimes
+
+INT32_MAX = 2**31 - 1
+
+TABLE_MODELS = {
+    TableName.DEPARTMENT: Department,
+    TableName.JOB: Job,
+    TableName.EMPLOYEE: Employee,
+}
+
+REFERENCE_REASONS = {
+    'department_id': RejectReason.UNKNOWN_DEPARTMENT,
+    'job_id': RejectReason.UNKNOWN_JOB,
+}
+
+
+def validate_frame(df, table, reference_ids=None, loaded_ids=None, first_row=1):
+    """
+    Split a parsed DataFrame chunk into loadable rows and rejected rows.
+
+    Every check runs on whole columns. The types and nullability come from
+    the table model: integer columns must hold whole int4 values, datetime
+    columns must parse, and non-nullable columns must be present. Ids must
+    be unique within the chunk and not loaded yet, and foreign keys must be
+    in the preloaded id sets. A row failing several checks is rejected with
+    the reason of the first one.
+
+    Args:
+        df: The parsed chunk, with the table's columns.
+        table: The name of the table the chunk is loaded into.
+        reference_ids: Optional mapping of foreign-key column to the ids it may hold.
+        loaded_ids: Optional callable receiving an array of ids and returning
+            those already in the table. Duplicate ids are only checked when
+            given, so upserts can repeat ids.
+        first_row: The 1-based position of the chunk's first row in the file.
+
+    Returns:
+        tuple: The valid rows, with integer columns as nullable Int64 and
+        datetimes parsed, and the rejected rows with their raw values plus
+        ``row_number`` and ``reason`` columns.
+    """
+    table = TableName(table)
+    model_columns = TABLE_MODELS[table].__table__.columns
+    reasons = pd.Series(None, index=df.index, dtype=object)
+
+    def reject(mask, reason):
+        reasons[mask & reasons.isna()] = reason.value
+
+    valid = pd.DataFrame(index=df.index)
+    for column in table.columns:
+        values = df[column]
+        missing = values.isna()
+        if not model_columns[column].nullable:
+            reject(missing, RejectReason.MISSING_VALUE)
+
+        column_type = model_columns[column].type
+        if isinstance(column_type, Integer):
+            numbers = pd.to_numeric(values, errors='coerce').astype('float64')
+            invalid = ~missing & (
+                numbers.isna() | (numbers % 1 != 0) | (numbers.abs() > INT32_MAX)
+            )
+            reject(invalid, RejectReason.INVALID_INTEGER)
+            valid[column] = numbers.where(~invalid).astype('Int64')
+        elif isinstance(column_type, DateTime):
+            parsed = parse_datetimes(values)
+            if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+                parsed = parsed.dt.tz_convert('UTC').dt.tz_localize(None)
+            reject(~missing & parsed.isna(), RejectReason.INVALID_DATETIME)
+            valid[column] = parsed
+        else:
+            valid[column] = values
+
+    if loaded_ids is not None:
+        pending = reasons.isna()
+        ids = valid.loc[pending, 'id']
+        duplicated = ids.duplicated(keep='first')
+        already_loaded = ids.isin(loaded_ids(ids.dropna().unique().astype('int64')))
+        reject((duplicated | already_loaded).reindex(df.index, fill_value=False),
+               RejectReason.DUPLICATE_ID)
+
+    for column, reason in REFERENCE_REASONS.items():
+        if reference_ids and column in reference_ids:
+            values = valid[column]
+            reject(values.notna() & ~values.isin(reference_ids[column]), reason)
+
+    accepted = reasons.isna()
+    rejected = df.loc[~accepted, table.columns].copy()
+    rejected['row_number'] = (np.arange(len(df)) + first_row)[~accepted.to_numpy()]
+    rejected['reason'] = reasons[~accepted]
+    return valid[accepted], rejected
+
+
+def rejected_records(rejected, table, upload_id):
+    """
+    Build the quarantine table rows for the rejected rows of a chunk.
+
+    Args:
+        rejected: Rejected rows as returned by ``validate_frame``.
+        table: The name of the table the rows were meant for.
+        upload_id: The ID shared by every rejected row of one upload.
+
+    Returns:
+        list: One dictionary per rejected row, keeping its raw values as strings.
+        Whole numbers that the CSV parser read as floats, because their column
+        has blanks, are written without a fractional part.
+    """
+    columns = TableName(table).columns
+    raw = rejected[columns].copy()
+    for column in raw.columns:
+        values = raw[column]
+        if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+            raw[column] = values.astype('Int64')
+    raw = raw.astype('string').astype(object)
+    raw = raw.where(raw.notna(), None)
+    return [
+        {
+            "upload_id": upload_id,
+            "table_name": TableName(table).value,
+            "row_number": int(row_number),
+            "reason": reason,
+            "record": record,
+        }
+        for row_number, reason, record in zip(
+            rejected['row_number'], rejected['reason'], raw.to_dict(orient='records')
+        )
+    ]
@@ -0,0 +1,27 @@
+import pytest
+from benchmarks import generate as generate_module
+from benchmarks.generate import generate, parse_rows
+
+
+@pytest.mark.parametrize("value, expected", [("10k", 10_000), ("1m", 1_000_000), ("2500", 2500)])
+def test_parse_rows(value, expected):
+    """Test that row counts are read from the named scales or as integers."""
+    assert parse_rows(value) == expected
+
+
+def test_same_seed_writes_identical_files(tmp_path, monkeypatch):
+    """Test that a seed always gives byte-identical files and another seed does not."""
+    monkeypatch.setattr(generate_module, "WRITE_CHUNK_ROWS", 1000)
+    first = generate(tmp_path / "first", 2500, seed=7)
+    again = generate(tmp_path / "again", 2500, seed=7)
+    other_seed = generate(tmp_path / "other", 2500, seed=8)
+
+    for table in ("department", "job", "employee"):
+        with open(first[table], "rb") as a, open(again[table], "rb") as b:
+            assert a.read() == b.read()
+    with open(first["employee"], "rb") as a, open(other_seed["employee"], "rb") as b:
+        assert a.read() != b.read()
+    with open(first["employee"]) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 2500
+    assert lines[0].startswith("1,") and lines[-1].startswith("2500,")
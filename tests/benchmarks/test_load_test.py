@@ -0,0 +1,36 @@
+import pytest
+from benchmarks.load_test import percentile, summarize
+
+
+@pytest.mark.parametrize(
+    "fraction, expected", [(0.5, 5), (0.95, 10), (0.99, 10), (0.1, 1), (0.0, 1)]
+)
+def test_percentile_is_nearest_rank(fraction, expected):
+    """Test that percentiles are taken by nearest rank, whatever the input order."""
+    assert percentile([3, 1, 10, 2, 9, 4, 8, 5, 7, 6], fraction) == expected
+
+
+def test_percentile_of_no_values():
+    """Test that an empty list has no percentile."""
+    assert percentile([], 0.5) is None
+
+
+def test_summarize_per_kind():
+    """Test that samples are aggregated per request kind with their error rate and throughput."""
+    samples = [("report", 0.1, True), ("report", 0.3, False), ("report", 0.2, True),
+               ("upload", 2.0, True)]
+
+    summary = summarize(samples, elapsed=2.0)
+
+    assert list(summary) == ["report", "upload"]
+    assert summary["report"] == {
+        "requests": 3,
+        "errors": 1,
+        "error_rate": 0.3333,
+        "requests_per_second": 1.5,
+        "p50_seconds": 0.2,
+        "p95_seconds": 0.3,
+        "p99_seconds": 0.3,
+        "max_seconds": 0.3,
+    }
+    assert summary["upload"]["errors"] == 0
@@ -0,0 +1,37 @@
+from benchmarks.run import REGRESSION_RATIO, compare
+
+
+def _results(ingestion_seconds, report_p50):
+    """Helper function to build benchmark results with one ingestion and one report case."""
+    return {"scales": [{
+        "rows": 10_000,
+        "ingestion": [
+            {"case": name, "seconds": seconds} for name, seconds in ingestion_seconds.items()
+        ],
+        "reports": [
+            {"case": name, "p50_seconds": seconds} for name, seconds in report_p50.items()
+        ],
+    }]}
+
+
+def test_compare_flags_only_regressions():
+    """Test that only cases slower than the regression ratio are flagged."""
+    baseline = _results({"upload": 1.0, "batch_insert": 1.0}, {"employees_per_quarter": 0.01})
+    results = _results(
+        {"upload": REGRESSION_RATIO + 0.05, "batch_insert": REGRESSION_RATIO},
+        {"employees_per_quarter": 0.005},
+    )
+
+    lines = compare(results, baseline)
+
+    flagged = [line for line in lines if line.endswith("REGRESSION")]
+    assert len(lines) == 3
+    assert len(flagged) == 1 and "upload" in flagged[0]
+
+
+def test_compare_skips_cases_missing_from_baseline():
+    """Test that cases new in this run, or without a baseline timing, are not compared."""
+    baseline = _results({"upload": 0}, {})
+    results = _results({"upload": 5.0, "upload_upsert": 5.0}, {"departments_above_average": 1.0})
+
+    assert compare(results, baseline) == []
@@ -1,3 +1,5 @@
+from datetime import datetime
+import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient, ASGITransport
@@ -42,6 +44,9 @@ async def test_batch_insert_employee(client: TestClient, mock_db_client):
 
     assert response.status_code == 200
     assert response.json() == {"success": True, "rows_inserted": 2}
+    rows = mock_db_client.call_args.kwargs["rows"]
+    assert isinstance(rows, pd.DataFrame)
+    assert rows["name"].tolist() == ["Juan Pérez", "María Gómez"]
 
 
 @pytest.mark.asyncio
@@ -94,3 +99,205 @@ async def test_batch_insert_department(client: TestClient, mock_db_client):
 
     assert response.status_code == 200
     assert response.json() == {"success": True, "rows_inserted": 2}
+
+
+@pytest.mark.asyncio
+async def test_batch_insert_chunked(client: TestClient, mock_db_client):
+    """Test batch inserting a CSV file in chunks reports rows per chunk."""
+    data = "1,Desarrollador\n" "2,Analista\n" "3,Gerente\n"
+    files = {"file": ("test.csv", data, "text/csv")}
+    mock_db_client.side_effect = lambda rows, table, mode, **kwargs: {
+        "status": "success", "rows_inserted": len(rows)
+    }
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/batch_insert/",
+            files=files,
+            params={"table": TableName.JOB.value, "chunksize": 2},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "rows_inserted": 3, "chunks": [2, 1]}
+    assert mock_db_client.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_insert_chunked_validate(client: TestClient, mock_db_client):
+    """Test that validated chunks share an upload ID and their rejections are summed."""
+    data = "1,Desarrollador\n" "2,\n" "3,\n"
+    files = {"file": ("test.csv", data, "text/csv")}
+    mock_db_client.side_effect = lambda rows, table, mode, **kwargs: {
+        "status": "success",
+        "rows_inserted": len(rows) - 1 if kwargs["first_row"] == 1 else 0,
+        "upload_id": kwargs["upload_id"] or "abc",
+        "rejected": {"missing_value": 1},
+    }
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/batch_insert/",
+            files=files,
+            params={"table": TableName.JOB.value, "chunksize": 2, "validate": True},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "success",
+        "rows_inserted": 1,
+        "chunks": [1, 0],
+        "upload_id": "abc",
+        "rejected": {"missing_value": 2},
+    }
+    assert [call.kwargs["first_row"] for call in mock_db_client.call_args_list] == [1, 3]
+    assert mock_db_client.call_args.kwargs["upload_id"] == "abc"
+
+
+@pytest.mark.asyncio
+async def test_batch_insert_upsert_mode(client: TestClient, mock_db_client):
+    """Test that the upsert mode is forwarded to the database client."""
+    files = {"file": ("test.csv", "1,Desarrollador\n", "text/csv")}
+    mock_db_client.return_value = {"status": "success", "rows_inserted": 1}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/batch_insert/",
+            files=files,
+            params={"table": TableName.JOB.value, "mode": "upsert"},
+        )
+
+    assert response.status_code == 200
+    assert mock_db_client.call_args.kwargs["mode"] == "upsert"
+
+
+@pytest.fixture
+def mock_row_insert(mocker):
+    """Fixture to mock the JSON row insert of the database client."""
+    return mocker.patch(
+        "src.services.postgres_client.client.handle_row_insert",
+        new_callable=AsyncMock,
+        return_value={"status": "success", "rows_inserted": 2},
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_insert_json_rows(client: TestClient, mock_row_insert, mock_db_client):
+    """Test that a JSON array is validated and appended without the DataFrame path."""
+    rows = [
+        {"id": 1, "name": "Diego", "datetime": "2021-03-31T23:00:00-05:00",
+         "department_id": 1, "job_id": 1},
+        {"id": "2", "datetime": None},
+    ]
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/batch_insert/", json=rows, params={"table": TableName.EMPLOYEE.value}
+        )
+
+    assert response.status_code == 200
+    inserted, table = mock_row_insert.call_args.args
+    assert table == "employee"
+    assert inserted == [
+        {"id": 1, "name": "Diego", "datetime": datetime(2021, 4, 1, 4, 0),
+         "department_id": 1, "job_id": 1},
+        {"id": 2, "name": None, "datetime": None, "department_id": None, "job_id": None},
+    ]
+    mock_db_client.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_insert_ndjson_rows_chunked(client: TestClient, mock_row_insert):
+    """Test that NDJSON rows are read one per line and inserted in chunks."""
+    body = b'{"id": 1, "job": "Dev"}\n{"id": 2, "job": "Ops"}\n\n{"id": 3, "job": "QA"}\n'
+    mock_row_insert.side_effect = [
+        {"status": "success", "rows_inserted": 2}, {"status": "success", "rows_inserted": 1}
+    ]
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/batch_insert/",
+            content=body,
+            headers={"content-type": "application/x-ndjson"},
+            params={"table": TableName.JOB.value, "chunksize": 2},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "rows_inserted": 3, "chunks": [2, 1]}
+    assert [len(call.args[0]) for call in mock_row_insert.call_args_list] == [2, 1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body, status",
+    [(b'[{"id": "x", "job": "Dev"}]', 422), (b'[{"id": 1}]', 422),
+     (b'[{"id": 1, "job": "Dev", "extra": 1}]', 422), (b'{"id": 1}', 400), (b'[{', 400)],
+)
+async def test_batch_insert_invalid_json_rows(client: TestClient, mock_row_insert, body, status):
+    """Test that malformed bodies are rejected before reaching the database."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/batch_insert/",
+            content=body,
+            headers={"content-type": "application/json"},
+            params={"table": TableName.JOB.value},
+        )
+
+    assert response.status_code == status
+    mock_row_insert.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_insert_json_validate_uses_ingestion_path(
+    client: TestClient, mock_row_insert, mock_db_client
+):
+    """Test that JSON rows to quarantine go through the validation stage with every column."""
+    mock_db_client.return_value = {
+        "status": "success", "rows_inserted": 0, "upload_id": "abc", "rejected": {"missing_id": 1}
+    }
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/batch_insert/",
+            json=[{"job": "Dev"}],
+            params={"table": TableName.JOB.value, "validate": "true"},
+        )
+
+    assert response.status_code == 200
+    assert mock_db_client.call_args.kwargs["rows"] == [{"id": None, "job": "Dev"}]
+    assert mock_db_client.call_args.kwargs["validate"] is True
+    mock_row_insert.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_insert_streamed_body_too_large(client: TestClient, mock_row_insert, mocker):
+    """Test that a body without Content-Length is cut off once it exceeds the size limit."""
+    mocker.patch("src.services.admission.admission.max_body_bytes", 64)
+
+    async def body():
+        for _ in range(10):
+            yield b'{"id": 1, "job": "Engineer"}\n'
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/batch_insert/", content=body(), params={"table": "job"},
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+    assert response.status_code == 413
+    mock_row_insert.assert_not_called()
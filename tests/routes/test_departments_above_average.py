@@ -40,3 +40,51 @@ async def test_departments_above_average(client: TestClient, mock_db_client):
         {"department": "Recursos Humanos", "performance": 85},
         {"department": "Tecnología", "performance": 90},
     ]
+
+
+@pytest.mark.asyncio
+async def test_departments_above_average_for_year(client: TestClient, mock_db_client):
+    """Test that the requested hire year is forwarded to the database client."""
+    mock_db_client.return_value = {"data": []}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get("/departments_above_average/", params={"year": 2022})
+
+    assert response.status_code == 200
+    mock_db_client.assert_awaited_once_with(year=2022, comparison="mean", top_n=5)
+
+
+@pytest.mark.asyncio
+async def test_departments_above_average_top_n(client: TestClient, mock_db_client):
+    """Test that the comparison and top-N options are forwarded to the database client."""
+    mock_db_client.return_value = {"data": []}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get(
+            "/departments_above_average/", params={"comparison": "top", "top_n": 3}
+        )
+
+    assert response.status_code == 200
+    mock_db_client.assert_awaited_once_with(year=2021, comparison="top", top_n=3)
+
+
+@pytest.mark.asyncio
+async def test_departments_above_average_not_modified(client: TestClient, mock_db_client):
+    """Test that a matching If-None-Match is answered with 304 without querying."""
+    mock_db_client.return_value = {"data": []}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        first = await ac.get("/departments_above_average/")
+        second = await ac.get(
+            "/departments_above_average/", headers={"If-None-Match": first.headers["ETag"]}
+        )
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    mock_db_client.assert_awaited_once()
@@ -44,3 +44,62 @@ async def test_employees_per_quarter(client: TestClient, mock_db_client):
         {"quarter": "Q3", "employees": 100},
         {"quarter": "Q4", "employees": 130},
     ]
+
+
+@pytest.mark.asyncio
+async def test_employees_per_quarter_for_year(client: TestClient, mock_db_client):
+    """Test that the requested hire year is forwarded to the database client."""
+    mock_db_client.return_value = {"data": []}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get("/employees_per_quarter/", params={"year": 2022})
+
+    assert response.status_code == 200
+    mock_db_client.assert_awaited_once_with(year=2022)
+
+
+@pytest.mark.asyncio
+async def test_employees_per_quarter_not_modified(client: TestClient, mock_db_client):
+    """Test that a matching If-None-Match is answered with 304 without querying."""
+    mock_db_client.return_value = {"data": []}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        first = await ac.get("/employees_per_quarter/")
+        second = await ac.get(
+            "/employees_per_quarter/", headers={"If-None-Match": first.headers["ETag"]}
+        )
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["ETag"] == first.headers["ETag"]
+    mock_db_client.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_employees_per_quarter_ndjson(client: TestClient, mocker):
+    """Test that rows are streamed as NDJSON when the client asks for it."""
+    mocker.patch(
+        "src.services.postgres_client.client.iter_report",
+        return_value=iter([
+            {"department": "IT", "job": "Developer", "Q1": 1, "Q2": 0, "Q3": 0, "Q4": 2},
+            {"department": "HR", "job": "Analyst", "Q1": 0, "Q2": 1, "Q3": 0, "Q4": 0},
+        ]),
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get(
+            "/employees_per_quarter/", headers={"Accept": "application/x-ndjson"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text.splitlines() == [
+        '{"department":"IT","job":"Developer","Q1":1,"Q2":0,"Q3":0,"Q4":2}',
+        '{"department":"HR","job":"Analyst","Q1":0,"Q2":1,"Q3":0,"Q4":0}',
+    ]
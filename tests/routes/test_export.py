@@ -0,0 +1,67 @@
+import pytest
+import pyarrow as pa
+from fastapi.testclient import TestClient
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Fixture to create a TestClient instance for testing FastAPI endpoints."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def mock_db_client(mocker):
+    """Fixture to mock the database client for testing purposes."""
+    mock = mocker.patch("src.services.postgres_client.client.export_batches")
+    return mock
+
+
+@pytest.mark.asyncio
+async def test_export_departments_arrow(client: TestClient, mock_db_client):
+    """Test exporting the departments table as an Arrow IPC stream."""
+    mock_db_client.return_value = (["id", "department"], iter([[(1, "Finance"), (2, "IT")]]))
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get("/export/departments")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.to_pylist() == [{"id": 1, "department": "Finance"}, {"id": 2, "department": "IT"}]
+    mock_db_client.assert_called_once_with("departments")
+
+
+@pytest.mark.asyncio
+async def test_export_report_parquet(client: TestClient, mock_db_client):
+    """Test exporting a report as Parquet forwards the report parameters."""
+    mock_db_client.return_value = (["id", "department", "hired"], iter([]))
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get(
+            "/export/departments_above_average",
+            params={"format": "parquet", "year": 2022, "comparison": "top", "top_n": 2},
+        )
+
+    assert response.status_code == 200
+    assert response.content.startswith(b"PAR1")
+    mock_db_client.assert_called_once_with(
+        "departments_above_average", year=2022, comparison="top", top_n=2
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_unknown_dataset(client: TestClient, mock_db_client):
+    """Test that unknown datasets are rejected."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get("/export/salaries")
+
+    assert response.status_code == 422
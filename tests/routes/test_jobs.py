@@ -0,0 +1,47 @@
+import pytest
+from fastapi.testclient import TestClient
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from unittest.mock import MagicMock
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Fixture to create a TestClient instance for testing FastAPI endpoints."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def mock_job():
+    """Fixture to provide a job as returned by the job manager."""
+    job = MagicMock()
+    job.to_dict.return_value = {"job_id": "abc", "state": "queued", "rows_processed": 0}
+    return job
+
+
+@pytest.mark.asyncio
+async def test_get_job(client: TestClient, mocker, mock_job):
+    """Test retrieving the status of a known job."""
+    mocker.patch("src.services.job_manager.jobs.get", return_value=mock_job)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get("/jobs/abc")
+
+    assert response.status_code == 200
+    assert response.json() == {"job_id": "abc", "state": "queued", "rows_processed": 0}
+
+
+@pytest.mark.asyncio
+async def test_get_unknown_job(client: TestClient, mocker):
+    """Test that an unknown job ID returns 404."""
+    mocker.patch("src.services.job_manager.jobs.get", return_value=None)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get("/jobs/missing")
+
+    assert response.status_code == 404
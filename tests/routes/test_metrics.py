@@ -0,0 +1,51 @@
+import pytest
+from fastapi.testclient import TestClient
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from unittest.mock import AsyncMock
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Fixture to create a TestClient instance for testing FastAPI endpoints."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_metrics_records_requests_per_endpoint_and_table(client: TestClient, mocker):
+    """Test that served requests show up at /metrics labelled by endpoint and table."""
+    mocker.patch(
+        "src.services.postgres_client.client.handle_upload",
+        new_callable=AsyncMock,
+        return_value={"filename": "test.csv"},
+    )
+    files = {"file": ("test.csv", "1,Engineering\n", "text/csv")}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        await ac.post("/upload_csv/", files=files, params={"table": "department"})
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_duration_seconds_count{endpoint="upload_csv",'
+        'method="POST",status="200",table="department"}'
+    ) in response.text
+    assert 'http_request_size_bytes_count{endpoint="upload_csv",table="department"}' in response.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_aggregates_worker_files(client: TestClient, tmp_path, monkeypatch):
+    """Test that /metrics reads the per-worker files when PROMETHEUS_MULTIPROC_DIR is set."""
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert "http_request_duration_seconds" not in response.text
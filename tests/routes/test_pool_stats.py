@@ -0,0 +1,35 @@
+import pytest
+from fastapi.testclient import TestClient
+from httpx import AsyncClient, ASGITransport
+from src.main import app
+from src.services.postgres_client import client as db_client
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Fixture to create a TestClient instance for testing FastAPI endpoints."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(client: TestClient, mocker):
+    """Test that the pool usage reported by the database client is returned."""
+    stats = {"pool_size": 10, "checked_out": 2, "overflow": 0, "wait_seconds_max": 0.01}
+    mocker.patch("src.services.postgres_client.client.pool_stats", return_value=stats)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.get("/pool_stats/")
+
+    assert response.status_code == 200
+    assert response.json() == stats
+
+
+def test_lifespan_warms_pool(client: TestClient):
+    """Test that startup opened the pool's connections and left them idle."""
+    stats = db_client.pool_stats()
+
+    assert stats["checked_in"] >= db_client.pool_size
+    assert stats["checked_out"] == 0
@@ -1,7 +1,8 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 from io import BytesIO
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from httpx import AsyncClient, ASGITransport
 from src.main import app
 from src.models.tables import TableName
@@ -126,3 +127,121 @@ async def test_upload_csv_department(client: TestClient, mock_db_client):
 
     assert response.status_code == 200
     assert response.json() == {"success": True, "message": "File uploaded successfully"}
+
+
+@pytest.mark.asyncio
+async def test_upload_csv_chunked(client: TestClient, mock_db_client):
+    """Test that the chunk size is forwarded to the database client."""
+    upload_file = create_upload_file("1,Desarrollador\n2,Analista\n")
+    mock_db_client.return_value = {"filename": "test.csv", "rows_inserted": 2, "chunks": [2]}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/upload_csv/",
+            files={"file": upload_file},
+            params={"table": TableName.JOB.value, "chunksize": 1000},
+        )
+
+    assert response.status_code == 200
+    assert mock_db_client.call_args.kwargs == {
+        "chunksize": 1000, "mode": "append", "validate": False
+    }
+
+
+@pytest.mark.asyncio
+async def test_upload_csv_background(client: TestClient, mocker):
+    """Test that a background upload is queued and answered with 202."""
+    mock_job = MagicMock()
+    mock_job.to_dict.return_value = {"job_id": "abc", "state": "queued", "rows_processed": 0}
+    submit = mocker.patch(
+        "src.services.job_manager.jobs.submit", new_callable=AsyncMock, return_value=mock_job
+    )
+    files = {"file": ("test.csv", "1,Desarrollador\n", "text/csv")}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/upload_csv/",
+            files=files,
+            params={"table": TableName.JOB.value, "background": True},
+        )
+
+    assert response.status_code == 202
+    assert response.json()["job_id"] == "abc"
+    submit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_upload_csv_too_large(client: TestClient, mock_db_client, mocker):
+    """Test that an upload above the size limit is rejected before it is read."""
+    mocker.patch("src.services.admission.admission.max_body_bytes", 100)
+    files = {"file": create_upload_file("1,Engineer\n" * 20)}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post("/upload_csv/", files=files, params={"table": "job"})
+
+    assert response.status_code == 413
+    mock_db_client.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upload_csv_saturated_table(client: TestClient, mock_db_client, mocker):
+    """Test that an upload into a table with no free slot or queue place gets a 429."""
+    mocker.patch("src.services.admission.admission.max_concurrent", 0)
+    mocker.patch("src.services.admission.admission.max_queued", 0)
+    files = {"file": create_upload_file("1,Engineer\n")}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post("/upload_csv/", files=files, params={"table": "job"})
+        other = await ac.post(
+            "/upload_csv/", files={"file": create_upload_file("1,Sales\n")},
+            params={"table": "invalid_table"}
+        )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "5"
+    assert other.status_code == 422
+    mock_db_client.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upload_csv_job_queue_full(client: TestClient, mocker):
+    """Test that a background upload gets a 429 while the job queue is full."""
+    mock_submit = mocker.patch("src.routes.upload_csv.jobs.submit", new_callable=AsyncMock)
+    mocker.patch("src.services.admission.jobs.is_full", return_value=True)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/upload_csv/", files={"file": create_upload_file("1,Engineer\n")},
+            params={"table": "job", "background": "true"}
+        )
+
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+    mock_submit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upload_csv_no_ingestion_connection(client: TestClient, mock_db_client):
+    """Test that an upload finding no ingestion connection gets a 503."""
+    mock_db_client.side_effect = PoolTimeoutError("No connection available for ingestion")
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        response = await ac.post(
+            "/upload_csv/", files={"file": create_upload_file("1,Engineer\n")},
+            params={"table": "job"}
+        )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from src.services.admission import AdmissionController, AdmissionRejected
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    """Fixture to provide an AdmissionController running one ingestion per table."""
+    monkeypatch.setenv("INGEST_MAX_CONCURRENT_PER_TABLE", "1")
+    monkeypatch.setenv("INGEST_MAX_QUEUED_PER_TABLE", "1")
+    monkeypatch.setenv("INGEST_QUEUE_TIMEOUT", "0.05")
+    return AdmissionController()
+
+
+@pytest.mark.asyncio
+async def test_queued_request_gets_the_released_slot(controller):
+    """Test that a finished ingestion hands its slot to the waiting request."""
+    await controller.acquire("employee")
+    waiting = asyncio.create_task(controller.acquire("employee"))
+    await asyncio.sleep(0)
+
+    controller.release("employee")
+    await waiting
+
+    assert controller.active["employee"] == 1
+    assert not controller.waiters["employee"]
+    controller.release("employee")
+    assert controller.active["employee"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_at_once(controller):
+    """Test that a request finding the table's queue full gets a 429."""
+    await controller.acquire("employee")
+    waiting = asyncio.create_task(controller.acquire("employee"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("employee")
+    await controller.acquire("job")
+
+    assert rejected.value.status == 429
+    controller.release("employee")
+    await waiting
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_gives_up_the_place(controller):
+    """Test that a request waiting past the queue timeout gets a 503 and leaves the queue."""
+    await controller.acquire("department")
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("department")
+
+    assert rejected.value.status == 503
+    assert not controller.waiters["department"]
+    controller.release("department")
+    assert controller.active["department"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_its_slot(controller):
+    """Test that a request cancelled while queued releases nothing it did not hold."""
+    await controller.acquire("job")
+    waiting = asyncio.create_task(controller.acquire("job"))
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    controller.release("job")
+
+    assert controller.active["job"] == 0
+    assert not controller.waiters["job"]
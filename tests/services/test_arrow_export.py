@@ -0,0 +1,46 @@
+from datetime import datetime
+from io import BytesIO
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.services.arrow_export import iter_export
+
+COLUMNS = ["id", "name", "datetime", "department_id", "job_id"]
+BATCHES = [
+    [(1, "Diego", datetime(2021, 1, 1, 10, 0), 1, 1)],
+    [(2, "Ana", None, None, 2), (3, "Luis", datetime(2021, 7, 1), 2, None)],
+]
+
+
+def test_iter_export_arrow_stream():
+    """Test that employees are exported as a typed Arrow IPC stream, one chunk per batch."""
+    chunks = list(iter_export("employees", "arrow", COLUMNS, iter(BATCHES)))
+    table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+
+    assert len(chunks) >= len(BATCHES)
+    assert table.schema.field("id").type == pa.int32()
+    assert table.schema.field("datetime").type == pa.timestamp("us")
+    assert table.column("name").to_pylist() == ["Diego", "Ana", "Luis"]
+    assert table.column("department_id").to_pylist() == [1, None, 2]
+
+
+def test_iter_export_parquet():
+    """Test that a report is exported as Parquet with integer quarter counts."""
+    columns = ["department", "job", "Q1", "Q2", "Q3", "Q4"]
+    batches = [[("IT", "Developer", 0, 1, 3, 1)]]
+
+    data = b"".join(iter_export("employees_per_quarter", "parquet", columns, iter(batches)))
+    table = pq.read_table(BytesIO(data))
+
+    assert table.schema.field("Q3").type == pa.int64()
+    assert table.to_pylist() == [
+        {"department": "IT", "job": "Developer", "Q1": 0, "Q2": 1, "Q3": 3, "Q4": 1}
+    ]
+
+
+def test_iter_export_empty_dataset():
+    """Test that an empty dataset still produces a readable stream with its schema."""
+    data = b"".join(iter_export("jobs", "arrow", ["id", "job"], iter([])))
+    table = pa.ipc.open_stream(data).read_all()
+
+    assert table.num_rows == 0
+    assert table.schema.names == ["id", "job"]
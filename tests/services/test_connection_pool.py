@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from src.services.connection_pool import TimedQueuePool
+
+
+@pytest.fixture
+def pool():
+    """Fixture to provide a one-connection pool over fake DBAPI connections."""
+    return TimedQueuePool(MagicMock, pool_size=1, max_overflow=0, timeout=0.05)
+
+
+def test_stats_track_checked_out_connections(pool):
+    """Test that checked-out and idle connections are reported."""
+    connection = pool.connect()
+    busy = pool.stats()
+    connection.close()
+    idle = pool.stats()
+
+    assert busy["checked_out"] == 1
+    assert idle["checked_out"] == 0
+    assert idle["checked_in"] == 1
+    assert idle["checkouts"] == 1
+
+
+def test_stats_record_wait_and_timeouts(pool):
+    """Test that a checkout waiting on an exhausted pool is timed and counted as a timeout."""
+    connection = pool.connect()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    connection.close()
+    stats = pool.stats()
+
+    assert stats["timeouts"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["wait_seconds_max"] >= 0.05
@@ -0,0 +1,116 @@
+import pandas as pd
+import pytest
+from src.services.analytics import PostgresAnalytics, create_analytics_backend
+from src.services.duckdb_analytics import DuckDBAnalytics
+
+DEPARTMENTS = pd.DataFrame({"id": [1, 2, 3], "department": ["Finance", "IT", "Sales"]})
+JOBS = pd.DataFrame({"id": [1, 2], "job": ["Analyst", "Developer"]})
+EMPLOYEES = pd.DataFrame({
+    "id": [1, 2, 3, 4, 5, 6, 7],
+    "name": ["Ana", "Diego", "Luis", "Sofia", "Mateo", "Emma", "Tomas"],
+    "datetime": [
+        "2021-01-05T10:00:00Z", "2021-02-05T10:00:00Z", "2021-07-05T10:00:00Z",
+        "2021-11-05T10:00:00Z", "2021-03-05T10:00:00Z", "2020-03-05T10:00:00Z", None,
+    ],
+    "department_id": [1, 1, 1, 2, 3, 1, 1],
+    "job_id": [1, 1, 2, 2, 1, 1, 1],
+})
+
+
+@pytest.fixture
+def analytics():
+    """Fixture to provide an in-memory DuckDB mirror loaded with a few hires."""
+    backend = DuckDBAnalytics(threads=1)
+    writer = backend.begin()
+    writer.write("department", DEPARTMENTS)
+    writer.write("job", JOBS)
+    writer.write("employee", EMPLOYEES.copy())
+    writer.commit()
+    return backend
+
+
+def test_employees_per_quarter(analytics):
+    """Test that hires are counted per quarter of the year for each department and job."""
+    assert analytics.employees_per_quarter(2021) == [
+        {"department": "Finance", "job": "Analyst", "Q1": 2, "Q2": 0, "Q3": 0, "Q4": 0},
+        {"department": "Finance", "job": "Developer", "Q1": 0, "Q2": 0, "Q3": 1, "Q4": 0},
+        {"department": "IT", "job": "Developer", "Q1": 0, "Q2": 0, "Q3": 0, "Q4": 1},
+        {"department": "Sales", "job": "Analyst", "Q1": 1, "Q2": 0, "Q3": 0, "Q4": 0},
+    ]
+
+
+@pytest.mark.parametrize(
+    "comparison, top_n, expected",
+    [
+        ("mean", 5, [{"id": 1, "department": "Finance", "hired": 3}]),
+        ("median", 5, [{"id": 1, "department": "Finance", "hired": 3}]),
+        ("top", 1, [{"id": 1, "department": "Finance", "hired": 3}]),
+    ],
+)
+def test_departments_above_average(analytics, comparison, top_n, expected):
+    """Test that departments are compared on their hires in the year."""
+    assert analytics.departments_above_average(2021, comparison, top_n) == expected
+
+
+def test_departments_above_average_invalid_comparison(analytics):
+    """Test that an unknown comparison is rejected."""
+    with pytest.raises(ValueError):
+        analytics.departments_above_average(2021, "mode")
+
+
+def test_upsert_keeps_last_occurrence(analytics):
+    """Test that upserted rows replace the mirrored rows with the same id."""
+    writer = analytics.begin()
+    writer.write("employee", pd.DataFrame({
+        "id": [4, 4],
+        "name": ["Sofia", "Sofia"],
+        "datetime": ["2021-04-01T00:00:00Z", "2021-05-01T00:00:00Z"],
+        "department_id": [3, 1],
+        "job_id": [1, 1],
+    }), mode="upsert")
+    writer.commit()
+
+    rows = analytics.connection.execute(
+        "SELECT department_id, datetime FROM employees WHERE id = 4"
+    ).fetchall()
+    assert rows == [(1, pd.Timestamp("2021-05-01").to_pydatetime())]
+
+
+def test_rollback_discards_staged_rows(analytics):
+    """Test that rows of a failed ingestion never reach the mirror."""
+    writer = analytics.begin()
+    writer.write("job", pd.DataFrame({"id": [3], "job": ["Manager"]}))
+    writer.rollback()
+
+    assert analytics.connection.execute("SELECT COUNT(*) FROM jobs").fetchone() == (2,)
+
+
+def test_sync_replaces_mirror_with_exported_tables(analytics):
+    """Test that a sync reloads every table from the CSV export."""
+    exports = {
+        "departments": b"1,Finance\n",
+        "jobs": b"1,Analyst\n",
+        "employees": b"1,Ana,2021-08-01 09:00:00,1,1\n2,Diego,,1,\n",
+    }
+
+    analytics.sync(lambda table_name, columns, out: out.write(exports[table_name]))
+
+    assert analytics.employees_per_quarter(2021) == [
+        {"department": "Finance", "job": "Analyst", "Q1": 0, "Q2": 0, "Q3": 1, "Q4": 0},
+    ]
+
+
+def test_create_analytics_backend():
+    """Test that backends are selected by name."""
+    assert isinstance(create_analytics_backend("postgres", None), PostgresAnalytics)
+    assert isinstance(create_analytics_backend("duckdb", None), DuckDBAnalytics)
+    with pytest.raises(ValueError):
+        create_analytics_backend("oracle", None)
+
+
+def test_sync_loads_empty_tables(analytics):
+    """Test that a sync of an empty database empties the mirror."""
+    analytics.sync(lambda table_name, columns, out: None)
+
+    assert analytics.employees_per_quarter(2021) == []
+    assert analytics.connection.execute("SELECT COUNT(*) FROM departments").fetchone() == (0,)
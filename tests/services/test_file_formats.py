@@ -0,0 +1,154 @@
+from datetime import datetime
+from io import BytesIO
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from src.services.file_formats import detect_format, iter_frames, parse_datetimes
+
+EMPLOYEES = pa.table({
+    "id": pa.array([1, 2], type=pa.int32()),
+    "name": ["Diego", "Ana"],
+    "datetime": pa.array([datetime(2021, 1, 1, 10, 0), None], type=pa.timestamp("us")),
+    "department_id": pa.array([1, None], type=pa.int32()),
+    "job_id": pa.array([1, 2], type=pa.int32()),
+})
+
+
+def _parquet(table):
+    sink = BytesIO()
+    pq.write_table(table, sink)
+    sink.seek(0)
+    return sink
+
+
+def _arrow_stream(table):
+    sink = BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    sink.seek(0)
+    return sink
+
+
+def _arrow_file(table):
+    sink = BytesIO()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    sink.seek(0)
+    return sink
+
+
+def test_detect_format():
+    """Test that the format is detected from the magic bytes and the stream is rewound."""
+    csv = BytesIO(b"1,Engineering\n")
+
+    assert detect_format(_parquet(EMPLOYEES)) == "parquet"
+    assert detect_format(_arrow_file(EMPLOYEES)) == "arrow"
+    assert detect_format(_arrow_stream(EMPLOYEES)) == "arrow_stream"
+    assert detect_format(csv) == "csv"
+    assert csv.tell() == 0
+
+
+@pytest.mark.parametrize("encode", [_parquet, _arrow_file, _arrow_stream])
+def test_iter_frames_columnar_keeps_types(encode):
+    """Test that columnar uploads keep typed timestamps and nullable integer ids."""
+    df = pd.concat(list(iter_frames(encode(EMPLOYEES), "employee")), ignore_index=True)
+
+    assert list(df.columns) == ["id", "name", "datetime", "department_id", "job_id"]
+    assert pd.api.types.is_datetime64_any_dtype(df["datetime"])
+    assert str(df["department_id"].dtype) == "Int32"
+    assert df["department_id"].isna().tolist() == [False, True]
+
+
+def test_iter_frames_maps_columns_by_position():
+    """Test that columns with other names are mapped onto the table by position."""
+    table = pa.table({"a": [1, 2], "b": ["Engineering", "Sales"]})
+
+    df = next(iter(iter_frames(_parquet(table), "department")))
+
+    assert list(df.columns) == ["id", "department"]
+    assert df["department"].tolist() == ["Engineering", "Sales"]
+
+
+def test_iter_frames_parquet_chunks():
+    """Test that Parquet uploads are read in batches of at most ``chunksize`` rows."""
+    table = pa.table({"id": list(range(5)), "job": [f"job{i}" for i in range(5)]})
+
+    frames = list(iter_frames(_parquet(table), "job", chunksize=2))
+
+    assert [len(frame) for frame in frames] == [2, 2, 1]
+
+
+def test_iter_frames_rejects_mismatched_columns():
+    """Test that a columnar file with an unexpected column count is rejected."""
+    table = pa.table({"a": [1], "b": ["x"], "c": ["y"]})
+
+    with pytest.raises(ValueError):
+        list(iter_frames(_parquet(table), "job"))
+
+
+def test_iter_frames_arrow_stream_chunks():
+    """Test that Arrow IPC batches are regrouped into chunks of ``chunksize`` rows."""
+    table = pa.table({"id": list(range(5)), "job": [f"job{i}" for i in range(5)]})
+
+    frames = list(iter_frames(_arrow_stream(table), "job", chunksize=2))
+
+    assert [frame["id"].tolist() for frame in frames] == [[0, 1], [2, 3], [4]]
+
+
+def test_iter_frames_csv():
+    """Test that headerless CSVs are still parsed with the table column names."""
+    frames = list(iter_frames(BytesIO(b"1,Engineering\n2,Sales\n"), "department"))
+
+    assert len(frames) == 1
+    assert frames[0]["department"].tolist() == ["Engineering", "Sales"]
+
+
+def test_iter_frames_csv_uses_declared_types():
+    """Test that CSV columns get the table profile types and empty fields become NULL."""
+    data = b"1,Diego,2021-01-01T10:00:00Z,1,1\n2,,,,\n"
+
+    df = next(iter(iter_frames(BytesIO(data), "employee")))
+
+    assert str(df["id"].dtype) == "Int32"
+    assert str(df["department_id"].dtype) == "Int32"
+    assert df["datetime"].dt.tz is not None
+    assert df["datetime"].iloc[0] == pd.Timestamp("2021-01-01 10:00:00", tz="UTC")
+    assert df.iloc[1, 1:].isna().all()
+
+
+def test_iter_frames_csv_unparsable_datetime_is_null():
+    """Test that a datetime that is not ISO 8601 is loaded as NULL, as before."""
+    data = b"1,Diego,not a date,1,1\n2,Ana,2021-02-01 08:00:00,1,1\n"
+
+    df = next(iter(iter_frames(BytesIO(data), "employee")))
+
+    assert pd.isna(df["datetime"].iloc[0])
+    assert df["datetime"].iloc[1] == pd.Timestamp("2021-02-01 08:00:00", tz="UTC")
+
+
+def test_iter_frames_csv_chunks():
+    """Test that CSVs are read in chunks of ``chunksize`` rows."""
+    data = b"".join(f"{i},job{i}\n".encode() for i in range(5))
+
+    frames = list(iter_frames(BytesIO(data), "job", chunksize=2))
+
+    assert [len(frame) for frame in frames] == [2, 2, 1]
+
+
+def test_iter_frames_csv_raw_keeps_text():
+    """Test that raw mode leaves every CSV column as text for the validation stage."""
+    df = next(iter(iter_frames(BytesIO(b"x,Engineering\n"), "department", raw=True)))
+
+    assert df["id"].tolist() == ["x"]
+
+
+def test_parse_datetimes():
+    """Test that offsets are honoured, values without one are UTC and invalid ones are NaT."""
+    with_offset = parse_datetimes(pd.Series(["2021-01-01T10:00:00+02:00", None]))
+    without_offset = parse_datetimes(pd.Series(["2021-01-01 10:00:00", "bad"]))
+
+    assert with_offset.iloc[0] == pd.Timestamp("2021-01-01 08:00:00", tz="UTC")
+    assert pd.isna(with_offset.iloc[1])
+    assert without_offset.iloc[0] == pd.Timestamp("2021-01-01 10:00:00", tz="UTC")
+    assert pd.isna(without_offset.iloc[1])
@@ -0,0 +1,44 @@
+from prometheus_client import REGISTRY
+from src.services.metrics import record_ingestion, stage_timer, timed_iter
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_stage_timer_observes_duration():
+    """Test that a timed block is recorded under its operation, table and stage."""
+    labels = {"operation": "upload", "table": "job", "stage": "commit"}
+    before = _sample("ingest_stage_duration_seconds_count", **labels)
+
+    with stage_timer("upload", "job", "commit"):
+        pass
+
+    assert _sample("ingest_stage_duration_seconds_count", **labels) == before + 1
+
+
+def test_timed_iter_times_each_step():
+    """Test that every chunk fetched from a lazy reader, and the final empty fetch, is timed."""
+    labels = {"operation": "batch_insert", "table": "department", "stage": "parse"}
+    before = _sample("ingest_stage_duration_seconds_count", **labels)
+
+    items = list(timed_iter(iter([1, 2]), "batch_insert", "department", "parse"))
+
+    assert items == [1, 2]
+    assert _sample("ingest_stage_duration_seconds_count", **labels) == before + 3
+
+
+def test_record_ingestion_counts_rows_and_rejections():
+    """Test that committed rows, throughput and quarantined rows are recorded."""
+    rows_before = _sample("ingest_rows_total", operation="upload", table="employee")
+    rejected_before = _sample(
+        "ingest_rejected_rows_total", table="employee", reason="unknown_job"
+    )
+
+    record_ingestion("upload", "employee", 1000, 0.5, {"unknown_job": 2})
+
+    assert _sample("ingest_rows_total", operation="upload", table="employee") == rows_before + 1000
+    assert _sample(
+        "ingest_rejected_rows_total", table="employee", reason="unknown_job"
+    ) == rejected_before + 2
+    assert _sample("ingest_rows_per_second_count", operation="upload", table="employee") >= 1
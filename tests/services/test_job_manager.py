@@ -0,0 +1,82 @@
+from io import BytesIO
+import os
+import pytest
+from unittest.mock import MagicMock
+from src.services.job_manager import JobManager, JobState
+
+
+@pytest.fixture
+def job_manager(tmp_path, monkeypatch):
+    """Fixture to provide a JobManager spooling into a temporary directory."""
+    monkeypatch.setenv("INGEST_SPOOL_DIR", str(tmp_path))
+    manager = JobManager()
+    yield manager
+    manager.executor.shutdown(wait=True)
+
+
+def make_upload(content: bytes, filename: str = "test.csv"):
+    """Helper function to build an object resembling an UploadFile."""
+    file = MagicMock()
+    file.file = BytesIO(content)
+    file.filename = filename
+    return file
+
+
+@pytest.mark.asyncio
+async def test_submit_spools_and_runs_job(job_manager):
+    """Test that a submitted upload is spooled, loaded and cleaned up."""
+    seen = {}
+
+    def load(path, progress):
+        with open(path, "rb") as f:
+            seen["content"] = f.read()
+        progress(2)
+        return {"rows_inserted": 2}
+
+    job = await job_manager.submit(make_upload(b"1,Dev\n2,Ops\n"), "job", load)
+    job_manager.executor.shutdown(wait=True)
+
+    status = job_manager.get(job.id).to_dict()
+    assert seen["content"] == b"1,Dev\n2,Ops\n"
+    assert status["state"] == JobState.SUCCEEDED.value
+    assert status["rows_processed"] == 2
+    assert status["result"] == {"rows_inserted": 2}
+    assert status["error"] is None
+    assert not os.path.exists(job.path)
+
+
+@pytest.mark.asyncio
+async def test_failed_job_records_error(job_manager):
+    """Test that a failing load marks the job as failed with its error."""
+    def load(path, progress):
+        raise ValueError("bad row")
+
+    job = await job_manager.submit(make_upload(b"x\n"), "job", load)
+    job_manager.executor.shutdown(wait=True)
+
+    status = job.to_dict()
+    assert status["state"] == JobState.FAILED.value
+    assert status["error"] == "bad row"
+    assert not os.path.exists(job.path)
+
+
+def test_get_unknown_job(job_manager):
+    """Test that unknown job IDs are reported as missing."""
+    assert job_manager.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_job_status_is_shared_through_spool_dir(job_manager):
+    """Test that another worker's manager on the same spool directory reports the job."""
+    job = await job_manager.submit(
+        make_upload(b"1,Dev\n"), "job", lambda path, progress: progress(1) or {"rows_inserted": 1}
+    )
+    job_manager.executor.shutdown(wait=True)
+
+    other = JobManager()
+    status = other.get(job.id).to_dict()
+    assert status["state"] == JobState.SUCCEEDED.value
+    assert status["rows_processed"] == 1
+    assert status["result"] == {"rows_inserted": 1}
+    assert other.get("../missing") is None
+    other.executor.shutdown(wait=True)
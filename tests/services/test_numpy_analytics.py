@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.duckdb_analytics import DuckDBAnalytics
+from src.services.numpy_analytics import NumpyHiringCube
+
+DEPARTMENTS = pd.DataFrame({"id": [1, 2, 3], "department": ["Finance", "IT", "Sales"]})
+JOBS = pd.DataFrame({"id": [1, 2], "job": ["Analyst", "Developer"]})
+EMPLOYEES = pd.DataFrame({
+    "id": [1, 2, 3, 4, 5, 6, 7],
+    "name": ["Ana", "Diego", "Luis", "Sofia", "Mateo", "Emma", "Tomas"],
+    "datetime": [
+        "2021-01-05T10:00:00Z", "2021-02-05T10:00:00Z", "2021-07-05T10:00:00Z",
+        "2021-11-05T10:00:00Z", "2021-03-05T10:00:00Z", "2020-03-05T10:00:00Z", None,
+    ],
+    "department_id": [1, 1, 1, 2, 3, 1, 1],
+    "job_id": [1, 1, 2, 2, 1, 1, 1],
+})
+
+
+def _load(backend, employees, mode="append"):
+    """Load departments, jobs and employees through a backend's writer."""
+    writer = backend.begin()
+    writer.write("department", DEPARTMENTS)
+    writer.write("job", JOBS)
+    writer.write("employee", employees.copy(), mode)
+    writer.commit()
+    return backend
+
+
+@pytest.fixture
+def cube():
+    """Fixture to provide a hiring cube loaded with a few hires."""
+    return _load(NumpyHiringCube(), EMPLOYEES)
+
+
+def test_employees_per_quarter(cube):
+    """Test that hires are counted per quarter of the year for each department and job."""
+    assert cube.employees_per_quarter(2021) == [
+        {"department": "Finance", "job": "Analyst", "Q1": 2, "Q2": 0, "Q3": 0, "Q4": 0},
+        {"department": "Finance", "job": "Developer", "Q1": 0, "Q2": 0, "Q3": 1, "Q4": 0},
+        {"department": "IT", "job": "Developer", "Q1": 0, "Q2": 0, "Q3": 0, "Q4": 1},
+        {"department": "Sales", "job": "Analyst", "Q1": 1, "Q2": 0, "Q3": 0, "Q4": 0},
+    ]
+    assert cube.employees_per_quarter(1999) == []
+
+
+@pytest.mark.parametrize("comparison, top_n", [("mean", 5), ("median", 5), ("top", 1)])
+def test_departments_above_average(cube, comparison, top_n):
+    """Test that departments are compared on their hires in the year."""
+    assert cube.departments_above_average(2021, comparison, top_n) == [
+        {"id": 1, "department": "Finance", "hired": 3},
+    ]
+
+
+def test_departments_above_average_invalid_comparison(cube):
+    """Test that an unknown comparison is rejected."""
+    with pytest.raises(ValueError):
+        cube.departments_above_average(2021, "mode")
+
+
+class _CommitOnRelease:
+    """Lock that lets a department commit land right after a report releases it."""
+
+    def __init__(self, cube):
+        self.cube = cube
+        self.lock = cube.lock
+
+    def __enter__(self):
+        self.lock.__enter__()
+
+    def __exit__(self, *exc_info):
+        self.lock.__exit__(*exc_info)
+        self.cube.lock = self.lock
+        writer = self.cube.begin()
+        writer.write("department", pd.DataFrame({"id": [0], "department": ["Audit"]}))
+        writer.commit()
+
+
+@pytest.mark.parametrize("report", ["employees_per_quarter", "departments_above_average"])
+def test_reports_keep_names_of_their_positions(cube, report):
+    """Test that a department commit after the lock is released does not shift report names."""
+    expected = getattr(cube, report)(2021)
+    cube.lock = _CommitOnRelease(cube)
+
+    assert getattr(cube, report)(2021) == expected
+    assert cube.departments.names[0] == "Audit"
+
+
+def test_upsert_moves_hires_between_cells(cube):
+    """Test that upserted employees are removed from their old cell and counted in the new one."""
+    writer = cube.begin()
+    writer.write("employee", pd.DataFrame({
+        "id": [4, 8, 4],
+        "datetime": ["2021-04-01T00:00:00Z", "2021-04-02T00:00:00Z", "2021-05-01T00:00:00Z"],
+        "department_id": [3, 2, 1],
+        "job_id": [1, 2, 1],
+    }), mode="upsert")
+    writer.commit()
+
+    rows = {(row["department"], row["job"]): row for row in cube.employees_per_quarter(2021)}
+    assert ("IT", "Developer") in rows and rows[("IT", "Developer")]["Q4"] == 0
+    assert rows[("IT", "Developer")]["Q2"] == 1
+    assert rows[("Finance", "Analyst")]["Q2"] == 1
+    assert cube.size == 8
+
+
+def test_rollback_discards_staged_rows(cube):
+    """Test that rows of a failed ingestion are never counted."""
+    writer = cube.begin()
+    writer.write("employee", EMPLOYEES.assign(id=EMPLOYEES["id"] + 100))
+    writer.rollback()
+
+    assert cube.size == len(EMPLOYEES)
+
+
+def test_sync_loads_exported_tables(cube):
+    """Test that a sync replaces the cube with the CSV export."""
+    exports = {
+        "departments": b"1,Finance\n",
+        "jobs": b"",
+        "employees": b"1,2021-08-01 09:00:00,1,1\n2,,1,\n",
+    }
+
+    cube.sync(lambda table_name, columns, out: out.write(exports[table_name]))
+
+    assert cube.size == 2
+    assert cube.employees_per_quarter(2021) == []
+    assert cube.departments_above_average(2021, "top") == [
+        {"id": 1, "department": "Finance", "hired": 1},
+    ]
+
+
+def test_memory_is_a_few_bytes_per_employee():
+    """Test that employees are held in 16 bytes each, plus the array growth headroom."""
+    employees = pd.DataFrame({
+        "id": np.arange(1, 100_001),
+        "datetime": pd.Timestamp("2021-01-01") + pd.to_timedelta(np.arange(100_000), unit="min"),
+        "department_id": np.arange(100_000) % 3 + 1,
+        "job_id": np.arange(100_000) % 2 + 1,
+    })
+
+    cube = _load(NumpyHiringCube(), employees)
+
+    assert cube.memory_bytes() < 2 * 16 * len(employees)
+
+
+def test_matches_duckdb_backend():
+    """Test that the cube answers like the SQL reports on random hires with gaps and upserts."""
+    rng = np.random.default_rng(0)
+    rows = 2_000
+    employees = pd.DataFrame({
+        "id": rng.integers(1, 1_500, rows),
+        "name": "x",
+        "datetime": pd.Series(
+            pd.Timestamp("2020-06-01") + pd.to_timedelta(rng.integers(0, 10**8, rows), unit="s")
+        ).where(rng.random(rows) > 0.05),
+        "department_id": pd.array(rng.integers(1, 5, rows), dtype="Int64"),
+        "job_id": pd.array(rng.integers(1, 4, rows), dtype="Int64"),
+    })
+    employees.loc[rng.random(rows) < 0.05, "department_id"] = None
+    cube = _load(NumpyHiringCube(), employees, mode="upsert")
+    mirror = _load(DuckDBAnalytics(threads=1), employees, mode="upsert")
+
+    for year in (2020, 2021, 2022, 2023):
+        assert cube.employees_per_quarter(year) == mirror.employees_per_quarter(year)
+        for comparison in ("mean", "median", "top"):
+            expected = mirror.departments_above_average(year, comparison, 2)
+            assert sorted(cube.departments_above_average(year, comparison, 2), key=str) == \
+                sorted(expected, key=str)
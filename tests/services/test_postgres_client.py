@@ -1,11 +1,15 @@
+from datetime import datetime
+from io import BytesIO
+import threading
 import pytest
 import pandas as pd
 from unittest.mock import patch, MagicMock, AsyncMock
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from src.services.postgres_client import PostgresClient
 
 
 @pytest.fixture
-def postgres_client():
+def postgres_client(mock_session):
     """Fixture to provide a mocked PostgresClient."""
     with patch("src.services.postgres_client.create_engine") as mock_create_engine:
         mock_engine = MagicMock()
@@ -27,11 +31,255 @@ def mock_session():
 
 def test_init_db(postgres_client):
     """Test the initialization of the database."""
+    connection = postgres_client.engine.begin.return_value.__enter__.return_value
     with patch(
-        "src.services.postgres_client.db.metadata.create_all"
-    ) as mock_create_all:
+        "src.services.postgres_client.Base.metadata.create_all"
+    ) as mock_create_all, patch.object(postgres_client, "_schema_is_current", return_value=False):
         postgres_client.init_db()
-        mock_create_all.assert_called_once_with(postgres_client.engine)
+        mock_create_all.assert_called_once_with(connection)
+
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert "pg_advisory_xact_lock" in statements[0]
+    assert any("INSERT INTO schema_versions" in statement for statement in statements)
+
+
+def test_init_db_skips_current_schema(postgres_client):
+    """Test that the schema checks are skipped when the fingerprint was already applied."""
+    with patch(
+        "src.services.postgres_client.Base.metadata.create_all"
+    ) as mock_create_all, patch.object(postgres_client, "_schema_is_current", return_value=True):
+        postgres_client.init_db()
+
+    mock_create_all.assert_not_called()
+
+
+def test_schema_fingerprint_tracks_partitioning(postgres_client):
+    """Test that the fingerprint is stable and changes with the partitioning setting."""
+    fingerprint = postgres_client._schema_fingerprint()
+    assert postgres_client._schema_fingerprint() == fingerprint
+
+    postgres_client.partition_employees = True
+    assert postgres_client._schema_fingerprint() != fingerprint
+
+
+def test_client_is_started_on_first_use(mock_session):
+    """Test that constructing the client creates no engine until one is needed."""
+    with patch("src.services.postgres_client.create_engine") as mock_create_engine:
+        client = PostgresClient()
+        mock_create_engine.assert_not_called()
+
+        assert client.engine is mock_create_engine.return_value
+        client.start()
+        mock_create_engine.assert_called_once()
+
+
+def test_engine_pool_settings_from_environment(mock_session, monkeypatch):
+    """Test that the pool settings are read from the POSTGRES_* environment."""
+    monkeypatch.setenv("POSTGRES_POOL_SIZE", "3")
+    monkeypatch.setenv("POSTGRES_MAX_OVERFLOW", "1")
+    monkeypatch.setenv("POSTGRES_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("POSTGRES_POOL_RECYCLE", "60")
+    monkeypatch.setenv("POSTGRES_POOL_PRE_PING", "false")
+
+    with patch("src.services.postgres_client.create_engine") as mock_create_engine:
+        PostgresClient().start()
+
+    kwargs = mock_create_engine.call_args.kwargs
+    assert kwargs["pool_size"] == 3
+    assert kwargs["max_overflow"] == 1
+    assert kwargs["pool_timeout"] == 2.5
+    assert kwargs["pool_recycle"] == 60
+    assert kwargs["pool_pre_ping"] is False
+
+
+@pytest.mark.parametrize(
+    "workers, budget, expected",
+    [(1, 90, (10, 10)), (4, 90, (10, 10)), (5, 90, (10, 8)), (8, 90, (10, 1)), (16, 90, (5, 0))],
+)
+def test_pool_is_capped_to_worker_share(mock_session, monkeypatch, workers, budget, expected):
+    """Test that each worker's pool fits its share of POSTGRES_MAX_CONNECTIONS."""
+    monkeypatch.setenv("WEB_CONCURRENCY", str(workers))
+    monkeypatch.setenv("POSTGRES_MAX_CONNECTIONS", str(budget))
+
+    client = PostgresClient()
+
+    assert (client.pool_size, client.max_overflow) == expected
+    assert client.shared_data_version == (workers > 1)
+
+
+def test_connection_budget_below_worker_count(monkeypatch):
+    """Test that a budget leaving a worker without a connection is rejected."""
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    monkeypatch.setenv("POSTGRES_MAX_CONNECTIONS", "3")
+
+    with pytest.raises(ValueError):
+        PostgresClient()
+
+
+def test_ingestion_leaves_connections_to_reads(mock_session, monkeypatch):
+    """Test that ingestions cannot hold the connections reserved for reads."""
+    monkeypatch.setenv("POSTGRES_POOL_SIZE", "2")
+    monkeypatch.setenv("POSTGRES_MAX_OVERFLOW", "1")
+    monkeypatch.setenv("POSTGRES_POOL_TIMEOUT", "0.05")
+    monkeypatch.setenv("POSTGRES_READ_RESERVED_CONNECTIONS", "1")
+
+    with patch("src.services.postgres_client.create_engine"):
+        client = PostgresClient()
+        client._insert_frame = MagicMock()
+        client.analytics = MagicMock()
+        client._data_changed = MagicMock()
+        client._acquire_ingest_connection()
+        client._acquire_ingest_connection()
+
+        with pytest.raises(PoolTimeoutError):
+            client._load_file(BytesIO(b"1,Engineering\n"), "department")
+
+        client.ingest_connections.release()
+        client._load_file(BytesIO(b"1,Engineering\n"), "department")
+
+    assert client._insert_frame.call_count == 1
+    assert client.ingest_connections.acquire(blocking=False)
+
+
+def test_init_db_partitions_employees(mock_session, monkeypatch):
+    """Test that employees is created partitioned by hire year when configured."""
+    monkeypatch.setenv("POSTGRES_PARTITION_EMPLOYEES", "true")
+
+    with patch("src.services.postgres_client.create_engine") as mock_create_engine, \
+            patch("src.services.postgres_client.Base.metadata.create_all") as mock_create_all:
+        client = PostgresClient()
+        with patch.object(client, "_schema_is_current", return_value=False):
+            client.init_db()
+
+    created = [table.name for table in mock_create_all.call_args.kwargs["tables"]]
+    assert "employees" not in created and "departments" in created
+    connection = mock_create_engine.return_value.begin.return_value.__enter__.return_value
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert any("PARTITION BY RANGE (datetime)" in statement for statement in statements)
+    assert any("PARTITION OF employees DEFAULT" in statement for statement in statements)
+    assert client.employees_partitioned
+
+
+def test_init_db_reads_partitioning_from_catalog(postgres_client):
+    """Test that an already partitioned employees table is detected with the setting off."""
+    postgres_client.start()
+    connection = postgres_client.engine.begin.return_value.__enter__.return_value
+    connection.execute.return_value.scalar.return_value = True
+
+    with patch.object(postgres_client, "_schema_is_current", return_value=True):
+        postgres_client.init_db()
+
+    assert not postgres_client.partition_employees
+    assert postgres_client.employees_partitioned
+    assert "pg_partitioned_table" in str(connection.execute.call_args.args[0])
+
+
+@pytest.mark.parametrize("commit", [True, False])
+def test_ensure_employee_partitions_attaches_new_years(postgres_client, commit):
+    """Test that missing year partitions are attached on the ingestion's session, once."""
+    postgres_client.start()
+    postgres_client.employees_partitioned = True
+    session = MagicMock()
+    session.execute.return_value.scalars.return_value.all.return_value = ["employees_y2021"]
+    hire_dates = pd.Series(pd.to_datetime(["2021-03-01", "2022-05-01", "1850-01-01", None]))
+
+    postgres_client._ensure_employee_partitions(hire_dates, session, commit=commit)
+
+    statements = [str(call.args[0]) for call in session.execute.call_args_list]
+    assert "pg_inherits" in statements[0]
+    assert "pg_advisory_xact_lock" in statements[1]
+    assert any("CREATE TABLE employees_y2022" in statement for statement in statements)
+    assert any(
+        "ATTACH PARTITION employees_y2022" in statement
+        and "FROM ('2022-01-01') TO ('2023-01-01')" in statement
+        for statement in statements
+    )
+    assert not any("employees_y1850" in statement for statement in statements)
+    assert not any("employees_y2021" in statement for statement in statements)
+    assert session.commit.called == commit
+    postgres_client.engine.begin.assert_not_called()
+
+
+def test_partitioned_batch_insert_uses_one_connection(postgres_client, mock_session):
+    """Test that partitions and the data version of a batch go through the ingestion's session."""
+    postgres_client.start()
+    postgres_client.employees_partitioned = True
+    postgres_client.shared_data_version = True
+    mock_session.execute.return_value.scalars.return_value.all.return_value = []
+    mock_session.execute.return_value.scalar.return_value = 3
+
+    postgres_client._batch_insert([{
+        "id": 1, "name": "Diego", "datetime": "2022-05-01T00:00:00Z",
+        "department_id": 1, "job_id": 1,
+    }], "employee")
+
+    statements = [str(call.args[0]) for call in mock_session.execute.call_args_list]
+    attach = next(i for i, s in enumerate(statements) if "ATTACH PARTITION" in s)
+    assert attach < next(i for i, s in enumerate(statements) if "HIRES" in s.upper())
+    assert "nextval('data_version')" in statements[-1]
+    assert mock_session.commit.call_count == 3
+    assert postgres_client.report_cache.version == 3
+    postgres_client.engine.connect.assert_not_called()
+    postgres_client.engine.begin.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "ids, loaded, error",
+    [([1, 2, 70000], [], None), ([1, 2, 1], [], "Duplicate"), ([1, 2], [2], "already loaded")],
+)
+def test_partitioned_appends_claim_their_ids(postgres_client, ids, loaded, error):
+    """Test that appends to partitioned employees lock their id ranges and reject duplicates."""
+    session = MagicMock()
+    session.execute.return_value.scalars.return_value.all.return_value = loaded
+
+    if error:
+        with pytest.raises(ValueError, match=error):
+            postgres_client._claim_employee_ids(pd.Series(ids), session)
+    else:
+        postgres_client._claim_employee_ids(pd.Series(ids), session)
+
+    calls = session.execute.call_args_list
+    assert "pg_advisory_xact_lock_shared" in str(calls[0].args[0])
+    assert calls[1].args[1]["buckets"] == ([0, 1] if 70000 in ids else [0])
+
+
+def test_detach_employee_year_keeps_earlier_detached_tables(postgres_client):
+    """Test that detaching a year again picks a free name for the detached table."""
+    postgres_client.start()
+    postgres_client._data_changed = MagicMock()
+    connection = postgres_client.engine.begin.return_value.__enter__.return_value
+    connection.execute.return_value.scalars.return_value.all.return_value = ["employees_y2020"]
+    connection.execute.return_value.scalar.side_effect = [True, True, False]
+
+    assert postgres_client.detach_employee_year(2020) == "employees_y2020_detached_3"
+
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert "RENAME TO employees_y2020_detached_3" in statements[-2]
+    with pytest.raises(ValueError):
+        postgres_client.detach_employee_year(2019)
+
+
+def test_upsert_into_partitioned_employees_replaces_rows(postgres_client):
+    """Test that upserts delete and reinsert ids when employees is partitioned."""
+    postgres_client.employees_partitioned = True
+    df = pd.DataFrame([{"id": 1, "name": "Diego", "datetime": pd.Timestamp("2021-01-01"),
+                        "department_id": 1, "job_id": 1}])
+    session = MagicMock()
+
+    postgres_client._upsert_dataframe(df, "employees", session)
+
+    statements = [str(call.args[0]) for call in session.execute.call_args_list]
+    assert any("DELETE FROM employees t USING" in statement for statement in statements)
+    assert not any("ON CONFLICT (id)" in statement for statement in statements)
+
+
+def test_warm_pool_opens_pool_size_connections(postgres_client):
+    """Test that warming checks out ``pool_size`` connections at once and returns them."""
+    postgres_client.warm_pool()
+
+    connections = postgres_client.engine.connect.return_value
+    assert postgres_client.engine.connect.call_count == postgres_client.pool_size
+    assert connections.close.call_count == postgres_client.pool_size
 
 
 @pytest.mark.asyncio
@@ -48,6 +296,79 @@ async def test_handle_upload_employee(postgres_client):
         assert response == {"filename": file.filename}
 
 
+@pytest.mark.asyncio
+async def test_handle_upload_employee_chunked(postgres_client):
+    """Test streaming an employee upload in fixed-size chunks."""
+    file_content = (
+        "1,Diego,2021-01-01 00:00:00,1,1\n"
+        "2,Ana,2021-02-01 00:00:00,1,2\n"
+        "3,Luis,2021-03-01 00:00:00,2,1\n"
+    )
+    file = MagicMock()
+    file.file = BytesIO(file_content.encode("utf-8"))
+    file.read = AsyncMock(side_effect=AssertionError("upload must not be read whole"))
+
+    with patch.object(postgres_client, "_insert_employees") as mock_insert:
+        response = await postgres_client.handle_upload(file, "employee", chunksize=2)
+
+    assert mock_insert.call_count == 2
+    assert response == {"filename": file.filename, "rows_inserted": 3, "chunks": [2, 1]}
+
+
+@pytest.mark.asyncio
+async def test_handle_upload_validate_quarantines_rows(postgres_client, mock_session):
+    """Test that validated uploads load the valid rows and quarantine the rest."""
+    file_content = (
+        "1,Diego,2021-01-01 00:00:00,1,1\n"
+        "2,Ana,not a date,1,1\n"
+        "3,Luis,2021-03-01 00:00:00,9,1\n"
+    )
+    file = MagicMock()
+    file.read = AsyncMock(return_value=file_content.encode("utf-8"))
+    references = {"department_id": [1], "job_id": [1]}
+
+    with patch.object(postgres_client, "_reference_ids", return_value=references), \
+            patch.object(postgres_client, "_loaded_ids", return_value=[]), \
+            patch.object(postgres_client, "_insert_employees") as mock_insert:
+        response = await postgres_client.handle_upload(file, "employee", validate=True)
+
+    assert mock_insert.call_args.args[0]["id"].tolist() == [1]
+    assert response["rows_inserted"] == 1
+    assert response["rejected"] == {"invalid_datetime": 1, "unknown_department": 1}
+    quarantined = mock_session.execute.call_args.args[1]
+    assert [row["row_number"] for row in quarantined] == [2, 3]
+    assert {row["upload_id"] for row in quarantined} == {response["upload_id"]}
+    mock_session.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_duckdb_backend_mirrors_committed_uploads(mock_session, monkeypatch):
+    """Test that the DuckDB backend serves reports from the rows of committed uploads."""
+    monkeypatch.setenv("ANALYTICS_BACKEND", "duckdb")
+    with patch("src.services.postgres_client.create_engine"):
+        client = PostgresClient()
+    uploads = {
+        "department": "1,Finance\n",
+        "job": "1,Analyst\n",
+        "employee": "1,Diego,2021-01-01T00:00:00Z,1,1\n2,Ana,2021-05-01T00:00:00Z,1,1\n",
+    }
+
+    with patch.object(client, "_insert_frame"):
+        for table, content in uploads.items():
+            file = MagicMock()
+            file.read = AsyncMock(return_value=content.encode("utf-8"))
+            await client.handle_upload(file, table)
+        mock_session.commit.side_effect = RuntimeError("commit failed")
+        file.read = AsyncMock(return_value=b"3,Luis,2021-09-01T00:00:00Z,1,1\n")
+        with pytest.raises(RuntimeError):
+            await client.handle_upload(file, "employee")
+
+    response = await client.get_employees_per_quarter(year=2021)
+    assert response == {"data": [
+        {"department": "Finance", "job": "Analyst", "Q1": 1, "Q2": 1, "Q3": 0, "Q4": 0},
+    ]}
+
+
 @pytest.mark.asyncio
 async def test_handle_upload_invalid_table(postgres_client):
     """Test handling upload with an invalid table name."""
@@ -91,6 +412,22 @@ async def test_handle_batch_insert_employee(postgres_client, mock_session):
             assert response == {"status": "success", "rows_inserted": len(rows)}
 
 
+@pytest.mark.asyncio
+async def test_handle_batch_insert_runs_on_ingest_executor(postgres_client):
+    """Test that batch inserts run off the event loop on the ingestion executor."""
+    threads = []
+
+    def fake_batch_insert(rows, table, *args):
+        threads.append(threading.current_thread().name)
+        return {"status": "success", "rows_inserted": len(rows)}
+
+    with patch.object(postgres_client, "_batch_insert", side_effect=fake_batch_insert):
+        response = await postgres_client.handle_batch_insert([{"id": 1, "job": "Dev"}], "job")
+
+    assert response == {"status": "success", "rows_inserted": 1}
+    assert threads[0].startswith("db-ingest")
+
+
 @pytest.mark.asyncio
 async def test_get_employees_per_quarter(postgres_client, mock_session):
     """Test retrieving employee count per quarter."""
@@ -103,22 +440,246 @@ async def test_get_employees_per_quarter(postgres_client, mock_session):
     mock_session.execute.return_value.fetchall.return_value = result_data
 
     response = await postgres_client.get_employees_per_quarter()
-    assert response.status_code == 200
-    assert response.json() == {"data": expected_data}
+    assert response == {"data": expected_data}
 
 
 @pytest.mark.asyncio
 async def test_get_departments_above_average(postgres_client, mock_session):
     """Test retrieving departments with above average hires."""
-    avg_hired_data = 5
     result_data = [(1, "Finance", 10), (2, "IT", 7)]
     expected_data = [
         {"id": 1, "department": "Finance", "hired": 10},
         {"id": 2, "department": "IT", "hired": 7},
     ]
 
-    mock_session.execute.side_effect = [MagicMock(scalar=avg_hired_data), result_data]
+    mock_session.execute.return_value.fetchall.return_value = result_data
 
     response = await postgres_client.get_departments_above_average()
-    assert response.status_code == 200
-    assert response.json() == {"data": expected_data}
+    assert response == {"data": expected_data}
+
+    mock_session.execute.assert_called_once()
+    query = str(mock_session.execute.call_args.args[0])
+    assert "AVG(hired) OVER ()" in query
+    assert "r.hired > r.mean_hired" in query
+
+
+@pytest.mark.asyncio
+async def test_get_departments_top_n(postgres_client, mock_session):
+    """Test the top-N comparison filters on the hires rank."""
+    mock_session.execute.return_value.fetchall.return_value = []
+
+    await postgres_client.get_departments_above_average(comparison="top", top_n=3)
+
+    statement, params = mock_session.execute.call_args.args
+    assert "r.hired_rank <= :top_n" in str(statement)
+    assert params["top_n"] == 3
+
+
+@pytest.mark.asyncio
+async def test_reports_are_cached_until_ingestion(postgres_client, mock_session):
+    """Test that report results are served from cache until data is committed."""
+    mock_session.execute.return_value.fetchall.return_value = [("IT", "Developer", 0, 1, 3, 1)]
+
+    first = await postgres_client.get_employees_per_quarter(year=2021)
+    second = await postgres_client.get_employees_per_quarter(year=2021)
+    assert first == second
+    assert mock_session.execute.call_count == 1
+
+    etag = postgres_client.report_etag("employees_per_quarter", year=2021)
+    await postgres_client.handle_batch_insert([{"id": 1, "job": "Developer"}], "job")
+    assert postgres_client.report_etag("employees_per_quarter", year=2021) != etag
+
+    await postgres_client.get_employees_per_quarter(year=2021)
+    assert mock_session.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_data_version_is_published_on_commit(postgres_client, mock_session):
+    """Test that with several workers a commit advances and adopts the shared data version."""
+    postgres_client.shared_data_version = True
+    mock_session.execute.return_value.scalar.return_value = 5
+    postgres_client.report_cache.get_or_compute("employees_per_quarter", {"year": 2021}, list)
+
+    await postgres_client.handle_batch_insert([{"id": 1, "job": "Developer"}], "job")
+
+    assert "nextval('data_version')" in str(mock_session.execute.call_args.args[0])
+    assert postgres_client.report_cache.version == 5
+    assert postgres_client.report_cache.lookup("employees_per_quarter", {"year": 2021}) is None
+
+
+def test_refresh_adopts_other_workers_version(postgres_client):
+    """Test that a worker adopts the version and ETag token published by other workers."""
+    postgres_client.start()
+    postgres_client.shared_data_version = True
+    postgres_client.report_cache.get_or_compute("employees_per_quarter", {"year": 2021}, list)
+    connection = postgres_client.engine.connect.return_value.__enter__.return_value
+    connection.execute.return_value.one.return_value = (6, 1234)
+
+    postgres_client.sync_analytics()
+
+    assert postgres_client.report_cache.version == 6
+    assert postgres_client.report_cache.lookup("employees_per_quarter", {"year": 2021}) is None
+    assert postgres_client.report_etag("employees_per_quarter", year=2021).endswith('-1234-6"')
+
+
+@pytest.mark.parametrize("workers, expected", [(1, "duckdb"), (3, "postgres")])
+def test_mirror_backends_require_a_single_worker(monkeypatch, workers, expected):
+    """Test that several workers serve reports from PostgreSQL instead of per-process mirrors."""
+    monkeypatch.setenv("WEB_CONCURRENCY", str(workers))
+    monkeypatch.setenv("ANALYTICS_BACKEND", "duckdb")
+
+    assert PostgresClient().analytics_backend == expected
+
+
+def test_insert_rows_appends_with_one_statement(postgres_client, mock_session):
+    """Test that JSON rows are inserted with one executemany and counted in the summary."""
+    rows = [
+        {"id": 1, "name": "Diego", "datetime": datetime(2021, 4, 1, 4, 0),
+         "department_id": 1, "job_id": 1},
+        {"id": 2, "name": "Ana", "datetime": datetime(2021, 5, 2), "department_id": 1, "job_id": 1},
+        {"id": 3, "name": None, "datetime": None, "department_id": 1, "job_id": 1},
+    ]
+
+    assert postgres_client._insert_rows(rows, "employee") == {
+        "status": "success", "rows_inserted": 3
+    }
+
+    calls = mock_session.execute.call_args_list
+    insert_call = next(call for call in calls if "INSERT INTO employees" in str(call.args[0]))
+    assert insert_call.args[1] == rows
+    hires_call = next(call for call in calls if "hires_by_dept_job_quarter" in str(call.args[0]))
+    assert hires_call.args[1] == [
+        {"year": 2021, "department_id": 1, "job_id": 1, "quarter": 2, "hired": 2}
+    ]
+    mock_session.commit.assert_called_once()
+
+
+def test_row_hires_are_added_in_key_order(postgres_client):
+    """Test that JSON rows update the hires summary in key order, as file rows do."""
+    session = MagicMock()
+    rows = [
+        {"datetime": datetime(2022, 1, 5), "department_id": 1, "job_id": 1},
+        {"datetime": datetime(2021, 8, 1), "department_id": 2, "job_id": 1},
+        {"datetime": datetime(2021, 8, 1), "department_id": 1, "job_id": 3},
+    ]
+
+    postgres_client._record_row_hires(rows, session)
+
+    counts = session.execute.call_args.args[1]
+    assert [(c["year"], c["department_id"], c["job_id"], c["quarter"]) for c in counts] == [
+        (2021, 1, 3, 3), (2021, 2, 1, 3), (2022, 1, 1, 1)
+    ]
+
+
+def test_insert_employees_uses_copy(postgres_client):
+    """Test that employee rows are streamed with COPY and NULLs are preserved."""
+    df = pd.DataFrame(
+        [
+            {"id": 1, "name": "Diego", "datetime": "2021-01-01T10:00:00Z",
+             "department_id": 1, "job_id": 1},
+            {"id": 2, "name": None, "datetime": "not a date",
+             "department_id": None, "job_id": 2},
+        ]
+    )
+    session = MagicMock()
+    cursor = session.connection.return_value.connection.cursor.return_value
+    copied = {}
+    cursor.copy_expert.side_effect = lambda sql, file: copied.update(
+        sql=sql, data=file.read()
+    )
+
+    postgres_client._insert_employees(df, session)
+
+    assert copied["sql"] == (
+        "COPY employees (id, name, datetime, department_id, job_id) "
+        "FROM STDIN WITH (FORMAT csv)"
+    )
+    assert copied["data"] == "1,Diego,2021-01-01 10:00:00,1,1\n2,,,,2\n"
+    cursor.close.assert_called_once()
+
+
+def test_insert_jobs_upsert_merges_through_staging(postgres_client):
+    """Test that upsert mode stages rows with COPY and merges them in one statement."""
+    df = pd.DataFrame([{"id": 1, "job": "Developer"}, {"id": 2, "job": "Analyst"}])
+    session = MagicMock()
+    cursor = session.connection.return_value.connection.cursor.return_value
+
+    postgres_client._insert_jobs(df, session, mode="upsert")
+
+    statements = [str(call.args[0]) for call in session.execute.call_args_list]
+    assert "CREATE TEMPORARY TABLE IF NOT EXISTS jobs_staging" in statements[0]
+    assert "TRUNCATE jobs_staging" in statements[1]
+    assert "ON CONFLICT (id) DO UPDATE SET" in statements[2]
+    assert "job = EXCLUDED.job" in statements[2]
+    assert cursor.copy_expert.call_args.args[0].startswith("COPY jobs_staging (id, job)")
+
+
+@pytest.mark.parametrize(
+    "mode, lock",
+    [("upsert", "pg_advisory_xact_lock("), ("append", "pg_advisory_xact_lock_shared(")],
+)
+def test_insert_employees_locks_hires_summary(postgres_client, mode, lock):
+    """Test that employee upserts lock the hires summary exclusively and appends share it."""
+    df = pd.DataFrame([{"id": 1, "name": "Diego", "datetime": "2021-01-01T10:00:00Z",
+                        "department_id": 1, "job_id": 1}])
+    session = MagicMock()
+
+    postgres_client._insert_employees(df, session, mode=mode)
+
+    assert lock in str(session.execute.call_args_list[0].args[0])
+
+
+def test_record_hires_aggregates_per_quarter(postgres_client):
+    """Test that inserted employees are added to the hires summary per group."""
+    df = pd.DataFrame(
+        [
+            {"datetime": "2021-01-05T00:00:00Z", "department_id": 1, "job_id": 1},
+            {"datetime": "2021-02-05T00:00:00Z", "department_id": 1, "job_id": 1},
+            {"datetime": "2021-07-05T00:00:00Z", "department_id": 2, "job_id": 1},
+            {"datetime": None, "department_id": 2, "job_id": 1},
+            {"datetime": "2021-07-05T00:00:00Z", "department_id": None, "job_id": 1},
+        ]
+    )
+    session = MagicMock()
+
+    postgres_client._record_hires(df, session)
+
+    statement, params = session.execute.call_args.args
+    assert "ON CONFLICT (year, department_id, job_id, quarter)" in str(statement)
+    assert params == [
+        {"year": 2021, "department_id": 1, "job_id": 1, "quarter": 1, "hired": 2},
+        {"year": 2021, "department_id": 2, "job_id": 1, "quarter": 3, "hired": 1},
+    ]
+
+
+def test_iter_report_streams_from_server_side_cursor(postgres_client):
+    """Test that uncached reports are streamed with yield_per on a dedicated session."""
+    session = MagicMock()
+    session.execute.return_value.partitions.return_value = iter(
+        [[("IT", "Developer", 0, 1, 3, 1)]]
+    )
+
+    with patch.object(postgres_client, "session_factory", return_value=session):
+        rows = list(postgres_client.iter_report("employees_per_quarter", year=2021))
+
+    assert rows == [
+        {"department": "IT", "job": "Developer", "Q1": 0, "Q2": 1, "Q3": 3, "Q4": 1}
+    ]
+    assert session.execute.call_args.kwargs["execution_options"] == {"yield_per": 1000}
+    session.close.assert_called_once()
+
+
+def test_export_batches_streams_table(postgres_client):
+    """Test that table exports select every column in order on a server-side cursor."""
+    session = MagicMock()
+    session.execute.return_value.partitions.return_value = iter([[(1, "Finance")], [(2, "IT")]])
+
+    with patch.object(postgres_client, "session_factory", return_value=session):
+        columns, batches = postgres_client.export_batches("departments", batch_rows=1)
+        assert list(batches) == [[(1, "Finance")], [(2, "IT")]]
+
+    assert columns == ["id", "department"]
+    statement, params = session.execute.call_args.args
+    assert str(statement) == "SELECT id, department FROM departments ORDER BY id"
+    assert params == {}
+    assert session.execute.call_args.kwargs["execution_options"] == {"yield_per": 1}
@@ -0,0 +1,75 @@
+from unittest.mock import MagicMock
+from src.services.report_cache import ReportCache, etag_matches
+
+
+def test_get_or_compute_caches_result():
+    """Test that a report is computed once and then served from cache."""
+    cache = ReportCache(max_entries=2)
+    compute = MagicMock(return_value=[{"id": 1}])
+
+    assert cache.get_or_compute("report", {"year": 2021}, compute) == [{"id": 1}]
+    assert cache.get_or_compute("report", {"year": 2021}, compute) == [{"id": 1}]
+    assert cache.lookup("report", {"year": 2021}) == [{"id": 1}]
+    compute.assert_called_once()
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the cache keeps at most max_entries results in LRU order."""
+    cache = ReportCache(max_entries=2)
+    cache.get_or_compute("report", {"year": 2020}, lambda: 2020)
+    cache.get_or_compute("report", {"year": 2021}, lambda: 2021)
+    cache.lookup("report", {"year": 2020})
+    cache.get_or_compute("report", {"year": 2022}, lambda: 2022)
+
+    assert cache.lookup("report", {"year": 2020}) == 2020
+    assert cache.lookup("report", {"year": 2021}) is None
+    assert cache.lookup("report", {"year": 2022}) == 2022
+
+
+def test_invalidate_clears_cache_and_changes_etag():
+    """Test that bumping the data version drops results and changes ETags."""
+    cache = ReportCache()
+    cache.get_or_compute("report", {"year": 2021}, lambda: "old")
+    etag = cache.etag("report", {"year": 2021})
+
+    cache.invalidate()
+
+    assert cache.lookup("report", {"year": 2021}) is None
+    assert cache.etag("report", {"year": 2021}) != etag
+
+
+def test_result_computed_across_invalidation_is_not_stored():
+    """Test that a result racing with an ingestion commit is not cached."""
+    cache = ReportCache()
+
+    def compute():
+        cache.invalidate()
+        return "stale"
+
+    assert cache.get_or_compute("report", {"year": 2021}, compute) == "stale"
+    assert cache.lookup("report", {"year": 2021}) is None
+
+
+def test_set_version_shares_etags_across_caches():
+    """Test that caches adopting the same shared version hand out the same ETags."""
+    first, second = ReportCache(), ReportCache()
+    first.get_or_compute("report", {"year": 2021}, lambda: "old")
+
+    first.set_version(7, token="42")
+    second.set_version(7, token="42")
+
+    assert first.lookup("report", {"year": 2021}) is None
+    assert first.etag("report", {"year": 2021}) == second.etag("report", {"year": 2021})
+
+    first.get_or_compute("report", {"year": 2021}, lambda: "new")
+    first.set_version(7)
+    assert first.lookup("report", {"year": 2021}) == "new"
+
+
+def test_etag_matches():
+    """Test If-None-Match parsing for lists, weak tags and wildcards."""
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
@@ -0,0 +1,89 @@
+from io import StringIO
+import numpy as np
+import pandas as pd
+from src.models.tables import TableName
+from src.services.validation import rejected_records, validate_frame
+
+EMPLOYEES_CSV = (
+    "1,Diego,2021-01-01T10:00:00Z,1,1\n"
+    "2,Ana,not a date,1,1\n"
+    "x,Luis,2021-02-01T10:00:00Z,1,1\n"
+    "1,Marta,2021-03-01T10:00:00Z,1,1\n"
+    "5,Eva,,9,1\n"
+    "6,Juan,2021-04-01T10:00:00Z,,7\n"
+    "7,,,,\n"
+)
+
+
+def _employees():
+    return pd.read_csv(
+        StringIO(EMPLOYEES_CSV), header=None, names=TableName.EMPLOYEE.columns
+    )
+
+
+def test_validate_frame_reason_codes():
+    """Test that each invalid employee row is rejected with the reason of its first failing check."""
+    valid, rejected = validate_frame(
+        _employees(),
+        "employee",
+        reference_ids={"department_id": [1, 2], "job_id": [1]},
+        loaded_ids=lambda ids: np.array([]),
+        first_row=10,
+    )
+
+    assert valid["id"].tolist() == [1, 7]
+    assert str(valid["id"].dtype) == "Int64"
+    assert pd.api.types.is_datetime64_any_dtype(valid["datetime"])
+    assert dict(zip(rejected["row_number"], rejected["reason"])) == {
+        11: "invalid_datetime",
+        12: "invalid_integer",
+        13: "duplicate_id",
+        14: "unknown_department",
+        15: "unknown_job",
+    }
+
+
+def test_validate_frame_rejects_loaded_ids():
+    """Test that ids already stored in the table are rejected as duplicates."""
+    valid, rejected = validate_frame(
+        _employees().iloc[[0, 6]], "employee", loaded_ids=lambda ids: np.array([7])
+    )
+
+    assert valid["id"].tolist() == [1]
+    assert rejected["reason"].tolist() == ["duplicate_id"]
+
+
+def test_validate_frame_allows_repeated_ids_without_loaded_ids():
+    """Test that repeated ids pass when duplicates are not checked, as for upserts."""
+    df = pd.DataFrame({"id": [1, 1], "job": ["Developer", "Analyst"]})
+
+    valid, rejected = validate_frame(df, "job")
+
+    assert len(valid) == 2
+    assert rejected.empty
+
+
+def test_validate_frame_requires_non_nullable_columns():
+    """Test that rows missing a non-nullable column are rejected."""
+    df = pd.DataFrame({"id": [1, 2, None], "department": ["Sales", None, "IT"]})
+
+    valid, rejected = validate_frame(df, "department")
+
+    assert valid["department"].tolist() == ["Sales"]
+    assert rejected["reason"].tolist() == ["missing_value", "missing_value"]
+
+
+def test_rejected_records_keep_raw_values():
+    """Test that quarantine rows keep the raw values as strings and nulls as None."""
+    _, rejected = validate_frame(_employees().iloc[[1]], "employee")
+
+    assert rejected_records(rejected, "employee", "abc") == [{
+        "upload_id": "abc",
+        "table_name": "employee",
+        "row_number": 1,
+        "reason": "invalid_datetime",
+        "record": {
+            "id": "2", "name": "Ana", "datetime": "not a date",
+            "department_id": "1", "job_id": "1",
+        },
+    }]